@@ -0,0 +1,50 @@
+# Helpers for conditional GET (ETag / Last-Modified) on read endpoints
+
+import hashlib
+from datetime import datetime
+from typing import Any, Iterable, NamedTuple, Optional
+from flask import current_app, g, request
+from domain.models.availability import as_utc
+
+# Bump when a serializer's fields change, so clients do not keep a stale shape on 304s
+ETAG_VERSION = '1'
+
+class Validators(NamedTuple):
+    etag: str
+    last_modified: Optional[datetime]
+
+def make_validators(resource: str, entities: Iterable[Any], *extra: Any) -> Validators:
+    """Validators for a representation built from these entities, read off their id and
+    updated_at, so the body never has to be serialized to compute them.
+
+    `extra` covers anything else in the body that no updated_at tracks, such as a list total.
+    """
+    digest = hashlib.blake2b(f"{ETAG_VERSION}:{resource}".encode('utf-8'), digest_size=16)
+    last_modified = None
+    for entity in entities:
+        updated_at = entity.updated_at
+        digest.update(f"|{entity.id}@{updated_at}".encode('utf-8'))
+        if isinstance(updated_at, datetime):
+            updated_at = as_utc(updated_at)
+            if last_modified is None or updated_at > last_modified:
+                last_modified = updated_at
+    for value in extra:
+        digest.update(f"|{value}".encode('utf-8'))
+    return Validators(digest.hexdigest(), last_modified)
+
+def not_modified(resource: str, entities: Iterable[Any], *extra: Any):
+    """Record the validators for the middleware to send, and return a 304 response when
+    the client's copy is still current (None when the view should build the body).
+
+    If-None-Match wins over If-Modified-Since, as RFC 9110 requires.
+    """
+    validators = make_validators(resource, entities, *extra)
+    g.validators = validators
+    if request.if_none_match:
+        current = request.if_none_match.contains_weak(validators.etag)
+    elif request.if_modified_since and validators.last_modified:
+        # HTTP dates have whole-second precision
+        current = validators.last_modified.replace(microsecond=0) <= request.if_modified_since
+    else:
+        current = False
+    return current_app.response_class(status=304) if current else None
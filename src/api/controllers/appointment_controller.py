@@ -3,8 +3,17 @@ from services.appointment_service import AppointmentService
 from infrastructure.repositories.appointment_repository import AppointmentRepository
 from infrastructure.repositories.mentor_repository import MentorRepository
 from infrastructure.repositories.wallet_repository import WalletRepository
+from infrastructure.repositories.booking_counter import BookingCounter
+from infrastructure.databases.unit_of_work import UnitOfWork
+from api.controllers.notification_controller import notification_dispatcher, notification_service
+from infrastructure.services.event_bus import get_event_bus
 from domain.models.appointment import AppointmentStatus
-from datetime import datetime
+from domain.models.recurrence import RecurrenceFrequency, RecurrenceRule
+from api.serializers import appointment_serializer, series_appointment_serializer
+from api.conditional import not_modified
+from api.pagination import get_page_args, encode_cursor, decode_cursor
+from domain.constants import DEFAULT_SLOT_STEP_MINUTES, MAX_AVAILABILITY_SEARCH_DAYS
+from datetime import datetime, timedelta
 import json
 
 bp = Blueprint('appointment', __name__, url_prefix='/api/appointments')
@@ -13,7 +22,12 @@ bp = Blueprint('appointment', __name__, url_prefix='/api/appointments')
 appointment_repository = AppointmentRepository()
 mentor_repository = MentorRepository()
 wallet_repository = WalletRepository()
-appointment_service = AppointmentService(appointment_repository, mentor_repository, wallet_repository)
+appointment_service = AppointmentService(
+    appointment_repository, mentor_repository, wallet_repository, UnitOfWork(), BookingCounter(),
+    notification_service, get_event_bus()
+)
+# Committed changes have new outbox rows: let an idle dispatcher worker pick them up now
+appointment_service.add_listener(notification_dispatcher.wake)
 
 @bp.route('/', methods=['POST'])
 def create_appointment():
@@ -50,24 +64,85 @@ def create_appointment():
             project_group_id=data.get('project_group_id')
         )
         
+        return {
+            'success': True,
+            'data': appointment_serializer.dump(appointment),
+            'message': 'Appointment booked successfully'
+        }, 201
+        
+    except ValueError as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 400
+    except Exception as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 500
+
+def _parse_recurrence(data) -> RecurrenceRule:
+    """A recurrence from an RRULE string or from frequency/interval/count/until fields"""
+    if data.get('rrule'):
+        return RecurrenceRule.parse(data['rrule'])
+    recurrence = data.get('recurrence') or {}
+    try:
+        frequency = RecurrenceFrequency(recurrence.get('frequency', 'weekly'))
+    except ValueError:
+        raise ValueError('Invalid frequency. Use: daily, weekly, biweekly')
+    until = recurrence.get('until')
+    return RecurrenceRule(
+        frequency=frequency,
+        interval=int(recurrence.get('interval', 1)),
+        count=int(recurrence['count']) if recurrence.get('count') is not None else None,
+        until=datetime.fromisoformat(until.replace('Z', '+00:00')) if until else None
+    )
+
+@bp.route('/series', methods=['POST'])
+def create_series():
+    """Book a recurring series of appointments in one request"""
+    try:
+        data = request.get_json() or {}
+        
+        required_fields = ['mentor_id', 'student_id', 'title', 'start_time', 'end_time']
+        for field in required_fields:
+            if field not in data:
+                return {
+                    'success': False,
+                    'message': f'Missing required field: {field}'
+                }, 400
+        
+        try:
+            start_time = datetime.fromisoformat(data['start_time'].replace('Z', '+00:00'))
+            end_time = datetime.fromisoformat(data['end_time'].replace('Z', '+00:00'))
+        except ValueError:
+            return {
+                'success': False,
+                'message': 'Invalid datetime format. Use ISO format (YYYY-MM-DDTHH:MM:SS)'
+            }, 400
+        
+        series, appointments = appointment_service.create_series(
+            mentor_id=data['mentor_id'],
+            student_id=data['student_id'],
+            title=data['title'],
+            description=data.get('description', ''),
+            start_time=start_time,
+            end_time=end_time,
+            recurrence=_parse_recurrence(data),
+            project_group_id=data.get('project_group_id')
+        )
+        
         return {
             'success': True,
             'data': {
-                'id': appointment.id,
-                'mentor_id': appointment.mentor_id,
-                'student_id': appointment.student_id,
-                'project_group_id': appointment.project_group_id,
-                'title': appointment.title,
-                'description': appointment.description,
-                'start_time': appointment.start_time.isoformat(),
-                'end_time': appointment.end_time.isoformat(),
-                'status': appointment.status.value,
-                'points_required': appointment.points_required,
-                'points_used': appointment.points_used,
-                'meeting_url': appointment.meeting_url,
-                'notes': appointment.notes
+                'id': series.id,
+                'mentor_id': series.mentor_id,
+                'student_id': series.student_id,
+                'rrule': series.rule,
+                'points_used': sum(appointment.points_used for appointment in appointments),
+                'appointments': series_appointment_serializer.dump_many(appointments)
             },
-            'message': 'Appointment booked successfully'
+            'message': f'Booked {len(appointments)} appointments'
         }, 201
         
     except ValueError as e:
@@ -81,6 +156,80 @@ def create_appointment():
             'message': str(e)
         }, 500
 
+@bp.route('/series/<int:series_id>', methods=['GET'])
+def get_series(series_id):
+    """Get a recurring series and its appointments"""
+    try:
+        found = appointment_service.get_series(series_id)
+        if not found:
+            return {
+                'success': False,
+                'message': 'Series not found'
+            }, 404
+        
+        series, appointments = found
+        return {
+            'success': True,
+            'data': {
+                'id': series.id,
+                'mentor_id': series.mentor_id,
+                'student_id': series.student_id,
+                'rrule': series.rule,
+                'appointments': series_appointment_serializer.dump_many(appointments)
+            },
+            'message': 'Series retrieved successfully'
+        }, 200
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 500
+
+@bp.route('/series/<int:series_id>/cancel', methods=['PUT'])
+def cancel_series(series_id):
+    """Cancel the remaining appointments of a series, optionally only those from a given time"""
+    try:
+        data = request.get_json() or {}
+        cancelled_by_user_id = data.get('cancelled_by_user_id')
+        if not cancelled_by_user_id:
+            return {
+                'success': False,
+                'message': 'cancelled_by_user_id is required'
+            }, 400
+        
+        from_time = None
+        if data.get('from_time'):
+            try:
+                from_time = datetime.fromisoformat(data['from_time'].replace('Z', '+00:00'))
+            except ValueError:
+                return {
+                    'success': False,
+                    'message': 'Invalid datetime format. Use ISO format (YYYY-MM-DDTHH:MM:SS)'
+                }, 400
+        
+        cancelled = appointment_service.cancel_series(series_id, cancelled_by_user_id, from_time)
+        if cancelled is None:
+            return {
+                'success': False,
+                'message': 'Series not found or unauthorized to cancel'
+            }, 404
+        
+        return {
+            'success': True,
+            'data': {
+                'cancelled': [appointment.id for appointment in cancelled],
+                'points_refunded': sum(appointment.points_used for appointment in cancelled)
+            },
+            'message': f'Cancelled {len(cancelled)} appointments. Points have been refunded.'
+        }, 200
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 500
+
 @bp.route('/<int:appointment_id>', methods=['GET'])
 def get_appointment(appointment_id):
     """Get appointment by ID"""
@@ -91,26 +240,13 @@ def get_appointment(appointment_id):
                 'success': False,
                 'message': 'Appointment not found'
             }, 404
+        unchanged = not_modified('appointment', [appointment])
+        if unchanged:
+            return unchanged
         
         return {
             'success': True,
-            'data': {
-                'id': appointment.id,
-                'mentor_id': appointment.mentor_id,
-                'student_id': appointment.student_id,
-                'project_group_id': appointment.project_group_id,
-                'title': appointment.title,
-                'description': appointment.description,
-                'start_time': appointment.start_time.isoformat(),
-                'end_time': appointment.end_time.isoformat(),
-                'status': appointment.status.value,
-                'points_required': appointment.points_required,
-                'points_used': appointment.points_used,
-                'meeting_url': appointment.meeting_url,
-                'notes': appointment.notes,
-                'created_at': appointment.created_at.isoformat(),
-                'updated_at': appointment.updated_at.isoformat()
-            },
+            'data': appointment_serializer.dump(appointment),
             'message': 'Appointment found successfully'
         }, 200
         
@@ -122,46 +258,35 @@ def get_appointment(appointment_id):
 
 @bp.route('/student/<int:student_id>', methods=['GET'])
 def get_student_appointments(student_id):
-    """Get all appointments for a student"""
+    """Get appointments for a student, newest first, one page at a time"""
     try:
-        # pagination
+        # pagination: prefer the keyset cursor, `page` is kept for older clients
+        page, size = get_page_args()
         try:
-            page = max(1, int(request.args.get('page', 1)))
-            size = max(1, min(100, int(request.args.get('size', 20))))
-        except ValueError:
-            page, size = 1, 20
+            cursor = decode_cursor(request.args.get('cursor'))
+        except ValueError as e:
+            return {
+                'success': False,
+                'message': str(e)
+            }, 400
 
-        appointments = appointment_service.get_appointments_by_student(student_id)
-        
-        total = len(appointments)
-        start = (page - 1) * size
-        end = start + size
-        appointments = appointments[start:end]
+        offset = 0 if cursor else (page - 1) * size
+        appointments, next_cursor = appointment_service.get_appointments_page_by_student(
+            student_id, size, cursor=cursor, offset=offset
+        )
+        total = appointment_service.count_appointments_by_student(student_id)
 
-        appointment_list = []
-        for appointment in appointments:
-            appointment_list.append({
-                'id': appointment.id,
-                'mentor_id': appointment.mentor_id,
-                'student_id': appointment.student_id,
-                'project_group_id': appointment.project_group_id,
-                'title': appointment.title,
-                'description': appointment.description,
-                'start_time': appointment.start_time.isoformat(),
-                'end_time': appointment.end_time.isoformat(),
-                'status': appointment.status.value,
-                'points_required': appointment.points_required,
-                'points_used': appointment.points_used,
-                'meeting_url': appointment.meeting_url,
-                'notes': appointment.notes,
-                'created_at': appointment.created_at.isoformat(),
-                'updated_at': appointment.updated_at.isoformat()
-            })
+        appointment_list = appointment_serializer.dump_many(appointments)
         
         return {
             'success': True,
             'data': appointment_list,
-            'meta': {'page': page, 'size': size, 'total': total},
+            'meta': {
+                'page': None if cursor else page,
+                'size': size,
+                'total': total,
+                'next_cursor': encode_cursor(next_cursor) if next_cursor else None
+            },
             'message': f'Found {len(appointment_list)} appointments'
         }, 200
         
@@ -173,46 +298,35 @@ def get_student_appointments(student_id):
 
 @bp.route('/mentor/<int:mentor_id>', methods=['GET'])
 def get_mentor_appointments(mentor_id):
-    """Get all appointments for a mentor"""
+    """Get appointments for a mentor, newest first, one page at a time"""
     try:
-        # pagination
+        # pagination: prefer the keyset cursor, `page` is kept for older clients
+        page, size = get_page_args()
         try:
-            page = max(1, int(request.args.get('page', 1)))
-            size = max(1, min(100, int(request.args.get('size', 20))))
-        except ValueError:
-            page, size = 1, 20
+            cursor = decode_cursor(request.args.get('cursor'))
+        except ValueError as e:
+            return {
+                'success': False,
+                'message': str(e)
+            }, 400
 
-        appointments = appointment_service.get_appointments_by_mentor(mentor_id)
-        
-        total = len(appointments)
-        start = (page - 1) * size
-        end = start + size
-        appointments = appointments[start:end]
+        offset = 0 if cursor else (page - 1) * size
+        appointments, next_cursor = appointment_service.get_appointments_page_by_mentor(
+            mentor_id, size, cursor=cursor, offset=offset
+        )
+        total = appointment_service.count_appointments_by_mentor(mentor_id)
 
-        appointment_list = []
-        for appointment in appointments:
-            appointment_list.append({
-                'id': appointment.id,
-                'mentor_id': appointment.mentor_id,
-                'student_id': appointment.student_id,
-                'project_group_id': appointment.project_group_id,
-                'title': appointment.title,
-                'description': appointment.description,
-                'start_time': appointment.start_time.isoformat(),
-                'end_time': appointment.end_time.isoformat(),
-                'status': appointment.status.value,
-                'points_required': appointment.points_required,
-                'points_used': appointment.points_used,
-                'meeting_url': appointment.meeting_url,
-                'notes': appointment.notes,
-                'created_at': appointment.created_at.isoformat(),
-                'updated_at': appointment.updated_at.isoformat()
-            })
+        appointment_list = appointment_serializer.dump_many(appointments)
         
         return {
             'success': True,
             'data': appointment_list,
-            'meta': {'page': page, 'size': size, 'total': total},
+            'meta': {
+                'page': None if cursor else page,
+                'size': size,
+                'total': total,
+                'next_cursor': encode_cursor(next_cursor) if next_cursor else None
+            },
             'message': f'Found {len(appointment_list)} appointments'
         }, 200
         
@@ -239,6 +353,11 @@ def confirm_appointment(appointment_id):
             'message': 'Appointment confirmed successfully'
         }, 200
         
+    except ValueError as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 400
     except Exception as e:
         return {
             'success': False,
@@ -271,6 +390,11 @@ def cancel_appointment(appointment_id):
             'message': 'Appointment cancelled successfully. Points have been refunded.'
         }, 200
         
+    except ValueError as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 400
     except Exception as e:
         return {
             'success': False,
@@ -294,6 +418,123 @@ def complete_appointment(appointment_id):
             'message': 'Appointment marked as completed'
         }, 200
         
+    except ValueError as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 400
+    except Exception as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 500
+
+@bp.route('/<int:appointment_id>/no-show', methods=['PUT'])
+def mark_no_show(appointment_id):
+    """Mark appointment as missed"""
+    try:
+        success = appointment_service.mark_no_show(appointment_id)
+        
+        if not success:
+            return {
+                'success': False,
+                'message': 'Appointment not found'
+            }, 404
+        
+        return {
+            'success': True,
+            'message': 'Appointment marked as no-show'
+        }, 200
+        
+    except ValueError as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 400
+    except Exception as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 500
+
+def _parse_status(value, field='status') -> AppointmentStatus:
+    try:
+        return AppointmentStatus(value)
+    except ValueError:
+        raise ValueError(f"Invalid {field}. Use: {', '.join(status.value for status in AppointmentStatus)}")
+
+@bp.route('/batch/status', methods=['PUT'])
+def transition_appointments():
+    """Move many appointments to a status at once; ones the state machine does not allow are skipped"""
+    try:
+        data = request.get_json() or {}
+        appointment_ids = data.get('appointment_ids')
+        if not isinstance(appointment_ids, list) or not appointment_ids or not data.get('status'):
+            return {
+                'success': False,
+                'message': 'appointment_ids (a non-empty list) and status are required'
+            }, 400
+        status = _parse_status(data['status'])
+        
+        moved, skipped = appointment_service.transition_appointments([int(i) for i in appointment_ids], status)
+        
+        return {
+            'success': True,
+            'data': {
+                'moved': [appointment.id for appointment in moved],
+                'skipped': skipped,
+                'points_refunded': sum(appointment.points_used for appointment in moved)
+                if status == AppointmentStatus.CANCELLED else 0
+            },
+            'message': f'Moved {len(moved)} appointments to {status.value}, skipped {len(skipped)}'
+        }, 200
+        
+    except ValueError as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 400
+    except Exception as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 500
+
+@bp.route('/batch/ended', methods=['PUT'])
+def transition_ended_appointments():
+    """Move every appointment in from_status that ended by ended_before to a status (end-of-day processing)"""
+    try:
+        data = request.get_json() or {}
+        if not data.get('from_status') or not data.get('status') or not data.get('ended_before'):
+            return {
+                'success': False,
+                'message': 'from_status, status and ended_before are required'
+            }, 400
+        from_status = _parse_status(data['from_status'], 'from_status')
+        status = _parse_status(data['status'])
+        try:
+            ended_before = datetime.fromisoformat(data['ended_before'].replace('Z', '+00:00'))
+        except ValueError:
+            return {
+                'success': False,
+                'message': 'Invalid datetime format. Use ISO format (YYYY-MM-DDTHH:MM:SS)'
+            }, 400
+        
+        moved = appointment_service.transition_ended_appointments(from_status, status, ended_before)
+        
+        return {
+            'success': True,
+            'data': {
+                'moved': [appointment.id for appointment in moved]
+            },
+            'message': f'Moved {len(moved)} appointments to {status.value}'
+        }, 200
+        
+    except ValueError as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 400
     except Exception as e:
         return {
             'success': False,
@@ -306,6 +547,12 @@ def get_available_slots(mentor_id):
     try:
         date_str = request.args.get('date')
         duration_hours = float(request.args.get('duration_hours', 1.0))
+        step_minutes = request.args.get('step_minutes', DEFAULT_SLOT_STEP_MINUTES, type=int)
+        if duration_hours <= 0 or step_minutes <= 0:
+            return {
+                'success': False,
+                'message': 'duration_hours and step_minutes must be positive'
+            }, 400
         
         if not date_str:
             return {
@@ -321,7 +568,7 @@ def get_available_slots(mentor_id):
                 'message': 'Invalid date format. Use YYYY-MM-DD'
             }, 400
         
-        slots = appointment_service.get_available_slots(mentor_id, date, duration_hours)
+        slots = appointment_service.get_available_slots(mentor_id, date, duration_hours, step_minutes)
         
         # Format slots for response
         formatted_slots = []
@@ -343,3 +590,75 @@ def get_available_slots(mentor_id):
             'success': False,
             'message': str(e)
         }, 500
+
+@bp.route('/availability', methods=['GET'])
+def search_availability():
+    """Find mentors who are free in a time window, optionally filtered by expertise"""
+    try:
+        start_str = request.args.get('start')
+        end_str = request.args.get('end')
+        expertise = request.args.get('expertise')
+        duration_hours = float(request.args.get('duration_hours', 1.0))
+        
+        if not start_str or not end_str:
+            return {
+                'success': False,
+                'message': 'start and end parameters are required'
+            }, 400
+        
+        try:
+            window_start = datetime.fromisoformat(start_str.replace('Z', '+00:00'))
+            window_end = datetime.fromisoformat(end_str.replace('Z', '+00:00'))
+        except ValueError:
+            return {
+                'success': False,
+                'message': 'Invalid datetime format. Use ISO format (YYYY-MM-DDTHH:MM:SS)'
+            }, 400
+        
+        if window_end <= window_start or duration_hours <= 0:
+            return {
+                'success': False,
+                'message': 'end must be after start and duration_hours must be positive'
+            }, 400
+        if window_end - window_start > timedelta(days=MAX_AVAILABILITY_SEARCH_DAYS):
+            return {
+                'success': False,
+                'message': f'Search window cannot exceed {MAX_AVAILABILITY_SEARCH_DAYS} days'
+            }, 400
+        
+        results = appointment_service.search_available_mentors(
+            window_start, window_end, expertise=expertise, duration_hours=duration_hours
+        )
+        
+        mentor_list = []
+        for result in results:
+            mentor_list.append({
+                'mentor_id': result['mentor_id'],
+                'user_id': result['user_id'],
+                'hourly_rate': result['hourly_rate'],
+                'rating': result['rating'],
+                'points_required': result['points_required'],
+                'free_windows': [
+                    {
+                        'start_time': window['start_time'].isoformat(),
+                        'end_time': window['end_time'].isoformat()
+                    } for window in result['free_windows']
+                ]
+            })
+        
+        return {
+            'success': True,
+            'data': mentor_list,
+            'message': f'Found {len(mentor_list)} available mentors'
+        }, 200
+        
+    except ValueError as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 400
+    except Exception as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 500
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from services.course_service import CourseService
 from infrastructure.repositories.course_repository import CourseRepository
+from api.conditional import not_modified
 from datetime import datetime
 
 bp = Blueprint('course', __name__, url_prefix='/api/courses')
@@ -10,6 +11,9 @@ course_service = CourseService(CourseRepository())
 @bp.route('/', methods=['GET'])
 def list_courses():
     courses = course_service.list_courses()
+    unchanged = not_modified('courses', courses)
+    if unchanged:
+        return unchanged
     return jsonify([
         {
             'id': c.id,
@@ -29,6 +33,9 @@ def get_course(course_id):
     c = course_service.get_course(course_id)
     if not c:
         return {'message': 'Course not found'}, 404
+    unchanged = not_modified('course', [c])
+    if unchanged:
+        return unchanged
     return {
         'id': c.id,
         'course_name': c.course_name,
@@ -0,0 +1,67 @@
+from flask import Blueprint, Response, request, jsonify
+from infrastructure.repositories.mentor_repository import MentorRepository
+from infrastructure.services.event_bus import get_event_bus
+from infrastructure.databases.mssql import remove_session
+from domain.models.ievent_bus import mentor_topic, user_topic
+from domain.constants import SSE_HEARTBEAT_SECONDS
+
+bp = Blueprint('events', __name__, url_prefix='/api/events')
+
+mentor_repository = MentorRepository()
+event_bus = get_event_bus()
+
+@bp.route('/stream', methods=['GET'])
+def stream_events():
+    """Stream a user's appointment and wallet changes as server-sent events"""
+    try:
+        user_id = request.args.get('user_id', type=int)
+        if not user_id:
+            return jsonify({
+                'success': False,
+                'message': 'User ID is required'
+            }), 400
+        
+        # A mentor also hears about appointments booked with them
+        topics = [user_topic(user_id)]
+        mentor = mentor_repository.get_by_user_id(user_id)
+        if mentor:
+            topics.append(mentor_topic(mentor.id))
+        # Nothing below touches the database: give the connection back before streaming
+        remove_session()
+        
+        subscription = event_bus.subscribe(topics)
+        if subscription is None:
+            return jsonify({
+                'success': False,
+                'message': 'Too many open event streams, try again later'
+            }), 503
+        
+        def generate():
+            try:
+                yield f"retry: {SSE_HEARTBEAT_SECONDS * 1000}\n: connected\n\n"
+                while True:
+                    frames = subscription.wait(SSE_HEARTBEAT_SECONDS)
+                    # A comment line keeps proxies from closing an idle stream
+                    yield ''.join(frames) if frames else ': heartbeat\n\n'
+            finally:
+                event_bus.unsubscribe(subscription)
+        
+        return Response(generate(), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
+@bp.route('/stats', methods=['GET'])
+def get_event_stats():
+    """Get the number of open event streams and events published"""
+    return jsonify({
+        'success': True,
+        'data': event_bus.stats(),
+        'message': 'Event stream stats retrieved successfully'
+    }), 200
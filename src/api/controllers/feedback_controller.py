@@ -0,0 +1,174 @@
+from flask import Blueprint, request
+from services.feedback_service import FeedbackService
+from infrastructure.repositories.feedback_repository import FeedbackRepository
+from infrastructure.repositories.rating_aggregator import RatingAggregator
+from infrastructure.repositories.appointment_repository import AppointmentRepository
+from infrastructure.repositories.mentor_repository import MentorRepository
+from infrastructure.databases.unit_of_work import UnitOfWork
+from infrastructure.services.caches import get_cache
+from api.serializers import feedback_serializer
+from api.controllers.mentor_controller import mentor_service
+
+bp = Blueprint('feedback', __name__, url_prefix='/api/feedback')
+
+# Initialize services
+feedback_service = FeedbackService(
+    FeedbackRepository(),
+    RatingAggregator(),
+    AppointmentRepository(),
+    MentorRepository(),
+    UnitOfWork(),
+    get_cache('mentor_directory'),
+    mentor_service
+)
+
+@bp.route('/', methods=['POST'])
+def submit_feedback():
+    """Submit feedback for a completed appointment"""
+    try:
+        data = request.get_json() or {}
+        required_fields = ['appointment_id', 'reviewer_id', 'rating']
+        for field in required_fields:
+            if field not in data:
+                return {
+                    'success': False,
+                    'message': f'Missing required field: {field}'
+                }, 400
+        
+        feedback = feedback_service.submit_feedback(
+            appointment_id=data['appointment_id'],
+            reviewer_id=data['reviewer_id'],
+            rating=data['rating'],
+            comment=data.get('comment', '')
+        )
+        
+        return {
+            'success': True,
+            'data': feedback_serializer.dump(feedback),
+            'message': 'Feedback submitted successfully'
+        }, 201
+        
+    except ValueError as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 400
+    except Exception as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 500
+
+@bp.route('/<int:feedback_id>', methods=['PUT'])
+def update_feedback(feedback_id):
+    """Update the rating or comment of a feedback"""
+    try:
+        data = request.get_json() or {}
+        if 'reviewer_id' not in data:
+            return {
+                'success': False,
+                'message': 'Missing required field: reviewer_id'
+            }, 400
+        
+        feedback = feedback_service.update_feedback(
+            feedback_id,
+            data['reviewer_id'],
+            rating=data.get('rating'),
+            comment=data.get('comment')
+        )
+        if not feedback:
+            return {
+                'success': False,
+                'message': 'Feedback not found'
+            }, 404
+        
+        return {
+            'success': True,
+            'data': feedback_serializer.dump(feedback),
+            'message': 'Feedback updated successfully'
+        }, 200
+        
+    except ValueError as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 400
+    except Exception as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 500
+
+@bp.route('/<int:feedback_id>', methods=['DELETE'])
+def delete_feedback(feedback_id):
+    """Delete a feedback"""
+    try:
+        reviewer_id = request.args.get('reviewer_id', type=int)
+        if not reviewer_id:
+            return {
+                'success': False,
+                'message': 'Reviewer ID is required'
+            }, 400
+        
+        if not feedback_service.delete_feedback(feedback_id, reviewer_id):
+            return {
+                'success': False,
+                'message': 'Feedback not found'
+            }, 404
+        
+        return {
+            'success': True,
+            'message': 'Feedback deleted successfully'
+        }, 200
+        
+    except ValueError as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 400
+    except Exception as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 500
+
+@bp.route('/user/<int:user_id>', methods=['GET'])
+def get_user_feedback(user_id):
+    """Get feedback received by a user"""
+    try:
+        feedbacks = feedback_service.get_feedback_for_user(user_id)
+        return {
+            'success': True,
+            'data': feedback_serializer.dump_many(feedbacks),
+            'message': f'Found {len(feedbacks)} feedbacks'
+        }, 200
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 500
+
+@bp.route('/user/<int:user_id>/summary', methods=['GET'])
+def get_rating_summary(user_id):
+    """Get a user's rating count, average and star histogram per feedback type"""
+    try:
+        summaries = feedback_service.get_rating_summaries(user_id)
+        return {
+            'success': True,
+            'data': [
+                {
+                    'feedback_type': summary.feedback_type.value,
+                    'count': summary.count,
+                    'average': round(summary.average, 2),
+                    'histogram': dict(zip(range(1, len(summary.histogram) + 1), summary.histogram))
+                } for summary in summaries
+            ],
+            'message': 'Rating summary retrieved successfully'
+        }, 200
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 500
@@ -2,7 +2,12 @@ from flask import Blueprint, request
 from services.mentor_service import MentorService
 from infrastructure.repositories.mentor_repository import MentorRepository
 from infrastructure.repositories.appointment_repository import AppointmentRepository
+from infrastructure.databases.unit_of_work import UnitOfWork
+from infrastructure.services.caches import get_cache
 from domain.models.mentor import MentorStatus
+from api.pagination import get_page_args
+from api.serializers import mentor_serializer
+from api.conditional import not_modified
 from datetime import datetime
 import json
 
@@ -11,7 +16,7 @@ bp = Blueprint('mentor', __name__, url_prefix='/api/mentors')
 # Initialize services
 mentor_repository = MentorRepository()
 appointment_repository = AppointmentRepository()
-mentor_service = MentorService(mentor_repository, appointment_repository)
+mentor_service = MentorService(mentor_repository, appointment_repository, UnitOfWork(), get_cache('mentor_directory'))
 
 @bp.route('/', methods=['GET'])
 def get_mentors():
@@ -38,30 +43,121 @@ def get_mentors():
         end = start + size
         total = len(mentors)
         mentors = mentors[start:end]
+        unchanged = not_modified('mentors', mentors, total)
+        if unchanged:
+            return unchanged
         
+        mentor_list = mentor_serializer.dump_many(mentors)
+        
+        return {
+            'success': True,
+            'data': mentor_list,
+            'meta': {'page': page, 'size': size, 'total': total},
+            'message': f'Found {len(mentor_list)} mentors'
+        }, 200
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 500
+
+@bp.route('/search', methods=['GET'])
+def search_mentors():
+    """Search mentors by bio and expertise text, ranked, with expertise facet counts"""
+    try:
+        page, size = get_page_args()
+        min_rating = request.args.get('min_rating', type=float)
+        max_rate = request.args.get('max_rate', type=int)
+        results, facets = mentor_service.search_mentors(
+            query=request.args.get('q', ''),
+            expertise=request.args.get('expertise'),
+            available_only=request.args.get('available_only', 'false').lower() == 'true',
+            min_rating=min_rating,
+            max_rate=max_rate,
+            sort=request.args.get('sort', 'relevance')
+        )
+        
+        total = len(results)
+        start = (page - 1) * size
         mentor_list = []
-        for mentor in mentors:
+        for result in results[start:start + size]:
+            mentor = result.mentor
             mentor_list.append({
-                'id': mentor.id,
-                'user_id': mentor.user_id,
-                'bio': mentor.bio,
-                'expertise_areas': mentor.expertise_areas,
-                'hourly_rate': mentor.hourly_rate,
-                'max_sessions_per_day': mentor.max_sessions_per_day,
-                'rating': mentor.rating,
-                'total_sessions': mentor.total_sessions,
-                'status': mentor.status.value,
-                'created_at': mentor.created_at.isoformat() if mentor.created_at else None,
-                'updated_at': mentor.updated_at.isoformat() if mentor.updated_at else None
+                **mentor_serializer.dump(mentor),
+                'score': round(result.score, 4)
             })
         
         return {
             'success': True,
             'data': mentor_list,
-            'meta': {'page': page, 'size': size, 'total': total},
-            'message': f'Found {len(mentor_list)} mentors'
+            'meta': {'page': page, 'size': size, 'total': total, 'facets': {'expertise': facets}},
+            'message': f'Found {total} mentors'
+        }, 200
+        
+    except ValueError as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 400
+    except Exception as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 500
+
+@bp.route('/match', methods=['GET'])
+def match_mentors():
+    """Recommend mentors for expertise tags and a time window, best match first"""
+    try:
+        start_str = request.args.get('start')
+        end_str = request.args.get('end')
+        if not start_str or not end_str:
+            return {
+                'success': False,
+                'message': 'start and end parameters are required'
+            }, 400
+        
+        try:
+            start_time = datetime.fromisoformat(start_str.replace('Z', '+00:00'))
+            end_time = datetime.fromisoformat(end_str.replace('Z', '+00:00'))
+        except ValueError:
+            return {
+                'success': False,
+                'message': 'Invalid datetime format. Use ISO format (YYYY-MM-DDTHH:MM:SS)'
+            }, 400
+        
+        # expertise may be repeated or comma separated
+        expertise = [tag for value in request.args.getlist('expertise') for tag in value.split(',')]
+        matches = mentor_service.match_mentors(
+            expertise,
+            start_time,
+            end_time,
+            max_rate=request.args.get('max_rate', type=int),
+            limit=request.args.get('limit', 10, type=int)
+        )
+        
+        mentor_list = []
+        for match in matches:
+            mentor = match.mentor
+            mentor_list.append({
+                **mentor_serializer.dump(mentor),
+                'score': round(match.score, 4),
+                'matched_expertise': match.matched_expertise,
+                'remaining_sessions': match.remaining_sessions
+            })
+        
+        return {
+            'success': True,
+            'data': mentor_list,
+            'message': f'Found {len(mentor_list)} matching mentors'
         }, 200
         
+    except ValueError as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 400
     except Exception as e:
         return {
             'success': False,
@@ -78,22 +174,13 @@ def get_mentor(mentor_id):
                 'success': False,
                 'message': 'Mentor not found'
             }, 404
+        unchanged = not_modified('mentor', [mentor])
+        if unchanged:
+            return unchanged
         
         return {
             'success': True,
-            'data': {
-                'id': mentor.id,
-                'user_id': mentor.user_id,
-                'bio': mentor.bio,
-                'expertise_areas': mentor.expertise_areas,
-                'hourly_rate': mentor.hourly_rate,
-                'max_sessions_per_day': mentor.max_sessions_per_day,
-                'rating': mentor.rating,
-                'total_sessions': mentor.total_sessions,
-                'status': mentor.status.value,
-                'created_at': mentor.created_at.isoformat() if mentor.created_at else None,
-                'updated_at': mentor.updated_at.isoformat() if mentor.updated_at else None
-            },
+            'data': mentor_serializer.dump(mentor),
             'message': 'Mentor found successfully'
         }, 200
         
@@ -128,15 +215,7 @@ def create_mentor():
         
         return {
             'success': True,
-            'data': {
-                'id': mentor.id,
-                'user_id': mentor.user_id,
-                'bio': mentor.bio,
-                'expertise_areas': mentor.expertise_areas,
-                'hourly_rate': mentor.hourly_rate,
-                'max_sessions_per_day': mentor.max_sessions_per_day,
-                'status': mentor.status.value
-            },
+            'data': mentor_serializer.dump(mentor),
             'message': 'Mentor profile created successfully'
         }, 201
         
@@ -168,15 +247,7 @@ def update_mentor(mentor_id):
         
         return {
             'success': True,
-            'data': {
-                'id': mentor.id,
-                'user_id': mentor.user_id,
-                'bio': mentor.bio,
-                'expertise_areas': mentor.expertise_areas,
-                'hourly_rate': mentor.hourly_rate,
-                'max_sessions_per_day': mentor.max_sessions_per_day,
-                'status': mentor.status.value
-            },
+            'data': mentor_serializer.dump(mentor),
             'message': 'Mentor profile updated successfully'
         }, 200
         
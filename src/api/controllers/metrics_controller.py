@@ -0,0 +1,38 @@
+from flask import Blueprint, jsonify
+from infrastructure.databases.mssql import get_pool_status
+from infrastructure.services.caches import cache_stats
+
+bp = Blueprint('metrics', __name__, url_prefix='/api/metrics')
+
+@bp.route('/db-pool', methods=['GET'])
+def get_db_pool_metrics():
+    """Get live connection pool usage and checkout wait times"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': get_pool_status(),
+            'message': 'Pool metrics retrieved successfully'
+        }), 200
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
+
+
+@bp.route('/cache', methods=['GET'])
+def get_cache_metrics():
+    """Get hit/miss counters and size of each application cache"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': cache_stats(),
+            'message': 'Cache metrics retrieved successfully'
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 500
@@ -0,0 +1,54 @@
+from flask import Blueprint
+from services.notification_service import NotificationService
+from services.notification_dispatcher import NotificationDispatcher
+from infrastructure.repositories.notification_outbox_repository import NotificationOutboxRepository
+from infrastructure.services.notification_transports import get_transport
+from infrastructure.databases.unit_of_work import UnitOfWork
+from infrastructure.databases.mssql import remove_session
+from config import Config
+
+bp = Blueprint('notification', __name__, url_prefix='/api/notifications')
+
+# Shared with the appointment and schedule controllers, which write to the outbox
+notification_outbox = NotificationOutboxRepository()
+notification_service = NotificationService(notification_outbox, UnitOfWork())
+notification_dispatcher = NotificationDispatcher(
+    notification_outbox, get_transport(), UnitOfWork(),
+    workers=Config.NOTIFICATION_WORKERS, end_of_run=remove_session
+)
+
+@bp.route('/outbox', methods=['GET'])
+def get_outbox_status():
+    """Get outbox row counts per status and the dispatcher's delivery counters"""
+    try:
+        return {
+            'success': True,
+            'data': {
+                'outbox': notification_outbox.count_by_status(),
+                'dispatcher': notification_dispatcher.stats()
+            },
+            'message': 'Outbox status retrieved successfully'
+        }, 200
+    
+    except Exception as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 500
+
+@bp.route('/dispatch', methods=['POST'])
+def dispatch_notifications():
+    """Deliver every due notification now, for deployments that do not run the worker pool"""
+    try:
+        result = notification_dispatcher.drain()
+        return {
+            'success': True,
+            'data': result,
+            'message': f"Sent {result['sent']} notifications, {result['failed']} failed"
+        }, 200
+    
+    except Exception as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 500
@@ -0,0 +1,45 @@
+from flask import Blueprint
+from services.schedule_service import ScheduleService
+from infrastructure.databases.mssql import remove_session
+from api.controllers.appointment_controller import appointment_repository, appointment_service
+from api.controllers.notification_controller import notification_service
+
+bp = Blueprint('schedule', __name__, url_prefix='/api/schedule')
+
+# Shares the appointment controller's service so that every booking change reaches the scheduler
+schedule_service = ScheduleService(
+    appointment_repository, appointment_service, notification_service, end_of_run=remove_session
+)
+
+@bp.route('/jobs', methods=['GET'])
+def get_scheduled_jobs():
+    """Get the scheduler's state and its next due reminder and auto-close jobs"""
+    try:
+        return {
+            'success': True,
+            'data': schedule_service.stats(),
+            'message': 'Scheduler state retrieved successfully'
+        }, 200
+    
+    except Exception as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 500
+
+@bp.route('/run', methods=['POST'])
+def run_scheduled_jobs():
+    """Fire the jobs due now, for deployments that trigger the scheduler instead of running its thread"""
+    try:
+        fired = schedule_service.run_once()
+        return {
+            'success': True,
+            'data': fired,
+            'message': f"Fired {sum(fired.values())} scheduled jobs"
+        }, 200
+    
+    except Exception as e:
+        return {
+            'success': False,
+            'message': str(e)
+        }, 500
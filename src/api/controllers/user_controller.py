@@ -2,6 +2,8 @@ from flask import Blueprint, jsonify, request
 from infrastructure.repositories.user_repository import UserRepository
 from infrastructure.models.user_model import UserModel
 from infrastructure.databases.mssql import session
+from domain.models.user import UserRole
+from api.serializers import public_user_serializer, user_serializer
 import jwt
 from datetime import datetime
 
@@ -28,8 +30,8 @@ def get_current_user():
 
 @user_bp.route('/mentors', methods=['GET'])
 def get_mentors():
-    mentors = UserRepository().get_users_by_role('MENTOR')
-    return jsonify({'data': mentors})
+    mentors = UserRepository().get_users_by_role(UserRole.MENTOR)
+    return jsonify({'data': user_serializer.dump_many(mentors)})
 
 @user_bp.route('/profile', methods=['GET'])
 def get_profile():
@@ -38,18 +40,7 @@ def get_profile():
     if not user:
         return jsonify({'error': 'Unauthorized'}), 401
     
-    profile_data = {
-        'id': user.id,
-        'username': user.username,
-        'email': user.email,
-        'full_name': user.full_name,
-        'role': user.role.value if user.role else 'student',
-        'phone': user.phone,
-        'avatar_url': user.avatar_url,
-        'is_active': user.is_active,
-        'created_at': user.created_at.isoformat() if user.created_at else None,
-        'updated_at': user.updated_at.isoformat() if user.updated_at else None
-    }
+    profile_data = user_serializer.dump(user)
     
     return jsonify({'data': profile_data}), 200
 
@@ -77,18 +68,7 @@ def update_profile():
     try:
         session.commit()
         
-        profile_data = {
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'full_name': user.full_name,
-            'role': user.role.value if user.role else 'student',
-            'phone': user.phone,
-            'avatar_url': user.avatar_url,
-            'is_active': user.is_active,
-            'created_at': user.created_at.isoformat() if user.created_at else None,
-            'updated_at': user.updated_at.isoformat() if user.updated_at else None
-        }
+        profile_data = user_serializer.dump(user)
         
         return jsonify({
             'message': 'Profile updated successfully',
@@ -106,13 +86,6 @@ def get_user_by_id(user_id):
         return jsonify({'error': 'User not found'}), 404
     
     # Return only public information
-    public_data = {
-        'id': user.id,
-        'username': user.username,
-        'full_name': user.full_name,
-        'role': user.role.value if user.role else 'student',
-        'avatar_url': user.avatar_url,
-        'created_at': user.created_at.isoformat() if user.created_at else None
-    }
+    public_data = public_user_serializer.dump(user)
     
     return jsonify({'data': public_data}), 200
\ No newline at end of file
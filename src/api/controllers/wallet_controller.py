@@ -1,15 +1,30 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from services.wallet_service import WalletService
 from infrastructure.repositories.wallet_repository import WalletRepository
+from infrastructure.databases.unit_of_work import UnitOfWork
+from infrastructure.services.event_bus import get_event_bus
 from domain.models.wallet import TransactionType
+from domain.models.availability import to_naive_utc
+from api.json_provider import dumps, to_primitive
+from api.serializers import transaction_serializer, wallet_serializer
+from api.conditional import not_modified
+from api.pagination import get_page_args, encode_cursor, decode_cursor
 from datetime import datetime
-import json
+import csv
+import io
 
 bp = Blueprint('wallet', __name__, url_prefix='/api/wallet')
 
 # Initialize services
 wallet_repository = WalletRepository()
-wallet_service = WalletService(wallet_repository)
+wallet_service = WalletService(wallet_repository, UnitOfWork(), get_event_bus())
+
+# Streaming export formats and their content types
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+CSV_FIELDS = ['id', 'wallet_id', 'amount', 'type', 'description', 'appointment_id', 'created_at']
 
 @bp.route('/', methods=['GET'])
 def get_wallet():
@@ -26,18 +41,13 @@ def get_wallet():
         if not wallet:
             # Create new wallet if doesn't exist
             wallet = wallet_service.create_wallet(user_id)
+        unchanged = not_modified('wallet', [wallet])
+        if unchanged:
+            return unchanged
         
         return jsonify({
             'success': True,
-            'data': {
-                'id': wallet.id,
-                'user_id': wallet.user_id,
-                'balance': wallet.balance,
-                'total_spent': wallet.total_spent,
-                'total_earned': wallet.total_earned,
-                'created_at': wallet.created_at.isoformat() if wallet.created_at else None,
-                'updated_at': wallet.updated_at.isoformat() if wallet.updated_at else None
-            },
+            'data': wallet_serializer.dump(wallet),
             'message': 'Wallet retrieved successfully'
         }), 200
         
@@ -49,7 +59,11 @@ def get_wallet():
 
 @bp.route('/transactions', methods=['GET'])
 def get_transactions():
-    """Get wallet transactions for current user"""
+    """Get wallet transactions for current user, newest first.
+
+    Supports `type`, `from` and `to` filters. `format=ndjson` or `format=csv`
+    streams the whole matching ledger instead of a single page.
+    """
     try:
         user_id = request.args.get('user_id', type=int)
         if not user_id:
@@ -58,22 +72,41 @@ def get_transactions():
                 'message': 'User ID is required'
             }), 400
         
-        transactions = wallet_service.get_transactions_by_user_id(user_id)
+        try:
+            transaction_type = TransactionType(request.args['type']) if request.args.get('type') else None
+            date_from = _parse_date_arg('from')
+            date_to = _parse_date_arg('to')
+            cursor = decode_cursor(request.args.get('cursor'))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        
+        export_format = request.args.get('format', 'json').lower()
+        if export_format in EXPORT_FORMATS:
+            transactions = wallet_service.export_transactions(user_id, transaction_type, date_from, date_to)
+            writer = _ndjson_lines if export_format == 'ndjson' else _csv_lines
+            return Response(
+                stream_with_context(writer(transactions)),
+                mimetype=EXPORT_FORMATS[export_format],
+                headers={'Content-Disposition': f'attachment; filename=transactions_{user_id}.{export_format}'}
+            )
+        
+        _, size = get_page_args()
+        transactions, next_cursor = wallet_service.get_transactions_page(
+            user_id, size, cursor, transaction_type, date_from, date_to
+        )
         
-        transaction_list = []
-        for transaction in transactions:
-            transaction_list.append({
-                'id': transaction.id,
-                'wallet_id': transaction.wallet_id,
-                'amount': transaction.amount,
-                'type': transaction.type.value,
-                'description': transaction.description,
-                'created_at': transaction.created_at.isoformat() if transaction.created_at else None
-            })
+        transaction_list = transaction_serializer.dump_many(transactions)
         
         return jsonify({
             'success': True,
             'data': transaction_list,
+            'meta': {
+                'size': size,
+                'next_cursor': encode_cursor(next_cursor) if next_cursor else None
+            },
             'message': f'Found {len(transaction_list)} transactions'
         }), 200
         
@@ -83,6 +116,35 @@ def get_transactions():
             'message': str(e)
         }), 500
 
+def _parse_date_arg(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        # created_at is stored as naive UTC: compare against the same
+        return to_naive_utc(datetime.fromisoformat(value.replace('Z', '+00:00')))
+    except ValueError:
+        raise ValueError(f'Invalid {name} date. Use ISO format (YYYY-MM-DDTHH:MM:SS)')
+
+def _csv_value(value):
+    return value if value is None or isinstance(value, (int, str)) else to_primitive(value)
+
+def _ndjson_lines(transactions):
+    for transaction in transactions:
+        yield dumps(transaction_serializer.dump(transaction)) + b'\n'
+
+def _csv_lines(transactions):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for transaction in transactions:
+        writer.writerow({name: _csv_value(value) for name, value in transaction_serializer.dump(transaction).items()})
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
+
 @bp.route('/add-points', methods=['POST'])
 def add_points():
     """Add points to wallet"""
@@ -109,12 +171,7 @@ def add_points():
         
         return jsonify({
             'success': True,
-            'data': {
-                'id': wallet.id,
-                'user_id': wallet.user_id,
-                'balance': wallet.balance,
-                'total_earned': wallet.total_earned
-            },
+            'data': wallet_serializer.dump(wallet),
             'message': f'Added {amount} points successfully'
         }), 200
         
@@ -156,12 +213,7 @@ def spend_points():
         
         return jsonify({
             'success': True,
-            'data': {
-                'id': wallet.id,
-                'user_id': wallet.user_id,
-                'balance': wallet.balance,
-                'total_spent': wallet.total_spent
-            },
+            'data': wallet_serializer.dump(wallet),
             'message': f'Spent {amount} points successfully'
         }), 200
         
@@ -1,13 +1,38 @@
 # Middleware functions for processing requests and responses
 
-from flask import  request, jsonify, current_app
+from flask import  request, jsonify, current_app, g
 from infrastructure.databases.mssql import remove_session
+from infrastructure.databases.routing import set_consistency_key, reset_consistency_key
 import jwt
 
+# Cache-Control per endpoint. Public data may be shared by caches; per-user data
+# stays private. no-cache still lets clients store the body, but makes them
+# revalidate with If-None-Match, which is a cheap 304 while nothing changed.
+CACHE_CONTROL = {
+    'mentor.get_mentors': 'public, no-cache',
+    'mentor.get_mentor': 'public, no-cache',
+    'course.list_courses': 'public, max-age=60',
+    'course.get_course': 'public, max-age=60',
+    'appointment.get_appointment': 'private, no-cache',
+    'wallet.get_wallet': 'private, no-cache',
+}
+
 def log_request_info(app):
     app.logger.debug('Headers: %s', request.headers)
     app.logger.debug('Body: %s', request.get_data())
 
+def consistency_key():
+    """Identify the client for read-your-writes routing: the token's user, else the remote address"""
+    auth_header = request.headers.get('Authorization', '')
+    if auth_header.startswith('Bearer '):
+        try:
+            payload = jwt.decode(auth_header.split(' ', 1)[1], current_app.config['SECRET_KEY'], algorithms=['HS256'])
+            if payload.get('user_id') is not None:
+                return f"user:{payload['user_id']}"
+        except Exception:
+            pass
+    return f"addr:{request.remote_addr}"
+
 def handle_options_request():
     return {'message': 'CORS preflight response'}, 200
 
@@ -18,18 +43,42 @@ def add_custom_headers(response):
     response.headers['X-Custom-Header'] = 'Value'
     return response
 
+def add_cache_headers(response):
+    # Event streams manage their own headers and must never be cached or revalidated
+    if response.mimetype == 'text/event-stream' or request.method not in ('GET', 'HEAD'):
+        return response
+    if response.status_code not in (200, 304):
+        return response
+    validators = g.get('validators')
+    if validators:
+        response.set_etag(validators.etag, weak=True)
+        if validators.last_modified:
+            response.last_modified = validators.last_modified
+    cache_control = CACHE_CONTROL.get(request.endpoint)
+    if cache_control:
+        response.headers['Cache-Control'] = cache_control
+    return response
+
 def middleware(app):
     @app.before_request
     def before_request():
         log_request_info(app)
+        g.consistency_token = set_consistency_key(consistency_key())
 
     @app.after_request
     def after_request(response):
         response = add_custom_headers(response)
+        response = add_cache_headers(response)
         # Ensure SQLAlchemy session is removed after each request
         remove_session()
         return response
 
+    @app.teardown_request
+    def teardown_request(error=None):
+        token = g.pop('consistency_token', None)
+        if token is not None:
+            reset_consistency_key(token)
+
     @app.errorhandler(Exception)
     def handle_exception(error):
         try:
@@ -0,0 +1,34 @@
+# Helpers for paginated list endpoints
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from flask import request
+from domain.constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+def get_page_args() -> Tuple[int, int]:
+    """Read `page` and `size` query parameters, falling back to the defaults."""
+    try:
+        page = max(1, int(request.args.get('page', 1)))
+        size = max(1, min(MAX_PAGE_SIZE, int(request.args.get('size', DEFAULT_PAGE_SIZE))))
+    except ValueError:
+        page, size = 1, DEFAULT_PAGE_SIZE
+    return page, size
+
+def encode_cursor(key: Tuple[datetime, int]) -> str:
+    """Encode a (timestamp, id) keyset position as an opaque URL-safe token."""
+    timestamp, row_id = key
+    raw = json.dumps([timestamp.isoformat(), row_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(token: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """Decode a token produced by `encode_cursor`. Raises ValueError if it is malformed."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        timestamp, row_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError('Invalid cursor') from e
@@ -0,0 +1,62 @@
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+from domain.models.user import UserRole
+
+class Serializer:
+    """Turns objects of one resource into response dicts from a field list compiled once.
+
+    Positional fields are copied as they are: datetimes and enums stay native and
+    the app's JSON provider encodes them, so no per-field isoformat() or .value
+    runs in Python. Keyword fields are computed, from a callable or by reading
+    another attribute name.
+    """
+    __slots__ = ('fields', '_get', '_computed')
+
+    def __init__(self, *fields: str, **computed: Union[str, Callable[[Any], Any]]):
+        self.fields = fields
+        getter = attrgetter(*fields)
+        # attrgetter of a single name returns the value rather than a tuple
+        self._get = getter if len(fields) > 1 else (lambda obj: (getter(obj),))
+        self._computed: Tuple[Tuple[str, Callable[[Any], Any]], ...] = tuple(
+            (name, attrgetter(spec) if isinstance(spec, str) else spec) for name, spec in computed.items()
+        )
+
+    def dump(self, obj: Any) -> Dict[str, Any]:
+        data = dict(zip(self.fields, self._get(obj)))
+        for name, compute in self._computed:
+            data[name] = compute(obj)
+        return data
+
+    def dump_many(self, objs: Iterable[Any]) -> List[Dict[str, Any]]:
+        if self._computed:
+            return [self.dump(obj) for obj in objs]
+        fields, get = self.fields, self._get
+        return [dict(zip(fields, get(obj))) for obj in objs]
+
+appointment_serializer = Serializer(
+    'id', 'mentor_id', 'student_id', 'project_group_id', 'series_id', 'title', 'description',
+    'start_time', 'end_time', 'status', 'points_required', 'points_used', 'meeting_url', 'notes',
+    'created_at', 'updated_at'
+)
+series_appointment_serializer = Serializer('id', 'start_time', 'end_time', 'status', 'points_used')
+mentor_serializer = Serializer(
+    'id', 'user_id', 'bio', 'expertise_areas', 'hourly_rate', 'max_sessions_per_day', 'rating',
+    'total_sessions', 'status', 'created_at', 'updated_at'
+)
+wallet_serializer = Serializer('id', 'user_id', 'balance', 'total_spent', 'total_earned', 'created_at', 'updated_at')
+transaction_serializer = Serializer(
+    'id', 'wallet_id', 'amount', 'description', 'appointment_id', 'created_at', type='transaction_type'
+)
+feedback_serializer = Serializer(
+    'id', 'appointment_id', 'reviewer_id', 'reviewed_id', 'rating', 'comment', 'feedback_type', 'created_at'
+)
+
+def _role(user) -> UserRole:
+    return user.role or UserRole.STUDENT
+
+user_serializer = Serializer(
+    'id', 'username', 'email', 'full_name', 'phone', 'avatar_url', 'is_active', 'created_at', 'updated_at',
+    role=_role
+)
+# What anyone may see of another user
+public_user_serializer = Serializer('id', 'username', 'full_name', 'avatar_url', 'created_at', role=_role)
@@ -7,7 +7,14 @@ from api.controllers.appointment_controller import bp as appointment_bp
 from api.controllers.course_controller import bp as course_bp
 from api.controllers.auth_controller import auth_bp
 from api.controllers.user_controller import user_bp
+from api.controllers.wallet_controller import bp as wallet_bp
+from api.controllers.metrics_controller import bp as metrics_bp
+from api.controllers.feedback_controller import bp as feedback_bp
+from api.controllers.schedule_controller import bp as schedule_bp, schedule_service
+from api.controllers.notification_controller import bp as notification_bp, notification_dispatcher
+from api.controllers.event_controller import bp as events_bp
 from api.middleware import middleware
+from api.json_provider import FastJSONProvider
 from api.responses import success_response
 from infrastructure.databases import init_db
 from config import Config
@@ -16,9 +23,10 @@ from cors import init_cors
 from flask_swagger_ui import get_swaggerui_blueprint
 
 
-def create_app():
+def create_app(start_background_workers: bool = True):
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.json = FastJSONProvider(app)
     
     # Register blueprints
     app.register_blueprint(todo_bp)
@@ -27,6 +35,12 @@ def create_app():
     app.register_blueprint(course_bp)
     app.register_blueprint(auth_bp)
     app.register_blueprint(user_bp)
+    app.register_blueprint(wallet_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(feedback_bp)
+    app.register_blueprint(schedule_bp)
+    app.register_blueprint(notification_bp)
+    app.register_blueprint(events_bp)
 
     # flasgger already serves Swagger UI at /docs via Swagger(app)
 
@@ -35,6 +49,11 @@ def create_app():
     except Exception as e:
         print(f"Error initializing database: {e}")
 
+    if start_background_workers and app.config['SCHEDULER_ENABLED']:
+        schedule_service.start()
+    if start_background_workers and app.config['NOTIFICATION_DISPATCHER_ENABLED']:
+        notification_dispatcher.start()
+
     # Register middleware
     middleware(app)
     init_cors(app)
@@ -43,7 +62,7 @@ def create_app():
     with app.test_request_context():
         for rule in app.url_map.iter_rules():
             # Add endpoints for swagger documentation
-            if rule.endpoint.startswith(('todo.', 'mentor.', 'appointment.', 'course.', 'user.', 'auth.')):
+            if rule.endpoint.startswith(('todo.', 'mentor.', 'appointment.', 'course.', 'user.', 'auth.', 'wallet.', 'metrics.', 'feedback.', 'schedule.', 'notification.', 'events.')):
                 view_func = app.view_functions[rule.endpoint]
                 print(f"Adding path: {rule.rule} -> {view_func}")
                 spec.path(view=view_func)
@@ -73,6 +92,9 @@ def create_app():
     return app
 
 if __name__ == '__main__':
-    app = create_app()
+    # With debug=True the reloader runs this module twice: in a watcher process and in
+    # the child that serves requests (WERKZEUG_RUN_MAIN=true). Only the child may run
+    # the scheduler and the dispatcher, or every job and notification runs twice
+    app = create_app(start_background_workers=os.environ.get('WERKZEUG_RUN_MAIN') == 'true')
     port = int(os.environ.get('PORT', '6868'))
     app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
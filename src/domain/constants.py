@@ -7,4 +7,51 @@ API_VERSION = "v1"
 DEFAULT_PAGE_SIZE = 20
 MAX_PAGE_SIZE = 100
 
+# Mentor working hours (UTC) and default step between bookable slot starts
+WORKING_HOURS_START = 9
+WORKING_HOURS_END = 18
+DEFAULT_SLOT_STEP_MINUTES = 60
+# Longest window accepted by the multi-mentor availability search
+MAX_AVAILABILITY_SEARCH_DAYS = 7
+# Rebuild the in-process mentor search index at least this often, to pick up
+# writes made by other workers
+MENTOR_SEARCH_INDEX_MAX_AGE_SECONDS = 300
+# Feedback ratings are whole stars in this range
+MIN_RATING = 1
+MAX_RATING = 5
+# Weights of the mentor matchmaking score components, each scaled to 0..1
+MATCH_WEIGHT_EXPERTISE = 0.4
+MATCH_WEIGHT_RATING = 0.25
+MATCH_WEIGHT_PRICE = 0.2
+MATCH_WEIGHT_CAPACITY = 0.15
+MAX_MATCH_RESULTS = 50
+# Longest recurring appointment series (a year of weekly sessions)
+MAX_SERIES_OCCURRENCES = 52
+# Most appointments one batch status change may name
+MAX_BATCH_TRANSITION_SIZE = 5000
+# Reminder scheduler: how far ahead appointments are held in memory, how long
+# before the start a reminder goes out, and how long after the end an
+# appointment still open is closed automatically
+SCHEDULER_WINDOW_HOURS = 6
+REMINDER_LEAD_MINUTES = 30
+AUTO_CLOSE_GRACE_MINUTES = 30
+# How often the scheduler re-reads appointments other processes changed in its
+# window, and how far each re-read reaches back past the last one to catch
+# transactions that committed late
+SCHEDULER_SYNC_SECONDS = 30
+SCHEDULER_SYNC_OVERLAP_SECONDS = 60
+# Notification dispatcher: outbox rows claimed per batch, delivery attempts
+# before giving up, exponential retry backoff bounds, how long a claimed row
+# stays reserved for its worker, and how often idle workers poll
+NOTIFICATION_BATCH_SIZE = 100
+NOTIFICATION_MAX_ATTEMPTS = 8
+NOTIFICATION_RETRY_BASE_SECONDS = 5
+NOTIFICATION_RETRY_MAX_SECONDS = 3600
+NOTIFICATION_LEASE_SECONDS = 60
+NOTIFICATION_POLL_SECONDS = 5
+# Server-sent events: seconds between heartbeats on an idle stream, and frames
+# buffered per slow subscriber before it is told to resync
+SSE_HEARTBEAT_SECONDS = 15
+SSE_QUEUE_SIZE = 100
+
 # Add more constants as needed for your application.
\ No newline at end of file
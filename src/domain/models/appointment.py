@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from enum import Enum
 
 class AppointmentStatus(Enum):
@@ -9,7 +9,34 @@ class AppointmentStatus(Enum):
     COMPLETED = "completed"
     NO_SHOW = "no_show"
 
+# Statuses that no longer hold the mentor's time or a slot of the day's quota
+INACTIVE_STATUSES = (AppointmentStatus.CANCELLED, AppointmentStatus.NO_SHOW)
+# Statuses a booking can still be cancelled (and refunded) from
+CANCELLABLE_STATUSES = (AppointmentStatus.PENDING, AppointmentStatus.CONFIRMED)
+
+# The appointment state machine: the statuses each status may move to.
+# Cancelled, completed and no-show are final.
+ALLOWED_TRANSITIONS: Dict[AppointmentStatus, Tuple[AppointmentStatus, ...]] = {
+    AppointmentStatus.PENDING: (AppointmentStatus.CONFIRMED, AppointmentStatus.CANCELLED,
+                                AppointmentStatus.COMPLETED, AppointmentStatus.NO_SHOW),
+    AppointmentStatus.CONFIRMED: (AppointmentStatus.CANCELLED, AppointmentStatus.COMPLETED,
+                                  AppointmentStatus.NO_SHOW),
+    AppointmentStatus.CANCELLED: (),
+    AppointmentStatus.COMPLETED: (),
+    AppointmentStatus.NO_SHOW: (),
+}
+
+def transition_sources(status: AppointmentStatus) -> Tuple[AppointmentStatus, ...]:
+    """Statuses an appointment may move to status from"""
+    return tuple(source for source, targets in ALLOWED_TRANSITIONS.items() if status in targets)
+
 class Appointment:
+    __slots__ = (
+        'id', 'mentor_id', 'student_id', 'project_group_id', 'title', 'description',
+        'start_time', 'end_time', 'status', 'points_required', 'points_used', 'meeting_url',
+        'notes', 'created_at', 'updated_at', 'series_id'
+    )
+
     def __init__(self,
                  id: Optional[int] = None,
                  mentor_id: int = 0,
@@ -25,7 +52,8 @@ class Appointment:
                  meeting_url: Optional[str] = None,
                  notes: Optional[str] = None,
                  created_at: Optional[datetime] = None,
-                 updated_at: Optional[datetime] = None):
+                 updated_at: Optional[datetime] = None,
+                 series_id: Optional[int] = None):
         self.id = id
         self.mentor_id = mentor_id
         self.student_id = student_id
@@ -39,5 +67,12 @@ class Appointment:
         self.points_used = points_used
         self.meeting_url = meeting_url
         self.notes = notes
-        self.created_at = created_at or datetime.now(timezone.utc)
-        self.updated_at = updated_at or datetime.now(timezone.utc)
+        if created_at is None or updated_at is None:
+            # Only new objects need a timestamp; rows loaded from the database carry theirs
+            now = datetime.now(timezone.utc)
+            created_at = created_at or now
+            updated_at = updated_at or now
+        self.created_at = created_at
+        self.updated_at = updated_at
+        # The recurring series this appointment was booked as part of, if any
+        self.series_id = series_id
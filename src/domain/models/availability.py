@@ -0,0 +1,66 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Tuple
+
+Interval = Tuple[datetime, datetime]
+
+def as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes (as stored in the database) as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def to_naive_utc(value: datetime) -> datetime:
+    """The naive UTC form the database stores, converting aware values from their offset."""
+    return as_utc(value).replace(tzinfo=None)
+
+class AvailabilityIndex:
+    """Sorted, non-overlapping busy intervals of one mentor"""
+    def __init__(self, busy: Iterable[Interval] = ()):
+        self.starts: List[datetime] = []
+        self.ends: List[datetime] = []
+        for start, end in sorted((as_utc(s), as_utc(e)) for s, e in busy):
+            if self.ends and start <= self.ends[-1]:
+                # Overlapping or touching: extend the previous interval
+                if end > self.ends[-1]:
+                    self.ends[-1] = end
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def is_free(self, start: datetime, end: datetime) -> bool:
+        """Check whether [start, end) overlaps no busy interval"""
+        start, end = as_utc(start), as_utc(end)
+        # Only the last interval starting before `end` can overlap
+        i = bisect_left(self.starts, end) - 1
+        return i < 0 or self.ends[i] <= start
+
+    def free_gaps(self, window_start: datetime, window_end: datetime) -> List[Interval]:
+        """Free gaps inside the window, found in one sweep over the busy intervals"""
+        window_start, window_end = as_utc(window_start), as_utc(window_end)
+        gaps = []
+        cursor = window_start
+        i = max(0, bisect_right(self.starts, window_start) - 1)
+        while i < len(self.starts) and self.starts[i] < window_end:
+            if self.starts[i] > cursor:
+                gaps.append((cursor, self.starts[i]))
+            if self.ends[i] > cursor:
+                cursor = self.ends[i]
+            i += 1
+        if cursor < window_end:
+            gaps.append((cursor, window_end))
+        return gaps
+
+    def slots(self, window_start: datetime, window_end: datetime,
+              duration: timedelta, step: timedelta) -> List[Interval]:
+        """Slots of `duration` starting every `step` from window_start that fit in a free gap"""
+        window_start = as_utc(window_start)
+        result = []
+        for gap_start, gap_end in self.free_gaps(window_start, window_end):
+            # First step-aligned start inside the gap
+            steps = -((window_start - gap_start) // step)
+            current = window_start + steps * step
+            while current + duration <= gap_end:
+                result.append((current, current + duration))
+                current += step
+        return result
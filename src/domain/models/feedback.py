@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from typing import Optional
+from typing import List, Optional
 from enum import Enum
 
 class FeedbackType(Enum):
@@ -7,6 +7,11 @@ class FeedbackType(Enum):
     MENTOR_TO_STUDENT = "mentor_to_student"
 
 class Feedback:
+    __slots__ = (
+        'id', 'appointment_id', 'reviewer_id', 'reviewed_id', 'rating', 'comment',
+        'feedback_type', 'created_at'
+    )
+
     def __init__(self,
                  id: Optional[int] = None,
                  appointment_id: int = 0,
@@ -23,4 +28,25 @@ class Feedback:
         self.rating = rating
         self.comment = comment
         self.feedback_type = feedback_type
-        self.created_at = created_at or datetime.now(timezone.utc)
+        self.created_at = created_at if created_at is not None else datetime.now(timezone.utc)
+
+class RatingSummary:
+    """Running rating totals of one reviewed user for one feedback type"""
+    __slots__ = ('reviewed_id', 'feedback_type', 'count', 'total', 'histogram')
+
+    def __init__(self,
+                 reviewed_id: int = 0,
+                 feedback_type: FeedbackType = FeedbackType.STUDENT_TO_MENTOR,
+                 count: int = 0,
+                 total: int = 0,
+                 histogram: Optional[List[int]] = None):
+        self.reviewed_id = reviewed_id
+        self.feedback_type = feedback_type
+        self.count = count
+        self.total = total
+        # histogram[i] is the number of (i + 1)-star ratings
+        self.histogram = histogram if histogram is not None else [0] * 5
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
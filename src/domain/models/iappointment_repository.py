@@ -1,17 +1,35 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from domain.models.appointment import Appointment, AppointmentStatus
+from domain.models.recurrence import AppointmentSeries
 
 class IAppointmentRepository(ABC):
     @abstractmethod
     def create(self, appointment: Appointment) -> Appointment:
         pass
     
+    @abstractmethod
+    def create_many(self, appointments: List[Appointment]) -> List[Appointment]:
+        """Insert many appointments in one batch, returned in start order"""
+        pass
+    
+    @abstractmethod
+    def create_series(self, series: AppointmentSeries) -> AppointmentSeries:
+        pass
+    
+    @abstractmethod
+    def get_series_by_id(self, series_id: int) -> Optional[AppointmentSeries]:
+        pass
+    
     @abstractmethod
     def get_by_id(self, appointment_id: int) -> Optional[Appointment]:
         pass
     
+    @abstractmethod
+    def get_by_series_id(self, series_id: int) -> List[Appointment]:
+        pass
+    
     @abstractmethod
     def get_by_mentor_id(self, mentor_id: int) -> List[Appointment]:
         pass
@@ -20,6 +38,26 @@ class IAppointmentRepository(ABC):
     def get_by_student_id(self, student_id: int) -> List[Appointment]:
         pass
     
+    @abstractmethod
+    def get_page_by_mentor_id(self, mentor_id: int, limit: int,
+                              cursor: Optional[Tuple[datetime, int]] = None,
+                              offset: int = 0) -> Tuple[List[Appointment], Optional[Tuple[datetime, int]]]:
+        pass
+    
+    @abstractmethod
+    def get_page_by_student_id(self, student_id: int, limit: int,
+                               cursor: Optional[Tuple[datetime, int]] = None,
+                               offset: int = 0) -> Tuple[List[Appointment], Optional[Tuple[datetime, int]]]:
+        pass
+    
+    @abstractmethod
+    def count_by_mentor_id(self, mentor_id: int) -> int:
+        pass
+    
+    @abstractmethod
+    def count_by_student_id(self, student_id: int) -> int:
+        pass
+    
     @abstractmethod
     def get_by_project_group_id(self, group_id: int) -> List[Appointment]:
         pass
@@ -36,6 +74,31 @@ class IAppointmentRepository(ABC):
     def get_conflicting_appointments(self, mentor_id: int, start_time: datetime, end_time: datetime) -> List[Appointment]:
         pass
     
+    @abstractmethod
+    def get_busy_intervals(self, mentor_id: int, range_start: datetime, range_end: datetime) -> List[Tuple[datetime, datetime]]:
+        pass
+    
+    @abstractmethod
+    def get_busy_intervals_by_mentor_ids(self, mentor_ids: List[int], range_start: datetime,
+                                         range_end: datetime) -> Dict[int, List[Tuple[datetime, datetime]]]:
+        pass
+    
+    @abstractmethod
+    def get_starting_between(self, statuses: Tuple[AppointmentStatus, ...], range_start: Optional[datetime],
+                             range_end: datetime) -> List[Appointment]:
+        """Appointments in one of statuses starting in [range_start, range_end), in start order;
+        no lower bound when range_start is None"""
+        pass
+    
+    @abstractmethod
+    def get_updated_since(self, updated_since: datetime, range_end: datetime) -> List[Appointment]:
+        """Appointments of any status starting before range_end whose updated_at is after updated_since"""
+        pass
+    
+    @abstractmethod
+    def get_by_ids(self, appointment_ids: List[int]) -> List[Appointment]:
+        pass
+    
     @abstractmethod
     def update(self, appointment: Appointment) -> Appointment:
         pass
@@ -47,3 +110,17 @@ class IAppointmentRepository(ABC):
     @abstractmethod
     def update_status(self, appointment_id: int, status: AppointmentStatus) -> bool:
         pass
+    
+    @abstractmethod
+    def update_status_many(self, appointment_ids: List[int], status: AppointmentStatus,
+                           from_statuses: Tuple[AppointmentStatus, ...]) -> List[Appointment]:
+        """Move every listed appointment currently in one of from_statuses to status
+        with one UPDATE; returns the appointments that moved, with their new status"""
+        pass
+    
+    @abstractmethod
+    def update_status_ended_before(self, ended_before: datetime, status: AppointmentStatus,
+                                   from_statuses: Tuple[AppointmentStatus, ...]) -> List[Appointment]:
+        """Move every appointment that ended by ended_before and is in one of from_statuses
+        to status with one UPDATE; returns the appointments that moved"""
+        pass
@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Dict, List, Tuple
+
+class IBookingCounter(ABC):
+    @abstractmethod
+    def try_reserve(self, mentor_id: int, day: date, limit: int) -> bool:
+        """Count one more session on the mentor's day unless that would exceed limit.
+
+        Must run in the same transaction as the appointment write it accounts for.
+        """
+        pass
+    
+    @abstractmethod
+    def try_reserve_days(self, mentor_id: int, days: List[date], limit: int) -> List[date]:
+        """Count one more session on each of the mentor's days, all or none.
+
+        Returns the days that are already full; nothing is reserved unless it is empty
+        (the caller rolls the transaction back otherwise).
+        """
+        pass
+    
+    @abstractmethod
+    def release(self, mentor_id: int, day: date) -> None:
+        """Give back a session whose appointment was cancelled or missed"""
+        pass
+    
+    @abstractmethod
+    def release_days(self, mentor_id: int, days: List[date]) -> None:
+        """Give back one session per entry in days; a day listed twice gives back two"""
+        pass
+    
+    @abstractmethod
+    def get_count(self, mentor_id: int, day: date) -> int:
+        pass
+    
+    @abstractmethod
+    def get_counts(self, mentor_ids: List[int], first_day: date, last_day: date) -> Dict[Tuple[int, date], int]:
+        """Non-zero counts of many mentors over a range of days, keyed by (mentor_id, day)"""
+        pass
+    
+    @abstractmethod
+    def recompute_all(self) -> int:
+        """Rebuild every counter from the appointments table; returns the number of counters"""
+        pass
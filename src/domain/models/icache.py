@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar('T')
+
+class ICache(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value, or None on a miss or after expiry"""
+        pass
+    
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        pass
+    
+    @abstractmethod
+    def get_or_set(self, key: str, loader: Callable[[], T], ttl: Optional[float] = None) -> T:
+        """Cached value, or loader()'s result, which is stored unless the cache was cleared meanwhile"""
+        pass
+    
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+    
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every entry of this cache"""
+        pass
+    
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and size"""
+        pass
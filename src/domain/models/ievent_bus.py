@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List
+
+def user_topic(user_id: int) -> str:
+    return f"user:{user_id}"
+
+def mentor_topic(mentor_id: int) -> str:
+    return f"mentor:{mentor_id}"
+
+class ISubscription(ABC):
+    @abstractmethod
+    def wait(self, timeout: float) -> List[str]:
+        """Block until events arrive or timeout passes; returns the SSE frames received (maybe none)"""
+        pass
+
+class IEventBus(ABC):
+    @abstractmethod
+    def publish(self, topics: Iterable[str], event_type: str, data: Dict[str, Any]) -> None:
+        """Deliver an event to every current subscriber of any of the topics; never blocks on them"""
+        pass
+    
+    @abstractmethod
+    def has_subscribers(self, topic: str) -> bool:
+        """Whether publishing to topic would reach anyone, so publishers can skip building the event"""
+        pass
+    
+    @abstractmethod
+    def subscribe(self, topics: Iterable[str]) -> ISubscription:
+        pass
+    
+    @abstractmethod
+    def unsubscribe(self, subscription: ISubscription) -> None:
+        pass
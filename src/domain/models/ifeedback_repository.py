@@ -4,7 +4,8 @@ from domain.models.feedback import Feedback, FeedbackType
 
 class IFeedbackRepository(ABC):
     @abstractmethod
-    def create(self, feedback: Feedback) -> Feedback:
+    def create(self, feedback: Feedback) -> Optional[Feedback]:
+        """None when the reviewer already left feedback on this appointment"""
         pass
     
     @abstractmethod
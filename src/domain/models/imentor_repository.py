@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import List, Optional
 from domain.models.mentor import Mentor, MentorStatus
+from domain.models.mentor_match import MentorMatch
 
 class IMentorRepository(ABC):
     @abstractmethod
@@ -11,6 +13,10 @@ class IMentorRepository(ABC):
     def get_by_id(self, mentor_id: int) -> Optional[Mentor]:
         pass
     
+    @abstractmethod
+    def get_for_update(self, mentor_id: int) -> Optional[Mentor]:
+        pass
+    
     @abstractmethod
     def get_by_user_id(self, user_id: int) -> Optional[Mentor]:
         pass
@@ -27,6 +33,11 @@ class IMentorRepository(ABC):
     def get_available_mentors(self) -> List[Mentor]:
         pass
     
+    @abstractmethod
+    def find_matches(self, expertise: List[str], start_time: datetime, end_time: datetime,
+                     max_rate: Optional[int], limit: int) -> List[MentorMatch]:
+        pass
+    
     @abstractmethod
     def update(self, mentor: Mentor) -> Mentor:
         pass
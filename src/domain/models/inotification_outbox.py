@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional
+from domain.models.notification import Notification
+
+class INotificationOutbox(ABC):
+    @abstractmethod
+    def enqueue_many(self, notifications: List[Notification]) -> int:
+        """Write notification intents, skipping any whose dedupe_key is already in the outbox.
+
+        Must run in the transaction of the change being notified; returns how many were written.
+        """
+        pass
+    
+    @abstractmethod
+    def claim_batch(self, limit: int, now: datetime, lease_until: datetime) -> List[Notification]:
+        """Take up to limit pending notifications due by now, counting an attempt on each.
+
+        Claimed rows are not due again until lease_until, so a worker that dies
+        mid-delivery only delays them.
+        """
+        pass
+    
+    @abstractmethod
+    def mark_sent(self, notification_ids: List[int], sent_at: datetime) -> None:
+        pass
+    
+    @abstractmethod
+    def mark_failed(self, notification_id: int, error: str, retry_at: Optional[datetime]) -> None:
+        """Record a failed attempt: retry at retry_at, or give up when it is None"""
+        pass
+    
+    @abstractmethod
+    def count_by_status(self) -> Dict[str, int]:
+        pass
@@ -0,0 +1,9 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List
+from domain.models.notification import Notification
+
+class INotificationTransport(ABC):
+    @abstractmethod
+    def send_batch(self, notifications: List[Notification]) -> Dict[int, str]:
+        """Deliver notifications; returns {notification_id: error} for those that failed"""
+        pass
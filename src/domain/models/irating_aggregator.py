@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from typing import List
+from domain.models.feedback import FeedbackType, RatingSummary
+
+class IRatingAggregator(ABC):
+    @abstractmethod
+    def add_rating(self, reviewed_id: int, feedback_type: FeedbackType, rating: int) -> None:
+        """Count one new rating; must run in the same transaction as the feedback insert"""
+        pass
+    
+    @abstractmethod
+    def remove_rating(self, reviewed_id: int, feedback_type: FeedbackType, rating: int) -> None:
+        """Un-count a rating whose feedback was deleted or changed"""
+        pass
+    
+    @abstractmethod
+    def get_summary(self, reviewed_id: int, feedback_type: FeedbackType) -> RatingSummary:
+        pass
+    
+    @abstractmethod
+    def get_summaries(self, reviewed_id: int) -> List[RatingSummary]:
+        """Summaries of every feedback type the user has received"""
+        pass
+    
+    @abstractmethod
+    def recompute_all(self) -> int:
+        """Rebuild every summary and mentor rating from the feedback table; returns the number of summaries"""
+        pass
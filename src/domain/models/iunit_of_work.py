@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+from typing import Callable, TypeVar
+
+T = TypeVar('T')
+
+class IUnitOfWork(ABC):
+    @abstractmethod
+    def run(self, operation: Callable[[], T]) -> T:
+        """Run operation in one transaction, committing once and retrying on serialization conflicts"""
+        pass
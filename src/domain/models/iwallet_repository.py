@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
+from datetime import datetime
 from domain.models.wallet import Wallet, WalletTransaction, TransactionType
 
 class IWalletRepository(ABC):
@@ -15,6 +16,16 @@ class IWalletRepository(ABC):
     def update_wallet_balance(self, wallet_id: int, new_balance: int) -> bool:
         pass
     
+    @abstractmethod
+    def apply_delta(self, user_id: int, amount: int, transaction_type: TransactionType,
+                    appointment_id: Optional[int] = None, description: str = "") -> bool:
+        pass
+    
+    @abstractmethod
+    def credit_many(self, credits: List[Tuple[int, int, Optional[int], str]],
+                    transaction_type: TransactionType) -> int:
+        pass
+    
     @abstractmethod
     def create_transaction(self, transaction: WalletTransaction) -> WalletTransaction:
         pass
@@ -30,3 +41,18 @@ class IWalletRepository(ABC):
     @abstractmethod
     def get_transactions_by_type(self, wallet_id: int, transaction_type: TransactionType) -> List[WalletTransaction]:
         pass
+    
+    @abstractmethod
+    def get_transactions_page(self, user_id: int, limit: int,
+                              cursor: Optional[Tuple[datetime, int]] = None,
+                              transaction_type: Optional[TransactionType] = None,
+                              date_from: Optional[datetime] = None,
+                              date_to: Optional[datetime] = None) -> Tuple[List[WalletTransaction], Optional[Tuple[datetime, int]]]:
+        pass
+    
+    @abstractmethod
+    def iter_transactions(self, user_id: int,
+                          transaction_type: Optional[TransactionType] = None,
+                          date_from: Optional[datetime] = None,
+                          date_to: Optional[datetime] = None) -> Iterator[WalletTransaction]:
+        pass
@@ -0,0 +1,60 @@
+import heapq
+import itertools
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+class JobHeap:
+    """Min-heap of jobs ordered by due time, keyed so that a job can be replaced or cancelled.
+
+    Replacing or cancelling only marks the old heap entry dead; dead entries are
+    skipped when they reach the top and the heap is compacted once they outnumber
+    the live ones, so every operation stays O(log n).
+    """
+    def __init__(self):
+        self._heap: List[list] = []
+        self._entries: Dict[Hashable, list] = {}
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def push(self, key: Hashable, due_at: datetime, payload: Any = None) -> None:
+        """Schedule the job called key, replacing any job already scheduled under it"""
+        self.remove(key)
+        entry = [due_at, next(self._sequence), key, payload, True]
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+
+    def remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry[-1] = False
+            if len(self._heap) > 2 * len(self._entries) + 64:
+                self._heap = [entry for entry in self._heap if entry[-1]]
+                heapq.heapify(self._heap)
+
+    def next_due(self) -> Optional[datetime]:
+        self._drop_dead()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> List[Tuple[Hashable, Any]]:
+        """Remove and return (key, payload) of every job due by now, earliest first"""
+        due = []
+        self._drop_dead()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, key, payload, _ = heapq.heappop(self._heap)
+            del self._entries[key]
+            due.append((key, payload))
+            self._drop_dead()
+        return due
+
+    def peek(self, limit: int) -> List[Tuple[datetime, Hashable]]:
+        """(due_at, key) of the next limit jobs, without removing them"""
+        return [(entry[0], entry[2]) for entry in heapq.nsmallest(limit, self._entries.values())]
+
+    def _drop_dead(self) -> None:
+        while self._heap and not self._heap[0][-1]:
+            heapq.heappop(self._heap)
@@ -8,6 +8,11 @@ class MentorStatus(Enum):
     BUSY = "busy"
 
 class Mentor:
+    __slots__ = (
+        'id', 'user_id', 'bio', 'expertise_areas', 'hourly_rate', 'max_sessions_per_day',
+        'status', 'rating', 'total_sessions', 'created_at', 'updated_at'
+    )
+
     def __init__(self,
                  id: Optional[int] = None,
                  user_id: int = 0,
@@ -29,5 +34,9 @@ class Mentor:
         self.status = status
         self.rating = rating
         self.total_sessions = total_sessions
-        self.created_at = created_at or datetime.now(timezone.utc)
-        self.updated_at = updated_at or datetime.now(timezone.utc)
+        if created_at is None or updated_at is None:
+            now = datetime.now(timezone.utc)
+            created_at = created_at or now
+            updated_at = updated_at or now
+        self.created_at = created_at
+        self.updated_at = updated_at
@@ -0,0 +1,13 @@
+from domain.models.mentor import Mentor
+
+class MentorMatch:
+    """A mentor recommended for a request, with its score and why"""
+    __slots__ = ('mentor', 'score', 'matched_expertise', 'remaining_sessions')
+
+    def __init__(self, mentor: Mentor, score: float, matched_expertise: int = 0, remaining_sessions: int = 0):
+        self.mentor = mentor
+        self.score = score
+        # Number of requested expertise tags the mentor has
+        self.matched_expertise = matched_expertise
+        # Sessions the mentor can still take on the requested day
+        self.remaining_sessions = remaining_sessions
@@ -0,0 +1,202 @@
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from domain.models.mentor import Mentor, MentorStatus
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# How much a match in each field counts
+EXPERTISE_WEIGHT = 3.0
+BIO_WEIGHT = 1.0
+# How much each kind of term match counts relative to an exact token
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.7
+FUZZY_MATCH = 0.5
+MIN_PREFIX_LENGTH = 2
+
+SORT_ORDERS = ('relevance', 'rating', 'price')
+
+def normalize(text: str) -> str:
+    """Lowercase and strip accents so that unaccented queries match Vietnamese text"""
+    decomposed = unicodedata.normalize('NFKD', text.lower().replace('đ', 'd'))
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN_PATTERN.findall(normalize(text)) if text else []
+
+def max_edits(term: str) -> int:
+    """Typos tolerated for a query term of this length"""
+    if len(term) >= 8:
+        return 2
+    if len(term) >= 4:
+        return 1
+    return 0
+
+def within_edits(a: str, b: str, limit: int) -> bool:
+    """Edit distance between a and b, with adjacent swaps as one edit, is at most limit"""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    before_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before_previous[j - 2] + 1)
+        if min(current) > limit:
+            return False
+        before_previous, previous = previous, current
+    return previous[-1] <= limit
+
+class MentorSearchResult:
+    __slots__ = ('mentor', 'score')
+
+    def __init__(self, mentor: Mentor, score: float):
+        self.mentor = mentor
+        self.score = score
+
+class MentorSearchIndex:
+    """Inverted index over mentor bios and expertise areas.
+
+    Postings map each token to {mentor_id: weighted term frequency}; the sorted
+    vocabulary serves prefix lookups with bisect. Every query term must match
+    (exactly, as a prefix, or within a few typos) for a mentor to be returned.
+    """
+    def __init__(self, mentors: Iterable[Mentor] = ()):
+        self._lock = threading.RLock()
+        self._mentors: Dict[int, Mentor] = {}
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._tokens_by_mentor: Dict[int, Set[str]] = {}
+        self._vocabulary: List[str] = []
+        for mentor in mentors:
+            self._add(mentor)
+        self._vocabulary = sorted(self._postings)
+
+    def __len__(self) -> int:
+        return len(self._mentors)
+
+    def upsert(self, mentor: Mentor) -> None:
+        with self._lock:
+            self._remove(mentor.id)
+            self._add(mentor)
+            self._vocabulary = sorted(self._postings)
+
+    def remove(self, mentor_id: int) -> None:
+        with self._lock:
+            self._remove(mentor_id)
+            self._vocabulary = sorted(self._postings)
+
+    def _add(self, mentor: Mentor) -> None:
+        weights: Counter = Counter()
+        for token in tokenize(mentor.bio):
+            weights[token] += BIO_WEIGHT
+        for area in mentor.expertise_areas or []:
+            for token in tokenize(area):
+                weights[token] += EXPERTISE_WEIGHT
+        for token, weight in weights.items():
+            self._postings[token][mentor.id] = weight
+        self._tokens_by_mentor[mentor.id] = set(weights)
+        self._mentors[mentor.id] = mentor
+
+    def _remove(self, mentor_id: int) -> None:
+        for token in self._tokens_by_mentor.pop(mentor_id, ()):
+            postings = self._postings[token]
+            postings.pop(mentor_id, None)
+            if not postings:
+                del self._postings[token]
+        self._mentors.pop(mentor_id, None)
+
+    def _expand(self, term: str) -> Dict[str, float]:
+        """Vocabulary tokens matching a query term, with the strength of each match"""
+        matches: Dict[str, float] = {}
+        if term in self._postings:
+            matches[term] = EXACT_MATCH
+        if len(term) >= MIN_PREFIX_LENGTH:
+            i = bisect_left(self._vocabulary, term)
+            while i < len(self._vocabulary) and self._vocabulary[i].startswith(term):
+                matches.setdefault(self._vocabulary[i], PREFIX_MATCH)
+                i += 1
+        limit = max_edits(term)
+        if limit:
+            for token in self._vocabulary:
+                if token not in matches and within_edits(term, token, limit):
+                    matches[token] = FUZZY_MATCH
+        return matches
+
+    def _score(self, terms: List[str]) -> Dict[int, float]:
+        """Relevance of every mentor that matches all terms"""
+        scores: Optional[Dict[int, float]] = None
+        total = len(self._mentors)
+        for term in terms:
+            term_scores: Dict[int, float] = {}
+            for token, strength in self._expand(term).items():
+                postings = self._postings[token]
+                idf = math.log(1 + total / len(postings))
+                for mentor_id, weight in postings.items():
+                    score = strength * weight * idf
+                    if score > term_scores.get(mentor_id, 0.0):
+                        term_scores[mentor_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {mentor_id: scores[mentor_id] + score
+                          for mentor_id, score in term_scores.items() if mentor_id in scores}
+            if not scores:
+                return {}
+        return scores or {}
+
+    def search(self, query: str = '', expertise: Optional[str] = None, available_only: bool = False,
+               min_rating: Optional[float] = None, max_rate: Optional[int] = None,
+               sort: str = 'relevance') -> Tuple[List[MentorSearchResult], Dict[str, int]]:
+        """Matching mentors in ranked order, plus expertise facet counts.
+
+        Facets count the matches before the expertise filter is applied, so the
+        client can show how many mentors each other expertise would give.
+        """
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"sort must be one of: {', '.join(SORT_ORDERS)}")
+        terms = tokenize(query)
+        with self._lock:
+            if terms:
+                scores = self._score(terms)
+            else:
+                scores = dict.fromkeys(self._mentors, 0.0)
+            candidates = []
+            for mentor_id, score in scores.items():
+                mentor = self._mentors[mentor_id]
+                if available_only and mentor.status != MentorStatus.ACTIVE:
+                    continue
+                if min_rating is not None and mentor.rating < min_rating:
+                    continue
+                if max_rate is not None and mentor.hourly_rate > max_rate:
+                    continue
+                candidates.append(MentorSearchResult(mentor, score))
+
+        facets: Counter = Counter()
+        labels: Dict[str, str] = {}
+        for result in candidates:
+            # Count each area once per mentor; "python" and "Python" are one facet
+            for area in result.mentor.expertise_areas or []:
+                labels.setdefault(normalize(area), area)
+            facets.update({normalize(area) for area in result.mentor.expertise_areas or []})
+        if expertise:
+            wanted = normalize(expertise)
+            candidates = [
+                result for result in candidates
+                if any(normalize(area) == wanted for area in result.mentor.expertise_areas or [])
+            ]
+
+        if sort == 'rating':
+            key = lambda r: (-r.mentor.rating, -r.score, r.mentor.hourly_rate, r.mentor.id)
+        elif sort == 'price':
+            key = lambda r: (r.mentor.hourly_rate, -r.score, -r.mentor.rating, r.mentor.id)
+        else:
+            key = lambda r: (-round(r.score, 6), -r.mentor.rating, r.mentor.hourly_rate, r.mentor.id)
+        candidates.sort(key=key)
+        return candidates, {labels[area]: count for area, count in facets.most_common()}
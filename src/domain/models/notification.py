@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from enum import Enum
+
+class NotificationStatus(Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+class Notification:
+    """A notification intent in the outbox, delivered after the transaction that wrote it commits"""
+    __slots__ = (
+        'id', 'dedupe_key', 'event_type', 'payload', 'status', 'attempts', 'next_attempt_at',
+        'last_error', 'created_at', 'sent_at'
+    )
+
+    def __init__(self,
+                 id: Optional[int] = None,
+                 dedupe_key: str = "",
+                 event_type: str = "",
+                 payload: Optional[Dict[str, Any]] = None,
+                 status: NotificationStatus = NotificationStatus.PENDING,
+                 attempts: int = 0,
+                 next_attempt_at: Optional[datetime] = None,
+                 last_error: Optional[str] = None,
+                 created_at: Optional[datetime] = None,
+                 sent_at: Optional[datetime] = None):
+        self.id = id
+        # Intents with the same key are written and delivered once
+        self.dedupe_key = dedupe_key
+        self.event_type = event_type
+        self.payload = payload if payload is not None else {}
+        self.status = status
+        self.attempts = attempts
+        if created_at is None or next_attempt_at is None:
+            now = datetime.now(timezone.utc)
+            created_at = created_at or now
+            next_attempt_at = next_attempt_at or now
+        self.next_attempt_at = next_attempt_at
+        self.last_error = last_error
+        self.created_at = created_at
+        self.sent_at = sent_at
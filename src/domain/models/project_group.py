@@ -9,6 +9,11 @@ class ProjectStatus(Enum):
     ON_HOLD = "on_hold"
 
 class ProjectGroup:
+    __slots__ = (
+        'id', 'name', 'description', 'topic', 'status', 'leader_id', 'member_ids',
+        'max_members', 'created_at', 'updated_at'
+    )
+
     def __init__(self,
                  id: Optional[int] = None,
                  name: str = "",
@@ -28,5 +33,9 @@ class ProjectGroup:
         self.leader_id = leader_id
         self.member_ids = member_ids or []
         self.max_members = max_members
-        self.created_at = created_at or datetime.now(timezone.utc)
-        self.updated_at = updated_at or datetime.now(timezone.utc)
+        if created_at is None or updated_at is None:
+            now = datetime.now(timezone.utc)
+            created_at = created_at or now
+            updated_at = updated_at or now
+        self.created_at = created_at
+        self.updated_at = updated_at
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import List, Optional, Tuple
+from domain.constants import MAX_SERIES_OCCURRENCES
+from domain.models.availability import as_utc, to_naive_utc
+
+class RecurrenceFrequency(Enum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    BIWEEKLY = "biweekly"
+
+# Days between occurrences at INTERVAL=1
+FREQUENCY_DAYS = {
+    RecurrenceFrequency.DAILY: 1,
+    RecurrenceFrequency.WEEKLY: 7,
+    RecurrenceFrequency.BIWEEKLY: 14,
+}
+
+class RecurrenceRule:
+    """An RRULE-like repetition: every `interval` days/weeks, `count` times or until a date"""
+    __slots__ = ('frequency', 'interval', 'count', 'until')
+
+    def __init__(self,
+                 frequency: RecurrenceFrequency = RecurrenceFrequency.WEEKLY,
+                 interval: int = 1,
+                 count: Optional[int] = None,
+                 until: Optional[datetime] = None):
+        if interval < 1:
+            raise ValueError("Recurrence interval must be at least 1")
+        if count is None and until is None:
+            raise ValueError("Recurrence needs a count or an until date")
+        if count is not None and not 1 <= count <= MAX_SERIES_OCCURRENCES:
+            raise ValueError(f"Recurrence count must be between 1 and {MAX_SERIES_OCCURRENCES}")
+        self.frequency = frequency
+        self.interval = interval
+        self.count = count
+        self.until = until
+
+    @property
+    def step(self) -> timedelta:
+        return timedelta(days=FREQUENCY_DAYS[self.frequency] * self.interval)
+
+    @classmethod
+    def parse(cls, rrule: str) -> 'RecurrenceRule':
+        """Parse the subset of RFC 5545 RRULE used here, e.g. FREQ=WEEKLY;INTERVAL=2;COUNT=8"""
+        parts = {}
+        for part in rrule.strip().removeprefix('RRULE:').split(';'):
+            if part:
+                key, _, value = part.partition('=')
+                parts[key.strip().upper()] = value.strip()
+        try:
+            frequency = RecurrenceFrequency(parts.get('FREQ', '').lower())
+            interval = int(parts.get('INTERVAL', 1))
+            count = int(parts['COUNT']) if 'COUNT' in parts else None
+            until = cls._parse_until(parts['UNTIL']) if 'UNTIL' in parts else None
+        except (KeyError, ValueError):
+            raise ValueError(f"Unsupported recurrence rule: {rrule}")
+        return cls(frequency, interval, count, until)
+
+    @staticmethod
+    def _parse_until(value: str) -> datetime:
+        # RRULE's compact form (20260601T000000Z) or plain ISO
+        for fmt in ('%Y%m%dT%H%M%SZ', '%Y%m%d'):
+            try:
+                return datetime.strptime(value, fmt).replace(tzinfo=timezone.utc)
+            except ValueError:
+                pass
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+    def to_rrule(self) -> str:
+        # BIWEEKLY is not an RRULE frequency; it is WEEKLY with a doubled interval
+        if self.frequency == RecurrenceFrequency.BIWEEKLY:
+            parts = ['FREQ=WEEKLY', f'INTERVAL={self.interval * 2}']
+        else:
+            parts = [f'FREQ={self.frequency.name}', f'INTERVAL={self.interval}']
+        if self.count is not None:
+            parts.append(f'COUNT={self.count}')
+        if self.until is not None:
+            parts.append(f"UNTIL={self.until.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}")
+        return ';'.join(parts)
+
+    def occurrences(self, start_time: datetime, end_time: datetime) -> List[Tuple[datetime, datetime]]:
+        """(start, end) of every occurrence of a session first held from start_time to end_time"""
+        step = self.step
+        if end_time - start_time > step:
+            raise ValueError("Sessions of a series cannot be longer than the time between them")
+        until = self.until
+        if until is not None and (until.tzinfo is None) != (start_time.tzinfo is None):
+            # Compare like with like; naive values are UTC throughout the app
+            until = to_naive_utc(until) if start_time.tzinfo is None else as_utc(until)
+        
+        result = []
+        current = start_time
+        while len(result) < (self.count or MAX_SERIES_OCCURRENCES) and (until is None or current <= until):
+            result.append((current, current + (end_time - start_time)))
+            current += step
+        if until is not None and self.count is None and current <= until:
+            raise ValueError(f"A series cannot have more than {MAX_SERIES_OCCURRENCES} occurrences")
+        if not result:
+            raise ValueError("The recurrence has no occurrences")
+        return result
+
+class AppointmentSeries:
+    __slots__ = ('id', 'mentor_id', 'student_id', 'rule', 'created_at')
+
+    def __init__(self,
+                 id: Optional[int] = None,
+                 mentor_id: int = 0,
+                 student_id: int = 0,
+                 rule: str = "",
+                 created_at: Optional[datetime] = None):
+        self.id = id
+        self.mentor_id = mentor_id
+        self.student_id = student_id
+        # The recurrence as an RRULE string
+        self.rule = rule
+        self.created_at = created_at if created_at is not None else datetime.now(timezone.utc)
@@ -8,6 +8,11 @@ class UserRole(Enum):
     MENTOR = "mentor"
 
 class User:
+    __slots__ = (
+        'id', 'username', 'email', 'password', 'full_name', 'role', 'phone', 'avatar_url',
+        'is_active', 'created_at', 'updated_at'
+    )
+
     def __init__(self, 
                  id: Optional[int] = None,
                  username: str = "",
@@ -29,5 +34,9 @@ class User:
         self.phone = phone
         self.avatar_url = avatar_url
         self.is_active = is_active
-        self.created_at = created_at or datetime.now(timezone.utc)
-        self.updated_at = updated_at or datetime.now(timezone.utc)
\ No newline at end of file
+        if created_at is None or updated_at is None:
+            now = datetime.now(timezone.utc)
+            created_at = created_at or now
+            updated_at = updated_at or now
+        self.created_at = created_at
+        self.updated_at = updated_at
\ No newline at end of file
@@ -9,19 +9,36 @@ class TransactionType(Enum):
     BONUS = "bonus"
 
 class Wallet:
+    __slots__ = (
+        'id', 'user_id', 'balance', 'total_spent', 'total_earned', 'created_at', 'updated_at'
+    )
+
     def __init__(self,
                  id: Optional[int] = None,
                  user_id: int = 0,
                  balance: int = 0,
+                 total_spent: int = 0,
+                 total_earned: int = 0,
                  created_at: Optional[datetime] = None,
                  updated_at: Optional[datetime] = None):
         self.id = id
         self.user_id = user_id
         self.balance = balance
-        self.created_at = created_at or datetime.now(timezone.utc)
-        self.updated_at = updated_at or datetime.now(timezone.utc)
+        self.total_spent = total_spent
+        self.total_earned = total_earned
+        if created_at is None or updated_at is None:
+            now = datetime.now(timezone.utc)
+            created_at = created_at or now
+            updated_at = updated_at or now
+        self.created_at = created_at
+        self.updated_at = updated_at
 
 class WalletTransaction:
+    __slots__ = (
+        'id', 'wallet_id', 'amount', 'transaction_type', 'description', 'appointment_id',
+        'created_at'
+    )
+
     def __init__(self,
                  id: Optional[int] = None,
                  wallet_id: int = 0,
@@ -36,4 +53,4 @@ class WalletTransaction:
         self.transaction_type = transaction_type
         self.description = description
         self.appointment_id = appointment_id
-        self.created_at = created_at or datetime.now(timezone.utc)
+        self.created_at = created_at if created_at is not None else datetime.now(timezone.utc)
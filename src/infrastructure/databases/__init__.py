@@ -3,6 +3,8 @@ from infrastructure.models import (
     course_register_model, todo_model, user_model, course_model, 
     consultant_model, appointment_model, program_model, feedback_model,
     mentor_model, project_group_model, wallet_model, rating_model,
+    rating_aggregate_model, mentor_daily_booking_model, appointment_series_model,
+    notification_outbox_model,
     MentorExpertiseModel
 )
 
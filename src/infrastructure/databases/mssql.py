@@ -1,12 +1,70 @@
-from sqlalchemy import create_engine
+from typing import Any, Dict
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, scoped_session
 from config import Config
 from infrastructure.databases.base import Base
+from infrastructure.databases.pool_metrics import InstrumentedQueuePool, instrument_engine, pool_status
+from infrastructure.databases.routing import ReadYourWritesTracker, RoutingSession
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+def engine_options(database_uri: str) -> Dict[str, Any]:
+    """create_engine keyword arguments for the configured pool and the URI's dialect"""
+    url = make_url(database_uri)
+    options: Dict[str, Any] = {'pool_pre_ping': Config.DB_POOL_PRE_PING}
+    if _is_memory_sqlite(url):
+        # One shared connection per thread; a QueuePool would give each checkout an empty database
+        options['connect_args'] = {'check_same_thread': False}
+        return options
+    
+    options.update({
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': Config.DB_POOL_SIZE,
+        'max_overflow': Config.DB_MAX_OVERFLOW,
+        'pool_timeout': Config.DB_POOL_TIMEOUT,
+        'pool_recycle': Config.DB_POOL_RECYCLE
+    })
+    backend = url.get_backend_name()
+    if backend == 'mssql':
+        if url.get_driver_name() == 'pyodbc':
+            # Send executemany() parameter sets in one round trip
+            options['fast_executemany'] = True
+        else:
+            # pymssql: fail fast instead of hanging on an unreachable server
+            options['connect_args'] = {'login_timeout': int(Config.DB_POOL_TIMEOUT)}
+    elif backend == 'sqlite':
+        options['connect_args'] = {'check_same_thread': False, 'timeout': Config.SQLITE_BUSY_TIMEOUT}
+    return options
+
+def _tune_sqlite(engine: Engine) -> None:
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # WAL lets readers proceed while one writer holds the lock
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.close()
+
+def create_db_engine(database_uri: str) -> Engine:
+    """Build a pooled, instrumented engine for the given URI"""
+    db_engine = create_engine(database_uri, **engine_options(database_uri))
+    url = make_url(database_uri)
+    if url.get_backend_name() == 'sqlite' and not _is_memory_sqlite(url):
+        _tune_sqlite(db_engine)
+    return db_engine
 
 # Database configuration
 DATABASE_URI = Config.DATABASE_URI
-engine = create_engine(DATABASE_URI)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_db_engine(DATABASE_URI)
+pool_metrics = instrument_engine(engine)
+REPLICA_URI = Config.DATABASE_REPLICA_URI
+replica_engine = create_db_engine(REPLICA_URI) if REPLICA_URI else None
+replica_pool_metrics = instrument_engine(replica_engine) if replica_engine is not None else None
+write_tracker = ReadYourWritesTracker(Config.READ_YOUR_WRITES_SECONDS)
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine,
+                            replica=replica_engine, tracker=write_tracker)
 # Use scoped_session to manage a thread-local session per request
 session = scoped_session(SessionLocal)
 def init_mssql(app):
@@ -14,4 +72,11 @@ def init_mssql(app):
 
 def remove_session():
     """Remove the current SQLAlchemy session (to be called after each request)."""
-    session.remove()
\ No newline at end of file
+    session.remove()
+
+def get_pool_status() -> Dict[str, object]:
+    """Live pool usage of the primary engine, and of the replica when one is configured"""
+    status = pool_status(engine, pool_metrics)
+    if replica_engine is not None:
+        status['replica'] = pool_status(replica_engine, replica_pool_metrics)
+    return status
@@ -0,0 +1,105 @@
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, Optional
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+# Session.info key set while a unit of work owns the transaction (see unit_of_work.py)
+UNIT_OF_WORK_KEY = 'unit_of_work'
+# Set while a @read_only repository method runs
+_read_only: ContextVar[bool] = ContextVar('read_only', default=False)
+# Who the current request acts for; their reads stay on the primary right after they write
+_consistency_key: ContextVar[Optional[str]] = ContextVar('consistency_key', default=None)
+
+# Forget keys whose window has expired once this many are tracked
+MAX_TRACKED_KEYS = 10000
+
+def read_only(method):
+    """Mark a repository method whose SELECTs may be served by the read replica"""
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        token = _read_only.set(True)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _read_only.reset(token)
+    return wrapper
+
+def set_consistency_key(key: Optional[str]):
+    return _consistency_key.set(key)
+
+def reset_consistency_key(token) -> None:
+    _consistency_key.reset(token)
+
+class ReadYourWritesTracker:
+    """Remembers when each key last committed a write, for `window` seconds"""
+    def __init__(self, window: float):
+        self.window = window
+        self._lock = threading.Lock()
+        self._last_write: Dict[str, float] = {}
+
+    def record(self, key: Optional[str]) -> None:
+        if key is None or self.window <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[key] = now
+            if len(self._last_write) > MAX_TRACKED_KEYS:
+                self._last_write = {
+                    k: written for k, written in self._last_write.items() if now - written < self.window
+                }
+
+    def recently_wrote(self, key: Optional[str]) -> bool:
+        if key is None:
+            return False
+        with self._lock:
+            written = self._last_write.get(key)
+        return written is not None and time.monotonic() - written < self.window
+
+class RoutingSession(Session):
+    """Session that sends read-only SELECTs to a replica and everything else to the primary.
+
+    A read goes to the replica only when it comes from a @read_only repository
+    method, no unit of work owns the transaction, this session has not written
+    yet, and the current request's key has not committed within the
+    read-your-writes window.
+    """
+    def __init__(self, replica: Optional[Engine] = None,
+                 tracker: Optional[ReadYourWritesTracker] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.replica = replica
+        self.tracker = tracker
+        self.has_written = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        is_select = clause is not None and getattr(clause, 'is_select', False)
+        if not is_select:
+            # Flushes and DML: the transaction now has to read its own writes
+            self.has_written = True
+        elif self._use_replica():
+            return self.replica
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+    def _use_replica(self) -> bool:
+        return (
+            self.replica is not None
+            and _read_only.get()
+            and not self.has_written
+            and not self.info.get(UNIT_OF_WORK_KEY)
+            and not (self.tracker is not None and self.tracker.recently_wrote(_consistency_key.get()))
+        )
+
+    def commit(self) -> None:
+        # Flush first so pending objects count as writes of this commit
+        self.flush()
+        has_written = self.has_written
+        super().commit()
+        self.has_written = False
+        if has_written and self.tracker is not None:
+            self.tracker.record(_consistency_key.get())
+
+    def rollback(self) -> None:
+        super().rollback()
+        self.has_written = False
@@ -0,0 +1,69 @@
+import random
+import time
+from typing import Callable, TypeVar
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from domain.models.iunit_of_work import IUnitOfWork
+from infrastructure.databases.mssql import session
+from infrastructure.databases.routing import UNIT_OF_WORK_KEY
+
+T = TypeVar('T')
+
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 0.05
+
+# Driver error codes of deadlock victims and serialization failures. Codes are
+# compared exactly: a bare digit match would also hit ids and values in the message
+RETRYABLE_ERROR_NUMBERS = {1205}                # SQL Server (pymssql): chosen as deadlock victim
+RETRYABLE_SQLSTATES = {'40001', '40P01'}        # serialization failure, deadlock detected
+# Fallback for drivers that expose no code: the server's own wording
+RETRYABLE_MESSAGES = (
+    'chosen as the deadlock victim',            # SQL Server
+    'deadlock detected',                        # PostgreSQL
+    'could not serialize access',               # PostgreSQL
+    'database is locked',                       # SQLite: busy timeout expired
+)
+
+def is_retryable(error: DBAPIError) -> bool:
+    """Check whether the database rejected the transaction only because of a concurrent one"""
+    orig = error.orig
+    if orig is not None:
+        if orig.args and orig.args[0] in RETRYABLE_ERROR_NUMBERS:
+            return True
+        # psycopg2 calls it pgcode, psycopg 3 sqlstate; pyodbc puts the SQLSTATE first in args
+        sqlstate = getattr(orig, 'pgcode', None) or getattr(orig, 'sqlstate', None) or (
+            orig.args[0] if orig.args and isinstance(orig.args[0], str) else None)
+        if sqlstate in RETRYABLE_SQLSTATES:
+            return True
+    message = str(orig if orig is not None else error).lower()
+    return any(marker in message for marker in RETRYABLE_MESSAGES)
+
+class UnitOfWork(IUnitOfWork):
+    def __init__(self, db: Session = session, max_retries: int = MAX_RETRIES):
+        self.db = db
+        self.max_retries = max_retries
+
+    def run(self, operation: Callable[[], T]) -> T:
+        if self.db.info.get(UNIT_OF_WORK_KEY):
+            # Already inside a business operation: join its transaction
+            return operation()
+        attempt = 0
+        while True:
+            # Start from a clean transaction so nothing read earlier is reused
+            self.db.rollback()
+            self.db.info[UNIT_OF_WORK_KEY] = True
+            try:
+                result = operation()
+                self.db.commit()
+                return result
+            except DBAPIError as e:
+                self.db.rollback()
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                time.sleep(RETRY_BASE_DELAY * (2 ** attempt) * random.uniform(0.5, 1.5))
+            except Exception:
+                self.db.rollback()
+                raise
+            finally:
+                self.db.info.pop(UNIT_OF_WORK_KEY, None)
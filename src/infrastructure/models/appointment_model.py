@@ -1,10 +1,20 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, DateTime, Enum as SQLEnum, Text
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, DateTime, Enum as SQLEnum, Text
 from infrastructure.databases.base import Base
 from domain.models.appointment import AppointmentStatus
 
 class AppointmentModel(Base):
     __tablename__ = 'appointments'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Conflict check and per-mentor listings / busy intervals
+        Index('ix_appointments_mentor_time', 'mentor_id', 'start_time', 'end_time'),
+        # Per-student listings, newest first
+        Index('ix_appointments_student_time', 'student_id', 'start_time'),
+        Index('ix_appointments_status_time', 'status', 'start_time'),
+        Index('ix_appointments_updated_at', 'updated_at'),
+        Index('ix_appointments_project_group_id', 'project_group_id'),
+        Index('ix_appointments_series_id', 'series_id'),
+        {'extend_existing': True}
+    )
 
     id = Column(Integer, primary_key=True)
     mentor_id = Column(Integer, ForeignKey('mentors.id'), nullable=False)
@@ -20,4 +30,5 @@ class AppointmentModel(Base):
     meeting_url = Column(String(255), nullable=True)
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime, nullable=False)
-    updated_at = Column(DateTime, nullable=False) 
\ No newline at end of file
+    updated_at = Column(DateTime, nullable=False)
+    series_id = Column(Integer, ForeignKey('appointment_series.id'), nullable=True) 
\ No newline at end of file
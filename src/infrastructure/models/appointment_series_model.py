@@ -0,0 +1,12 @@
+from sqlalchemy import Column, ForeignKey, Integer, String, DateTime
+from infrastructure.databases.base import Base
+
+class AppointmentSeriesModel(Base):
+    __tablename__ = 'appointment_series'
+    __table_args__ = {'extend_existing': True}
+
+    id = Column(Integer, primary_key=True)
+    mentor_id = Column(Integer, ForeignKey('mentors.id'), nullable=False)
+    student_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    rule = Column(String(200), nullable=False)
+    created_at = Column(DateTime, nullable=False)
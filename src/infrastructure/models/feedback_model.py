@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum as SQLEnum, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, Enum as SQLEnum, ForeignKey, Index, Text, UniqueConstraint
 from infrastructure.databases.base import Base
 from domain.models.feedback import FeedbackType
 
 class FeedbackModel(Base):
     __tablename__ = 'feedbacks'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index('ix_feedbacks_reviewed_created', 'reviewed_id', 'created_at'),
+        # One feedback per reviewer per appointment; also serves lookups by appointment
+        UniqueConstraint('appointment_id', 'reviewer_id', name='uq_feedbacks_appointment_reviewer'),
+        {'extend_existing': True}
+    )
 
     id = Column(Integer, primary_key=True)
     appointment_id = Column(Integer, ForeignKey('appointments.id'), nullable=False)
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Date, Integer
+from infrastructure.databases.base import Base
+
+class MentorDailyBookingModel(Base):
+    """Active sessions booked per mentor per (UTC) day, kept in step with appointments"""
+    __tablename__ = 'mentor_daily_bookings'
+    __table_args__ = {'extend_existing': True}
+
+    mentor_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+    booked_count = Column(Integer, nullable=False, default=0)
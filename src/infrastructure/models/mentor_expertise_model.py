@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Index, Integer, String, ForeignKey, UniqueConstraint
 from infrastructure.databases.base import Base
 
 
@@ -6,6 +6,8 @@ class MentorExpertiseModel(Base):
     __tablename__ = 'mentor_expertise'
     __table_args__ = (
         UniqueConstraint('mentor_id', 'expertise', name='uq_mentor_expertise'),
+        # Lookups go by expertise; the unique constraint leads with mentor_id
+        Index('ix_mentor_expertise_expertise', 'expertise', 'mentor_id'),
         {'extend_existing': True}
     )
 
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Enum as SQLEnum, JSON
+from sqlalchemy import Column, Index, Integer, String, DateTime, Float, Enum as SQLEnum, JSON
 from infrastructure.databases.base import Base
 from domain.models.mentor import MentorStatus
 
 class MentorModel(Base):
     __tablename__ = 'mentors'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index('ix_mentors_user_id', 'user_id'),
+        Index('ix_mentors_status', 'status'),
+        {'extend_existing': True}
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, nullable=False)
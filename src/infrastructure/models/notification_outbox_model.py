@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Index, Integer, String, DateTime, Enum as SQLEnum, JSON, Text
+from infrastructure.databases.base import Base
+from domain.models.notification import NotificationStatus
+
+class NotificationOutboxModel(Base):
+    """Notification intents written in the transaction of the change they announce"""
+    __tablename__ = 'notification_outbox'
+    __table_args__ = (
+        # The dispatcher's claim query: pending rows by due time
+        Index('ix_notification_outbox_status_due', 'status', 'next_attempt_at'),
+        {'extend_existing': True},
+    )
+
+    id = Column(Integer, primary_key=True)
+    dedupe_key = Column(String(200), nullable=False, unique=True)
+    event_type = Column(String(50), nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(SQLEnum(NotificationStatus), nullable=False, default=NotificationStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False)
+    last_error = Column(Text)
+    created_at = Column(DateTime, nullable=False)
+    sent_at = Column(DateTime)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, DateTime, Enum as SQLEnum
+from infrastructure.databases.base import Base
+from domain.models.feedback import FeedbackType
+
+class RatingAggregateModel(Base):
+    """Running rating totals per reviewed user and feedback type, kept in step with feedbacks"""
+    __tablename__ = 'rating_aggregates'
+    __table_args__ = {'extend_existing': True}
+
+    reviewed_id = Column(Integer, primary_key=True)
+    feedback_type = Column(SQLEnum(FeedbackType), primary_key=True)
+    rating_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    stars_1 = Column(Integer, nullable=False, default=0)
+    stars_2 = Column(Integer, nullable=False, default=0)
+    stars_3 = Column(Integer, nullable=False, default=0)
+    stars_4 = Column(Integer, nullable=False, default=0)
+    stars_5 = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False)
@@ -1,20 +1,30 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum as SQLEnum, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Enum as SQLEnum, ForeignKey, Index
 from infrastructure.databases.base import Base
 from domain.models.wallet import TransactionType
 
 class WalletModel(Base):
     __tablename__ = 'wallets'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index('ix_wallets_user_id', 'user_id'),
+        {'extend_existing': True}
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
     balance = Column(Integer, nullable=False, default=0)
+    # Running totals maintained together with balance (net of refunds for spent)
+    total_spent = Column(Integer, nullable=False, default=0, server_default='0')
+    total_earned = Column(Integer, nullable=False, default=0, server_default='0')
     created_at = Column(DateTime, nullable=False)
     updated_at = Column(DateTime, nullable=False)
 
 class WalletTransactionModel(Base):
     __tablename__ = 'wallet_transactions'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Ledger pages are keyset-paginated on (created_at, id) within one wallet
+        Index('ix_wallet_transactions_wallet_created', 'wallet_id', 'created_at', 'id'),
+        {'extend_existing': True}
+    )
 
     id = Column(Integer, primary_key=True)
     wallet_id = Column(Integer, ForeignKey('wallets.id'), nullable=False)
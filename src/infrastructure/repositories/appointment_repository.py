@@ -1,270 +1,260 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import and_, delete, func, or_, update
 from sqlalchemy.orm import Session
-from datetime import datetime
-from domain.models.appointment import Appointment, AppointmentStatus
+from datetime import datetime, timezone
+from domain.models.appointment import Appointment, AppointmentStatus, INACTIVE_STATUSES
 from domain.models.iappointment_repository import IAppointmentRepository
+from domain.models.recurrence import AppointmentSeries
 from infrastructure.models.appointment_model import AppointmentModel
+from infrastructure.models.appointment_series_model import AppointmentSeriesModel
 from infrastructure.databases.mssql import session
+from infrastructure.databases.routing import read_only
+from infrastructure.repositories.row_mapper import RowMapper
+
+# Keep IN lists well below SQL Server's 2100 parameter limit
+IN_CLAUSE_CHUNK_SIZE = 1000
+
+appointment_mapper = RowMapper(AppointmentModel, Appointment)
+series_mapper = RowMapper(AppointmentSeriesModel, AppointmentSeries)
 
 class AppointmentRepository(IAppointmentRepository):
     def __init__(self):
         self.db: Session = session
     
     def create(self, appointment: Appointment) -> Appointment:
-        appointment_model = AppointmentModel(
-            mentor_id=appointment.mentor_id,
-            student_id=appointment.student_id,
-            project_group_id=appointment.project_group_id,
-            title=appointment.title,
-            description=appointment.description,
-            start_time=appointment.start_time,
-            end_time=appointment.end_time,
-            status=appointment.status,
-            points_required=appointment.points_required,
-            points_used=appointment.points_used,
-            meeting_url=appointment.meeting_url,
-            notes=appointment.notes,
-            created_at=appointment.created_at,
-            updated_at=appointment.updated_at
-        )
-        self.db.add(appointment_model)
-        self.db.commit()
-        self.db.refresh(appointment_model)
-        
-        return Appointment(
-            id=appointment_model.id,
-            mentor_id=appointment_model.mentor_id,
-            student_id=appointment_model.student_id,
-            project_group_id=appointment_model.project_group_id,
-            title=appointment_model.title,
-            description=appointment_model.description,
-            start_time=appointment_model.start_time,
-            end_time=appointment_model.end_time,
-            status=appointment_model.status,
-            points_required=appointment_model.points_required,
-            points_used=appointment_model.points_used,
-            meeting_url=appointment_model.meeting_url,
-            notes=appointment_model.notes,
-            created_at=appointment_model.created_at,
-            updated_at=appointment_model.updated_at
-        )
+        return appointment_mapper.insert(self.db, appointment_mapper.values(appointment))
+    
+    def create_many(self, appointments: List[Appointment]) -> List[Appointment]:
+        created = appointment_mapper.insert_many(self.db, [appointment_mapper.values(a) for a in appointments])
+        return sorted(created, key=lambda appointment: (appointment.start_time, appointment.id))
+    
+    def create_series(self, series: AppointmentSeries) -> AppointmentSeries:
+        return series_mapper.insert(self.db, series_mapper.values(series))
+    
+    def get_series_by_id(self, series_id: int) -> Optional[AppointmentSeries]:
+        return series_mapper.first(self.db, series_mapper.select().where(AppointmentSeriesModel.id == series_id))
     
     def get_by_id(self, appointment_id: int) -> Optional[Appointment]:
-        appointment_model = self.db.query(AppointmentModel).filter(AppointmentModel.id == appointment_id).first()
-        if not appointment_model:
-            return None
-        
-        return Appointment(
-            id=appointment_model.id,
-            mentor_id=appointment_model.mentor_id,
-            student_id=appointment_model.student_id,
-            project_group_id=appointment_model.project_group_id,
-            title=appointment_model.title,
-            description=appointment_model.description,
-            start_time=appointment_model.start_time,
-            end_time=appointment_model.end_time,
-            status=appointment_model.status,
-            points_required=appointment_model.points_required,
-            points_used=appointment_model.points_used,
-            meeting_url=appointment_model.meeting_url,
-            notes=appointment_model.notes,
-            created_at=appointment_model.created_at,
-            updated_at=appointment_model.updated_at
+        return appointment_mapper.first(
+            self.db, appointment_mapper.select().where(AppointmentModel.id == appointment_id)
+        )
+    
+    def get_by_series_id(self, series_id: int) -> List[Appointment]:
+        return appointment_mapper.all(
+            self.db,
+            appointment_mapper.select().where(AppointmentModel.series_id == series_id)
+            .order_by(AppointmentModel.start_time)
         )
     
+    @read_only
     def get_by_mentor_id(self, mentor_id: int) -> List[Appointment]:
-        appointment_models = self.db.query(AppointmentModel).filter(AppointmentModel.mentor_id == mentor_id).all()
-        return [
-            Appointment(
-                id=model.id,
-                mentor_id=model.mentor_id,
-                student_id=model.student_id,
-                project_group_id=model.project_group_id,
-                title=model.title,
-                description=model.description,
-                start_time=model.start_time,
-                end_time=model.end_time,
-                status=model.status,
-                points_required=model.points_required,
-                points_used=model.points_used,
-                meeting_url=model.meeting_url,
-                notes=model.notes,
-                created_at=model.created_at,
-                updated_at=model.updated_at
-            ) for model in appointment_models
-        ]
+        return appointment_mapper.all(
+            self.db, appointment_mapper.select().where(AppointmentModel.mentor_id == mentor_id)
+        )
     
+    @read_only
     def get_by_student_id(self, student_id: int) -> List[Appointment]:
-        appointment_models = self.db.query(AppointmentModel).filter(AppointmentModel.student_id == student_id).all()
-        return [
-            Appointment(
-                id=model.id,
-                mentor_id=model.mentor_id,
-                student_id=model.student_id,
-                project_group_id=model.project_group_id,
-                title=model.title,
-                description=model.description,
-                start_time=model.start_time,
-                end_time=model.end_time,
-                status=model.status,
-                points_required=model.points_required,
-                points_used=model.points_used,
-                meeting_url=model.meeting_url,
-                notes=model.notes,
-                created_at=model.created_at,
-                updated_at=model.updated_at
-            ) for model in appointment_models
-        ]
+        return appointment_mapper.all(
+            self.db, appointment_mapper.select().where(AppointmentModel.student_id == student_id)
+        )
+    
+    @read_only
+    def get_page_by_mentor_id(self, mentor_id: int, limit: int,
+                              cursor: Optional[Tuple[datetime, int]] = None,
+                              offset: int = 0) -> Tuple[List[Appointment], Optional[Tuple[datetime, int]]]:
+        return self._get_page(AppointmentModel.mentor_id == mentor_id, limit, cursor, offset)
+    
+    @read_only
+    def get_page_by_student_id(self, student_id: int, limit: int,
+                               cursor: Optional[Tuple[datetime, int]] = None,
+                               offset: int = 0) -> Tuple[List[Appointment], Optional[Tuple[datetime, int]]]:
+        return self._get_page(AppointmentModel.student_id == student_id, limit, cursor, offset)
     
+    @read_only
+    def count_by_mentor_id(self, mentor_id: int) -> int:
+        return self.db.query(func.count(AppointmentModel.id)).filter(
+            AppointmentModel.mentor_id == mentor_id
+        ).scalar() or 0
+    
+    @read_only
+    def count_by_student_id(self, student_id: int) -> int:
+        return self.db.query(func.count(AppointmentModel.id)).filter(
+            AppointmentModel.student_id == student_id
+        ).scalar() or 0
+    
+    def _get_page(self, criterion, limit: int, cursor: Optional[Tuple[datetime, int]],
+                  offset: int) -> Tuple[List[Appointment], Optional[Tuple[datetime, int]]]:
+        """Fetch one page ordered by (start_time, id) descending.
+
+        A cursor seeks past that key instead of skipping rows; one extra row
+        is fetched to tell whether a next page exists.
+        """
+        query = appointment_mapper.select().where(criterion)
+        if cursor is not None:
+            cursor_start, cursor_id = cursor
+            query = query.where(or_(
+                AppointmentModel.start_time < cursor_start,
+                and_(AppointmentModel.start_time == cursor_start, AppointmentModel.id < cursor_id)
+            ))
+        query = query.order_by(AppointmentModel.start_time.desc(), AppointmentModel.id.desc())
+        if cursor is None and offset:
+            query = query.offset(offset)
+        appointments = appointment_mapper.all(self.db, query.limit(limit + 1))
+        
+        next_cursor = None
+        if len(appointments) > limit:
+            appointments = appointments[:limit]
+            next_cursor = (appointments[-1].start_time, appointments[-1].id)
+        
+        return appointments, next_cursor
+    
+    @read_only
     def get_by_project_group_id(self, group_id: int) -> List[Appointment]:
-        appointment_models = self.db.query(AppointmentModel).filter(AppointmentModel.project_group_id == group_id).all()
-        return [
-            Appointment(
-                id=model.id,
-                mentor_id=model.mentor_id,
-                student_id=model.student_id,
-                project_group_id=model.project_group_id,
-                title=model.title,
-                description=model.description,
-                start_time=model.start_time,
-                end_time=model.end_time,
-                status=model.status,
-                points_required=model.points_required,
-                points_used=model.points_used,
-                meeting_url=model.meeting_url,
-                notes=model.notes,
-                created_at=model.created_at,
-                updated_at=model.updated_at
-            ) for model in appointment_models
-        ]
+        return appointment_mapper.all(
+            self.db, appointment_mapper.select().where(AppointmentModel.project_group_id == group_id)
+        )
     
+    @read_only
     def get_by_status(self, status: AppointmentStatus) -> List[Appointment]:
-        appointment_models = self.db.query(AppointmentModel).filter(AppointmentModel.status == status).all()
-        return [
-            Appointment(
-                id=model.id,
-                mentor_id=model.mentor_id,
-                student_id=model.student_id,
-                project_group_id=model.project_group_id,
-                title=model.title,
-                description=model.description,
-                start_time=model.start_time,
-                end_time=model.end_time,
-                status=model.status,
-                points_required=model.points_required,
-                points_used=model.points_used,
-                meeting_url=model.meeting_url,
-                notes=model.notes,
-                created_at=model.created_at,
-                updated_at=model.updated_at
-            ) for model in appointment_models
-        ]
+        return appointment_mapper.all(
+            self.db, appointment_mapper.select().where(AppointmentModel.status == status)
+        )
     
+    @read_only
     def get_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Appointment]:
-        appointment_models = self.db.query(AppointmentModel).filter(
+        return appointment_mapper.all(self.db, appointment_mapper.select().where(
             AppointmentModel.start_time >= start_date,
             AppointmentModel.end_time <= end_date
-        ).all()
-        return [
-            Appointment(
-                id=model.id,
-                mentor_id=model.mentor_id,
-                student_id=model.student_id,
-                project_group_id=model.project_group_id,
-                title=model.title,
-                description=model.description,
-                start_time=model.start_time,
-                end_time=model.end_time,
-                status=model.status,
-                points_required=model.points_required,
-                points_used=model.points_used,
-                meeting_url=model.meeting_url,
-                notes=model.notes,
-                created_at=model.created_at,
-                updated_at=model.updated_at
-            ) for model in appointment_models
-        ]
+        ))
+    
+    def get_starting_between(self, statuses: Tuple[AppointmentStatus, ...], range_start: Optional[datetime],
+                             range_end: datetime) -> List[Appointment]:
+        query = appointment_mapper.select().where(
+            AppointmentModel.status.in_(statuses),
+            AppointmentModel.start_time < range_end
+        )
+        if range_start is not None:
+            query = query.where(AppointmentModel.start_time >= range_start)
+        return appointment_mapper.all(self.db, query.order_by(AppointmentModel.start_time))
+    
+    def get_updated_since(self, updated_since: datetime, range_end: datetime) -> List[Appointment]:
+        return appointment_mapper.all(self.db, appointment_mapper.select().where(
+            AppointmentModel.updated_at > updated_since,
+            AppointmentModel.start_time < range_end
+        ))
+    
+    def get_by_ids(self, appointment_ids: List[int]) -> List[Appointment]:
+        appointments = []
+        for i in range(0, len(appointment_ids), IN_CLAUSE_CHUNK_SIZE):
+            appointments.extend(appointment_mapper.all(self.db, appointment_mapper.select().where(
+                AppointmentModel.id.in_(appointment_ids[i:i + IN_CLAUSE_CHUNK_SIZE])
+            )))
+        return appointments
     
     def get_conflicting_appointments(self, mentor_id: int, start_time: datetime, end_time: datetime) -> List[Appointment]:
-        appointment_models = self.db.query(AppointmentModel).filter(
+        return appointment_mapper.all(self.db, appointment_mapper.select().where(
             AppointmentModel.mentor_id == mentor_id,
             AppointmentModel.start_time < end_time,
             AppointmentModel.end_time > start_time
-        ).all()
-        return [
-            Appointment(
-                id=model.id,
-                mentor_id=model.mentor_id,
-                student_id=model.student_id,
-                project_group_id=model.project_group_id,
-                title=model.title,
-                description=model.description,
-                start_time=model.start_time,
-                end_time=model.end_time,
-                status=model.status,
-                points_required=model.points_required,
-                points_used=model.points_used,
-                meeting_url=model.meeting_url,
-                notes=model.notes,
-                created_at=model.created_at,
-                updated_at=model.updated_at
-            ) for model in appointment_models
-        ]
+        ))
+    
+    @read_only
+    def get_busy_intervals(self, mentor_id: int, range_start: datetime, range_end: datetime) -> List[Tuple[datetime, datetime]]:
+        """(start_time, end_time) of the mentor's active appointments overlapping the range"""
+        rows = self.db.query(AppointmentModel.start_time, AppointmentModel.end_time).filter(
+            AppointmentModel.mentor_id == mentor_id,
+            AppointmentModel.start_time < range_end,
+            AppointmentModel.end_time > range_start,
+            AppointmentModel.status.notin_(INACTIVE_STATUSES)
+        ).order_by(AppointmentModel.start_time).all()
+        return [(row.start_time, row.end_time) for row in rows]
+    
+    @read_only
+    def get_busy_intervals_by_mentor_ids(self, mentor_ids: List[int], range_start: datetime,
+                                         range_end: datetime) -> Dict[int, List[Tuple[datetime, datetime]]]:
+        """Busy intervals of many mentors overlapping the range, grouped by mentor_id"""
+        busy: Dict[int, List[Tuple[datetime, datetime]]] = {mentor_id: [] for mentor_id in mentor_ids}
+        ids = list(busy)
+        for i in range(0, len(ids), IN_CLAUSE_CHUNK_SIZE):
+            rows = self.db.query(
+                AppointmentModel.mentor_id, AppointmentModel.start_time, AppointmentModel.end_time
+            ).filter(
+                AppointmentModel.mentor_id.in_(ids[i:i + IN_CLAUSE_CHUNK_SIZE]),
+                AppointmentModel.start_time < range_end,
+                AppointmentModel.end_time > range_start,
+                AppointmentModel.status.notin_(INACTIVE_STATUSES)
+            ).all()
+            for row in rows:
+                busy[row.mentor_id].append((row.start_time, row.end_time))
+        return busy
     
     def update(self, appointment: Appointment) -> Appointment:
-        appointment_model = self.db.query(AppointmentModel).filter(AppointmentModel.id == appointment.id).first()
-        if not appointment_model:
+        updated = appointment_mapper.update(self.db, AppointmentModel.id == appointment.id, {
+            'mentor_id': appointment.mentor_id,
+            'student_id': appointment.student_id,
+            'project_group_id': appointment.project_group_id,
+            'title': appointment.title,
+            'description': appointment.description,
+            'start_time': appointment.start_time,
+            'end_time': appointment.end_time,
+            'status': appointment.status,
+            'points_required': appointment.points_required,
+            'points_used': appointment.points_used,
+            'meeting_url': appointment.meeting_url,
+            'notes': appointment.notes,
+            'updated_at': appointment.updated_at
+        })
+        if not updated:
             raise ValueError("Appointment not found")
         
-        appointment_model.mentor_id = appointment.mentor_id
-        appointment_model.student_id = appointment.student_id
-        appointment_model.project_group_id = appointment.project_group_id
-        appointment_model.title = appointment.title
-        appointment_model.description = appointment.description
-        appointment_model.start_time = appointment.start_time
-        appointment_model.end_time = appointment.end_time
-        appointment_model.status = appointment.status
-        appointment_model.points_required = appointment.points_required
-        appointment_model.points_used = appointment.points_used
-        appointment_model.meeting_url = appointment.meeting_url
-        appointment_model.notes = appointment.notes
-        appointment_model.updated_at = appointment.updated_at
-        
-        self.db.commit()
-        self.db.refresh(appointment_model)
-        
-        return Appointment(
-            id=appointment_model.id,
-            mentor_id=appointment_model.mentor_id,
-            student_id=appointment_model.student_id,
-            project_group_id=appointment_model.project_group_id,
-            title=appointment_model.title,
-            description=appointment_model.description,
-            start_time=appointment_model.start_time,
-            end_time=appointment_model.end_time,
-            status=appointment_model.status,
-            points_required=appointment_model.points_required,
-            points_used=appointment_model.points_used,
-            meeting_url=appointment_model.meeting_url,
-            notes=appointment_model.notes,
-            created_at=appointment_model.created_at,
-            updated_at=appointment_model.updated_at
-        )
+        return updated
     
     def delete(self, appointment_id: int) -> bool:
-        appointment_model = self.db.query(AppointmentModel).filter(AppointmentModel.id == appointment_id).first()
-        if not appointment_model:
-            return False
-        
-        self.db.delete(appointment_model)
-        self.db.commit()
-        return True
+        result = self.db.execute(delete(AppointmentModel).where(AppointmentModel.id == appointment_id))
+        return result.rowcount > 0
     
     def update_status(self, appointment_id: int, status: AppointmentStatus) -> bool:
-        appointment_model = self.db.query(AppointmentModel).filter(AppointmentModel.id == appointment_id).first()
-        if not appointment_model:
-            return False
+        result = self.db.execute(
+            update(AppointmentModel).where(AppointmentModel.id == appointment_id).values(status=status)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+    
+    def update_status_many(self, appointment_ids: List[int], status: AppointmentStatus,
+                           from_statuses: Tuple[AppointmentStatus, ...]) -> List[Appointment]:
+        moved: List[Appointment] = []
+        ids = list(dict.fromkeys(appointment_ids))
+        for i in range(0, len(ids), IN_CLAUSE_CHUNK_SIZE):
+            moved.extend(self._update_status_where(
+                AppointmentModel.id.in_(ids[i:i + IN_CLAUSE_CHUNK_SIZE]), status, from_statuses
+            ))
+        return moved
+    
+    def update_status_ended_before(self, ended_before: datetime, status: AppointmentStatus,
+                                   from_statuses: Tuple[AppointmentStatus, ...]) -> List[Appointment]:
+        return self._update_status_where(AppointmentModel.end_time <= ended_before, status, from_statuses)
+    
+    def _update_status_where(self, criterion, status: AppointmentStatus,
+                             from_statuses: Tuple[AppointmentStatus, ...]) -> List[Appointment]:
+        """One set-based UPDATE of the matching rows still in from_statuses; returns the rows moved"""
+        # The status guard in the WHERE clause makes the transition safe against
+        # concurrent changes: a row that already moved on is simply not matched
+        criterion = and_(criterion, AppointmentModel.status.in_(from_statuses))
+        now = datetime.now(timezone.utc)
+        statement = (
+            update(AppointmentModel).where(criterion).values(status=status, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if self.db.get_bind(clause=statement).dialect.update_returning:
+            return appointment_mapper.all(self.db, statement.returning(*appointment_mapper.columns))
         
-        appointment_model.status = status
-        self.db.commit()
-        return True
+        # Lock the rows first so that the ones read are exactly the ones updated
+        self.db.execute(update(AppointmentModel).where(criterion)
+                        .values(updated_at=AppointmentModel.updated_at)
+                        .execution_options(synchronize_session=False))
+        moved = appointment_mapper.all(self.db, appointment_mapper.select().where(criterion))
+        self.db.execute(statement)
+        for appointment in moved:
+            appointment.status = status
+            appointment.updated_at = now
+        return moved
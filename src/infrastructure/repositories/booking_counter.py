@@ -0,0 +1,165 @@
+from collections import Counter, defaultdict
+from datetime import date
+from typing import Dict, List, Tuple
+from sqlalchemy import Date, case, cast, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from domain.models.appointment import INACTIVE_STATUSES
+from domain.models.ibooking_counter import IBookingCounter
+from infrastructure.models.appointment_model import AppointmentModel
+from infrastructure.models.mentor_daily_booking_model import MentorDailyBookingModel
+from infrastructure.databases.mssql import session
+from infrastructure.databases.routing import read_only
+from infrastructure.repositories.appointment_repository import IN_CLAUSE_CHUNK_SIZE
+
+class BookingCounter(IBookingCounter):
+    """Per-mentor, per-day session counts maintained with conditional in-place
+    updates, so the daily quota is checked in one row and cannot be overrun
+    by concurrent bookings"""
+    def __init__(self):
+        self.db: Session = session
+    
+    def try_reserve(self, mentor_id: int, day: date, limit: int) -> bool:
+        # Only increments while below the limit; the check and the write are one statement
+        reserve = (
+            update(MentorDailyBookingModel)
+            .where(MentorDailyBookingModel.mentor_id == mentor_id,
+                   MentorDailyBookingModel.day == day,
+                   MentorDailyBookingModel.booked_count < limit)
+            .values(booked_count=MentorDailyBookingModel.booked_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if self.db.execute(reserve).rowcount:
+            return True
+        if limit < 1:
+            return False
+        
+        # Either the day is full or this is its first booking: try to create the row,
+        # and if a concurrent transaction just did, go through the conditional update again
+        try:
+            with self.db.begin_nested():
+                self.db.execute(insert(MentorDailyBookingModel).values(
+                    mentor_id=mentor_id, day=day, booked_count=1
+                ))
+            return True
+        except IntegrityError:
+            return self.db.execute(reserve).rowcount > 0
+    
+    def try_reserve_days(self, mentor_id: int, days: List[date], limit: int) -> List[date]:
+        """Reserve a session on many days with a fixed number of statements"""
+        days = sorted(set(days))
+        if not days:
+            return []
+        counts = dict(self.db.execute(
+            select(MentorDailyBookingModel.day, MentorDailyBookingModel.booked_count)
+            .where(MentorDailyBookingModel.mentor_id == mentor_id, MentorDailyBookingModel.day.in_(days))
+        ).all())
+        full = [day for day in days if counts.get(day, 0) >= limit]
+        if full:
+            return full
+        
+        existing = [day for day in days if day in counts]
+        if existing:
+            # Still conditional, so a concurrent booking that filled a day is caught
+            reserve = self._reserve(mentor_id, existing, limit)
+            if self.db.get_bind(clause=reserve).dialect.update_returning:
+                reserved = set(self.db.execute(reserve.returning(MentorDailyBookingModel.day)).scalars())
+            else:
+                reserved = {
+                    day for day in existing if self.db.execute(self._reserve(mentor_id, [day], limit)).rowcount
+                }
+            if len(reserved) != len(existing):
+                # A concurrent booking filled these since the read above
+                return [day for day in existing if day not in reserved]
+        
+        missing = [day for day in days if day not in counts]
+        if missing:
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(MentorDailyBookingModel), [
+                        {'mentor_id': mentor_id, 'day': day, 'booked_count': 1} for day in missing
+                    ])
+            except IntegrityError:
+                # Another transaction created some of these rows first; take them one at a time
+                return [day for day in missing if not self.try_reserve(mentor_id, day, limit)]
+        return []
+    
+    @staticmethod
+    def _reserve(mentor_id: int, days: List[date], limit: int):
+        """Count one more session on those of the days still below the limit"""
+        return (
+            update(MentorDailyBookingModel)
+            .where(MentorDailyBookingModel.mentor_id == mentor_id,
+                   MentorDailyBookingModel.day.in_(days),
+                   MentorDailyBookingModel.booked_count < limit)
+            .values(booked_count=MentorDailyBookingModel.booked_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+    
+    def release(self, mentor_id: int, day: date) -> None:
+        self.release_days(mentor_id, [day])
+    
+    def release_days(self, mentor_id: int, days: List[date]) -> None:
+        # One statement per distinct number of sessions released on a day; usually just one
+        days_by_sessions: Dict[int, List[date]] = defaultdict(list)
+        for day, sessions in Counter(days).items():
+            days_by_sessions[sessions].append(day)
+        for sessions, same_days in days_by_sessions.items():
+            booked = MentorDailyBookingModel.booked_count
+            self.db.execute(
+                update(MentorDailyBookingModel)
+                .where(MentorDailyBookingModel.mentor_id == mentor_id,
+                       MentorDailyBookingModel.day.in_(same_days),
+                       booked > 0)
+                .values(booked_count=case((booked > sessions, booked - sessions), else_=0))
+                .execution_options(synchronize_session=False)
+            )
+    
+    @read_only
+    def get_count(self, mentor_id: int, day: date) -> int:
+        return self.db.execute(
+            select(MentorDailyBookingModel.booked_count)
+            .where(MentorDailyBookingModel.mentor_id == mentor_id, MentorDailyBookingModel.day == day)
+        ).scalar() or 0
+    
+    @read_only
+    def get_counts(self, mentor_ids: List[int], first_day: date, last_day: date) -> Dict[Tuple[int, date], int]:
+        counts: Dict[Tuple[int, date], int] = {}
+        ids = list(dict.fromkeys(mentor_ids))
+        for i in range(0, len(ids), IN_CLAUSE_CHUNK_SIZE):
+            rows = self.db.execute(
+                select(MentorDailyBookingModel.mentor_id, MentorDailyBookingModel.day,
+                       MentorDailyBookingModel.booked_count)
+                .where(MentorDailyBookingModel.mentor_id.in_(ids[i:i + IN_CLAUSE_CHUNK_SIZE]),
+                       MentorDailyBookingModel.day >= first_day,
+                       MentorDailyBookingModel.day <= last_day,
+                       MentorDailyBookingModel.booked_count > 0)
+            ).all()
+            for row in rows:
+                counts[(row.mentor_id, row.day)] = row.booked_count
+        return counts
+    
+    def recompute_all(self) -> int:
+        """Rebuild every counter with one grouped pass over the active appointments"""
+        if self.db.get_bind().dialect.name == 'sqlite':
+            # SQLite stores datetimes as text; CAST AS DATE would keep only the year
+            appointment_day = func.date(AppointmentModel.start_time)
+        else:
+            appointment_day = cast(AppointmentModel.start_time, Date)
+        rows = self.db.execute(
+            select(AppointmentModel.mentor_id, appointment_day.label('day'), func.count(AppointmentModel.id))
+            .where(AppointmentModel.status.notin_(INACTIVE_STATUSES))
+            .group_by(AppointmentModel.mentor_id, appointment_day)
+        ).all()
+        
+        counts: Dict[Tuple[int, date], int] = defaultdict(int)
+        for mentor_id, day, count in rows:
+            counts[(mentor_id, date.fromisoformat(day) if isinstance(day, str) else day)] += count
+        
+        self.db.execute(delete(MentorDailyBookingModel))
+        if counts:
+            self.db.execute(insert(MentorDailyBookingModel), [
+                {'mentor_id': mentor_id, 'day': day, 'booked_count': count}
+                for (mentor_id, day), count in counts.items()
+            ])
+        return len(counts)
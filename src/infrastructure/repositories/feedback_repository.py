@@ -0,0 +1,74 @@
+from typing import List, Optional
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from domain.models.feedback import Feedback, FeedbackType
+from domain.models.ifeedback_repository import IFeedbackRepository
+from infrastructure.models.feedback_model import FeedbackModel
+from infrastructure.models.rating_aggregate_model import RatingAggregateModel
+from infrastructure.databases.mssql import session
+from infrastructure.databases.routing import read_only
+from infrastructure.repositories.row_mapper import RowMapper
+
+feedback_mapper = RowMapper(FeedbackModel, Feedback)
+
+class FeedbackRepository(IFeedbackRepository):
+    def __init__(self):
+        self.db: Session = session
+    
+    def create(self, feedback: Feedback) -> Optional[Feedback]:
+        # The unique (appointment_id, reviewer_id) constraint settles concurrent submissions
+        try:
+            with self.db.begin_nested():
+                return feedback_mapper.insert(self.db, feedback_mapper.values(feedback))
+        except IntegrityError:
+            return None
+    
+    def get_by_id(self, feedback_id: int) -> Optional[Feedback]:
+        return feedback_mapper.first(self.db, feedback_mapper.select().where(FeedbackModel.id == feedback_id))
+    
+    def get_by_appointment_id(self, appointment_id: int) -> List[Feedback]:
+        return feedback_mapper.all(
+            self.db, feedback_mapper.select().where(FeedbackModel.appointment_id == appointment_id)
+        )
+    
+    @read_only
+    def get_by_reviewer_id(self, reviewer_id: int) -> List[Feedback]:
+        return feedback_mapper.all(self.db, feedback_mapper.select().where(FeedbackModel.reviewer_id == reviewer_id))
+    
+    @read_only
+    def get_by_reviewed_id(self, reviewed_id: int) -> List[Feedback]:
+        query = (
+            feedback_mapper.select().where(FeedbackModel.reviewed_id == reviewed_id)
+            .order_by(FeedbackModel.created_at.desc(), FeedbackModel.id.desc())
+        )
+        return feedback_mapper.all(self.db, query)
+    
+    @read_only
+    def get_by_type(self, feedback_type: FeedbackType) -> List[Feedback]:
+        return feedback_mapper.all(
+            self.db, feedback_mapper.select().where(FeedbackModel.feedback_type == feedback_type)
+        )
+    
+    @read_only
+    def get_average_rating_by_user(self, user_id: int) -> float:
+        """Average of every rating the user received, read from the running aggregates"""
+        total, count = self.db.execute(
+            select(func.sum(RatingAggregateModel.rating_sum), func.sum(RatingAggregateModel.rating_count))
+            .where(RatingAggregateModel.reviewed_id == user_id)
+        ).one()
+        return total / count if count else 0.0
+    
+    def update(self, feedback: Feedback) -> Feedback:
+        updated = feedback_mapper.update(self.db, FeedbackModel.id == feedback.id, {
+            'rating': feedback.rating,
+            'comment': feedback.comment
+        })
+        if not updated:
+            raise ValueError("Feedback not found")
+        
+        return updated
+    
+    def delete(self, feedback_id: int) -> bool:
+        result = self.db.execute(delete(FeedbackModel).where(FeedbackModel.id == feedback_id))
+        return result.rowcount > 0
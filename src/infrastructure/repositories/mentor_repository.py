@@ -1,199 +1,212 @@
+from datetime import datetime, timezone
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import Float, cast, delete, exists, func, insert, literal, select, update
+from sqlalchemy.orm import Session, aliased
+from domain.constants import (
+    MAX_RATING, MATCH_WEIGHT_EXPERTISE, MATCH_WEIGHT_RATING, MATCH_WEIGHT_PRICE, MATCH_WEIGHT_CAPACITY
+)
 from domain.models.mentor import Mentor, MentorStatus
+from domain.models.mentor_match import MentorMatch
+from domain.models.appointment import AppointmentStatus, INACTIVE_STATUSES
+from domain.models.availability import as_utc
 from domain.models.imentor_repository import IMentorRepository
 from infrastructure.models.mentor_model import MentorModel
 from infrastructure.models.mentor_expertise_model import MentorExpertiseModel
+from infrastructure.models.appointment_model import AppointmentModel
+from infrastructure.models.mentor_daily_booking_model import MentorDailyBookingModel
 from infrastructure.databases.mssql import session
+from infrastructure.databases.routing import read_only
+from infrastructure.repositories.row_mapper import RowMapper
+
+mentor_mapper = RowMapper(MentorModel, Mentor)
+
+# Matching probes bookings for a pool of this many times the requested results,
+# growing it by the same factor while the top K cannot yet be proven exact
+MATCH_POOL_FACTOR = 4
+MIN_MATCH_POOL = 200
 
 class MentorRepository(IMentorRepository):
     def __init__(self):
         self.db: Session = session
     
     def create(self, mentor: Mentor) -> Mentor:
-        mentor_model = MentorModel(
-            user_id=mentor.user_id,
-            bio=mentor.bio,
-            expertise_areas=mentor.expertise_areas,
-            hourly_rate=mentor.hourly_rate,
-            max_sessions_per_day=mentor.max_sessions_per_day,
-            status=mentor.status,
-            rating=mentor.rating,
-            total_sessions=mentor.total_sessions,
-            created_at=mentor.created_at,
-            updated_at=mentor.updated_at
-        )
-        self.db.add(mentor_model)
-        self.db.commit()
-        self.db.refresh(mentor_model)
-
+        created = mentor_mapper.insert(self.db, mentor_mapper.values(mentor))
+        
         # Persist expertise into normalized join table for efficient queries
         if mentor.expertise_areas:
-            for exp in mentor.expertise_areas:
-                self.db.add(MentorExpertiseModel(mentor_id=mentor_model.id, expertise=exp))
-            self.db.commit()
+            self.db.execute(insert(MentorExpertiseModel), [
+                {'mentor_id': created.id, 'expertise': exp} for exp in mentor.expertise_areas
+            ])
         
-        return Mentor(
-            id=mentor_model.id,
-            user_id=mentor_model.user_id,
-            bio=mentor_model.bio,
-            expertise_areas=mentor_model.expertise_areas,
-            hourly_rate=mentor_model.hourly_rate,
-            max_sessions_per_day=mentor_model.max_sessions_per_day,
-            status=mentor_model.status,
-            rating=mentor_model.rating,
-            total_sessions=mentor_model.total_sessions,
-            created_at=mentor_model.created_at,
-            updated_at=mentor_model.updated_at
-        )
+        return created
     
     def get_by_id(self, mentor_id: int) -> Optional[Mentor]:
-        mentor_model = self.db.query(MentorModel).filter(MentorModel.id == mentor_id).first()
-        if not mentor_model:
-            return None
-        
-        return Mentor(
-            id=mentor_model.id,
-            user_id=mentor_model.user_id,
-            bio=mentor_model.bio,
-            expertise_areas=mentor_model.expertise_areas,
-            hourly_rate=mentor_model.hourly_rate,
-            max_sessions_per_day=mentor_model.max_sessions_per_day,
-            status=mentor_model.status,
-            rating=mentor_model.rating,
-            total_sessions=mentor_model.total_sessions,
-            created_at=mentor_model.created_at,
-            updated_at=mentor_model.updated_at
+        return mentor_mapper.first(self.db, mentor_mapper.select().where(MentorModel.id == mentor_id))
+    
+    def get_for_update(self, mentor_id: int) -> Optional[Mentor]:
+        """Get a mentor and hold its row lock until the transaction ends"""
+        # A no-op UPDATE locks the row on every dialect, unlike SELECT ... FOR UPDATE
+        # which SQL Server and SQLite ignore
+        self.db.query(MentorModel).filter(MentorModel.id == mentor_id).update(
+            {MentorModel.updated_at: MentorModel.updated_at}, synchronize_session=False
         )
+        return self.get_by_id(mentor_id)
     
     def get_by_user_id(self, user_id: int) -> Optional[Mentor]:
-        mentor_model = self.db.query(MentorModel).filter(MentorModel.user_id == user_id).first()
-        if not mentor_model:
-            return None
-        
-        return Mentor(
-            id=mentor_model.id,
-            user_id=mentor_model.user_id,
-            bio=mentor_model.bio,
-            expertise_areas=mentor_model.expertise_areas,
-            hourly_rate=mentor_model.hourly_rate,
-            max_sessions_per_day=mentor_model.max_sessions_per_day,
-            status=mentor_model.status,
-            rating=mentor_model.rating,
-            total_sessions=mentor_model.total_sessions,
-            created_at=mentor_model.created_at,
-            updated_at=mentor_model.updated_at
-        )
+        return mentor_mapper.first(self.db, mentor_mapper.select().where(MentorModel.user_id == user_id))
     
+    @read_only
     def get_all(self) -> List[Mentor]:
-        mentor_models = self.db.query(MentorModel).all()
-        return [
-            Mentor(
-                id=model.id,
-                user_id=model.user_id,
-                bio=model.bio,
-                expertise_areas=model.expertise_areas,
-                hourly_rate=model.hourly_rate,
-                max_sessions_per_day=model.max_sessions_per_day,
-                status=model.status,
-                rating=model.rating,
-                total_sessions=model.total_sessions,
-                created_at=model.created_at,
-                updated_at=model.updated_at
-            ) for model in mentor_models
-        ]
+        return mentor_mapper.all(self.db, mentor_mapper.select())
     
+    @read_only
     def get_by_expertise(self, expertise: str) -> List[Mentor]:
         # Efficient query using join table
-        mentor_models = (
-            self.db.query(MentorModel)
+        query = (
+            mentor_mapper.select()
             .join(MentorExpertiseModel, MentorExpertiseModel.mentor_id == MentorModel.id)
-            .filter(MentorExpertiseModel.expertise == expertise)
-            .all()
+            .where(MentorExpertiseModel.expertise == expertise)
         )
-        
-        return [
-            Mentor(
-                id=model.id,
-                user_id=model.user_id,
-                bio=model.bio,
-                expertise_areas=model.expertise_areas,
-                hourly_rate=model.hourly_rate,
-                max_sessions_per_day=model.max_sessions_per_day,
-                status=model.status,
-                rating=model.rating,
-                total_sessions=model.total_sessions,
-                created_at=model.created_at,
-                updated_at=model.updated_at
-            ) for model in mentor_models
-        ]
+        return mentor_mapper.all(self.db, query)
     
+    @read_only
     def get_available_mentors(self) -> List[Mentor]:
-        mentor_models = self.db.query(MentorModel).filter(
-            MentorModel.status == MentorStatus.ACTIVE
-        ).all()
+        query = mentor_mapper.select().where(MentorModel.status == MentorStatus.ACTIVE)
+        return mentor_mapper.all(self.db, query)
+    
+    @read_only
+    def find_matches(self, expertise: List[str], start_time: datetime, end_time: datetime,
+                     max_rate: Optional[int], limit: int) -> List[MentorMatch]:
+        """Score every active mentor free in the window and return the best `limit`.
+
+        One SELECT ranks all mentors by the parts of the score that live on the
+        mentor row (expertise overlap, rating, price) plus the most the capacity
+        part could add, and keeps a small pool of the best. Only the pool's
+        mentors are probed for bookings in the window and on the day. Mentors
+        left out of the pool can score at most the pool's lowest bound, so if
+        the K-th result beats that bound the answer is exact; otherwise the
+        pool is widened and the query repeated.
+        """
+        pool_size = max(limit * MATCH_POOL_FACTOR, MIN_MATCH_POOL)
+        while True:
+            rows = self.db.execute(self._match_query(expertise, start_time, end_time, max_rate, pool_size)).all()
+            eligible = sorted(
+                (row for row in rows if not row.busy and row.remaining > 0),
+                key=lambda row: (-row.score, row.id)
+            )[:limit]
+            exhausted = len(rows) < pool_size
+            if exhausted or (len(eligible) == limit and eligible[-1].score >= rows[-1].bound):
+                break
+            pool_size *= MATCH_POOL_FACTOR
         
+        field_count = len(mentor_mapper.fields)
         return [
-            Mentor(
-                id=model.id,
-                user_id=model.user_id,
-                bio=model.bio,
-                expertise_areas=model.expertise_areas,
-                hourly_rate=model.hourly_rate,
-                max_sessions_per_day=model.max_sessions_per_day,
-                status=model.status,
-                rating=model.rating,
-                total_sessions=model.total_sessions,
-                created_at=model.created_at,
-                updated_at=model.updated_at
-            ) for model in mentor_models
+            MentorMatch(mentor_mapper.from_row(row[:field_count]), row.score, row.matched, row.remaining)
+            for row in eligible
         ]
     
+    def _match_query(self, expertise: List[str], start_time: datetime, end_time: datetime,
+                     max_rate: Optional[int], pool_size: int):
+        if max_rate is not None:
+            price_ceiling = literal(max_rate)
+        else:
+            others = aliased(MentorModel)
+            price_ceiling = (
+                select(func.max(others.hourly_rate)).where(others.status == MentorStatus.ACTIVE)
+                .scalar_subquery()
+            )
+        price_score = 1.0 - cast(MentorModel.hourly_rate, Float) / func.coalesce(func.nullif(price_ceiling, 0), 1)
+        rating_score = MentorModel.rating / float(MAX_RATING)
+        # Upper bound of the full score: the capacity part is at most 1
+        bound = MATCH_WEIGHT_RATING * rating_score + MATCH_WEIGHT_PRICE * price_score + MATCH_WEIGHT_CAPACITY
+        
+        pool = mentor_mapper.select().where(MentorModel.status == MentorStatus.ACTIVE)
+        if expertise:
+            # Only mentors with at least one requested tag; the share of tags they cover is scored
+            hits = (
+                select(MentorExpertiseModel.mentor_id,
+                       func.count(func.distinct(MentorExpertiseModel.expertise)).label('hits'))
+                .where(MentorExpertiseModel.expertise.in_(expertise))
+                .group_by(MentorExpertiseModel.mentor_id)
+                .subquery()
+            )
+            pool = pool.join(hits, hits.c.mentor_id == MentorModel.id)
+            matched = hits.c.hits
+            bound = bound + MATCH_WEIGHT_EXPERTISE * cast(matched, Float) / len(expertise)
+        else:
+            matched = literal(0)
+        if max_rate is not None:
+            pool = pool.where(MentorModel.hourly_rate <= max_rate)
+        bound = bound.label('bound')
+        pool = (
+            pool.add_columns(matched.label('matched'), bound)
+            .order_by(bound.desc(), MentorModel.id)
+            .limit(pool_size)
+            .subquery('pool')
+        )
+        
+        # A positive IN list keeps the probe on the (mentor_id, start_time) index
+        active_appointment = AppointmentModel.status.in_(
+            [status for status in AppointmentStatus if status not in INACTIVE_STATUSES]
+        )
+        # The day's sessions come from the per-day counter: one primary key lookup per mentor
+        booked = func.coalesce(
+            select(MentorDailyBookingModel.booked_count)
+            .where(MentorDailyBookingModel.mentor_id == pool.c.id,
+                   MentorDailyBookingModel.day == as_utc(start_time).date())
+            .scalar_subquery(),
+            0
+        )
+        busy = exists().where(
+            AppointmentModel.mentor_id == pool.c.id,
+            AppointmentModel.start_time < end_time,
+            AppointmentModel.end_time > start_time,
+            active_appointment
+        )
+        remaining = pool.c.max_sessions_per_day - booked
+        capacity_score = cast(remaining, Float) / func.nullif(pool.c.max_sessions_per_day, 0)
+        score = pool.c.bound - MATCH_WEIGHT_CAPACITY * (1.0 - func.coalesce(capacity_score, 0.0))
+        return select(
+            *(pool.c[name] for name in mentor_mapper.fields),
+            pool.c.matched,
+            pool.c.bound,
+            score.label('score'),
+            remaining.label('remaining'),
+            busy.label('busy')
+        ).order_by(pool.c.bound.desc(), pool.c.id)
+    
     def update(self, mentor: Mentor) -> Mentor:
-        mentor_model = self.db.query(MentorModel).filter(MentorModel.id == mentor.id).first()
-        if not mentor_model:
+        updated = mentor_mapper.update(self.db, MentorModel.id == mentor.id, {
+            'bio': mentor.bio,
+            'expertise_areas': mentor.expertise_areas,
+            'hourly_rate': mentor.hourly_rate,
+            'max_sessions_per_day': mentor.max_sessions_per_day,
+            'status': mentor.status,
+            'rating': mentor.rating,
+            'total_sessions': mentor.total_sessions,
+            'updated_at': mentor.updated_at
+        })
+        if not updated:
             raise ValueError("Mentor not found")
         
-        mentor_model.bio = mentor.bio
-        mentor_model.expertise_areas = mentor.expertise_areas
-        mentor_model.hourly_rate = mentor.hourly_rate
-        mentor_model.max_sessions_per_day = mentor.max_sessions_per_day
-        mentor_model.status = mentor.status
-        mentor_model.rating = mentor.rating
-        mentor_model.total_sessions = mentor.total_sessions
-        mentor_model.updated_at = mentor.updated_at
-        
-        self.db.commit()
-        self.db.refresh(mentor_model)
+        # Matching and expertise lookups read the join table, so resync it
+        self.db.execute(delete(MentorExpertiseModel).where(MentorExpertiseModel.mentor_id == mentor.id))
+        if mentor.expertise_areas:
+            self.db.execute(insert(MentorExpertiseModel), [
+                {'mentor_id': mentor.id, 'expertise': exp} for exp in mentor.expertise_areas
+            ])
         
-        return Mentor(
-            id=mentor_model.id,
-            user_id=mentor_model.user_id,
-            bio=mentor_model.bio,
-            expertise_areas=mentor_model.expertise_areas,
-            hourly_rate=mentor_model.hourly_rate,
-            max_sessions_per_day=mentor_model.max_sessions_per_day,
-            status=mentor_model.status,
-            rating=mentor_model.rating,
-            total_sessions=mentor_model.total_sessions,
-            created_at=mentor_model.created_at,
-            updated_at=mentor_model.updated_at
-        )
+        return updated
     
     def delete(self, mentor_id: int) -> bool:
-        mentor_model = self.db.query(MentorModel).filter(MentorModel.id == mentor_id).first()
-        if not mentor_model:
-            return False
-        
-        self.db.delete(mentor_model)
-        self.db.commit()
-        return True
+        self.db.execute(delete(MentorExpertiseModel).where(MentorExpertiseModel.mentor_id == mentor_id))
+        result = self.db.execute(delete(MentorModel).where(MentorModel.id == mentor_id))
+        return result.rowcount > 0
     
     def update_status(self, mentor_id: int, status: MentorStatus) -> bool:
-        mentor_model = self.db.query(MentorModel).filter(MentorModel.id == mentor_id).first()
-        if not mentor_model:
-            return False
-        
-        mentor_model.status = status
-        self.db.commit()
-        return True
+        result = self.db.execute(
+            update(MentorModel).where(MentorModel.id == mentor_id)
+            .values(status=status, updated_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
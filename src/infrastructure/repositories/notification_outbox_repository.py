@@ -0,0 +1,111 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import and_, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from domain.models.notification import Notification, NotificationStatus
+from domain.models.inotification_outbox import INotificationOutbox
+from infrastructure.models.notification_outbox_model import NotificationOutboxModel
+from infrastructure.databases.mssql import session
+from infrastructure.repositories.appointment_repository import IN_CLAUSE_CHUNK_SIZE
+from infrastructure.repositories.row_mapper import RowMapper
+
+# Rows per multi-row INSERT; nine parameters a row stays under SQL Server's 2100 limit
+MULTI_ROW_INSERT_SIZE = 200
+
+notification_mapper = RowMapper(NotificationOutboxModel, Notification)
+
+class NotificationOutboxRepository(INotificationOutbox):
+    def __init__(self):
+        self.db: Session = session
+
+    def enqueue_many(self, notifications: List[Notification]) -> int:
+        rows = {}
+        for notification in notifications:
+            rows.setdefault(notification.dedupe_key, notification_mapper.values(notification))
+        keys = list(rows)
+        for i in range(0, len(keys), IN_CLAUSE_CHUNK_SIZE):
+            for key in self.db.execute(
+                select(NotificationOutboxModel.dedupe_key)
+                .where(NotificationOutboxModel.dedupe_key.in_(keys[i:i + IN_CLAUSE_CHUNK_SIZE]))
+            ).scalars():
+                del rows[key]
+
+        new_rows = list(rows.values())
+        written = 0
+        for i in range(0, len(new_rows), MULTI_ROW_INSERT_SIZE):
+            chunk = new_rows[i:i + MULTI_ROW_INSERT_SIZE]
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(NotificationOutboxModel).values(chunk))
+                written += len(chunk)
+            except IntegrityError:
+                # A concurrent transaction wrote one of these keys: insert one by one, skipping it
+                for row in chunk:
+                    try:
+                        with self.db.begin_nested():
+                            self.db.execute(insert(NotificationOutboxModel).values(**row))
+                        written += 1
+                    except IntegrityError:
+                        pass
+        return written
+
+    def claim_batch(self, limit: int, now: datetime, lease_until: datetime) -> List[Notification]:
+        due = and_(NotificationOutboxModel.status == NotificationStatus.PENDING,
+                   NotificationOutboxModel.next_attempt_at <= now)
+        ids = self.db.execute(
+            select(NotificationOutboxModel.id).where(due)
+            .order_by(NotificationOutboxModel.next_attempt_at, NotificationOutboxModel.id).limit(limit)
+        ).scalars().all()
+        if not ids:
+            return []
+
+        # Re-checking the due condition means a row claimed meanwhile by another worker is skipped
+        criterion = and_(NotificationOutboxModel.id.in_(ids), due)
+        statement = (
+            update(NotificationOutboxModel).where(criterion)
+            .values(attempts=NotificationOutboxModel.attempts + 1, next_attempt_at=lease_until)
+            .execution_options(synchronize_session=False)
+        )
+        if self.db.get_bind(clause=statement).dialect.update_returning:
+            claimed = notification_mapper.all(self.db, statement.returning(*notification_mapper.columns))
+        else:
+            # Lock the rows first so that the ones read are exactly the ones updated
+            self.db.execute(update(NotificationOutboxModel).where(criterion)
+                            .values(attempts=NotificationOutboxModel.attempts)
+                            .execution_options(synchronize_session=False))
+            claimed = notification_mapper.all(self.db, notification_mapper.select().where(criterion))
+            self.db.execute(statement)
+            for notification in claimed:
+                notification.attempts += 1
+                notification.next_attempt_at = lease_until
+        return sorted(claimed, key=lambda notification: notification.id)
+
+    def mark_sent(self, notification_ids: List[int], sent_at: datetime) -> None:
+        for i in range(0, len(notification_ids), IN_CLAUSE_CHUNK_SIZE):
+            self.db.execute(
+                update(NotificationOutboxModel)
+                .where(NotificationOutboxModel.id.in_(notification_ids[i:i + IN_CLAUSE_CHUNK_SIZE]))
+                .values(status=NotificationStatus.SENT, sent_at=sent_at, last_error=None)
+                .execution_options(synchronize_session=False)
+            )
+
+    def mark_failed(self, notification_id: int, error: str, retry_at: Optional[datetime]) -> None:
+        values = {'last_error': error}
+        if retry_at is None:
+            values['status'] = NotificationStatus.FAILED
+        else:
+            values['next_attempt_at'] = retry_at
+        self.db.execute(
+            update(NotificationOutboxModel).where(NotificationOutboxModel.id == notification_id)
+            .values(**values).execution_options(synchronize_session=False)
+        )
+
+    def count_by_status(self) -> Dict[str, int]:
+        counts = {status.value: 0 for status in NotificationStatus}
+        for status, count in self.db.execute(
+            select(NotificationOutboxModel.status, func.count(NotificationOutboxModel.id))
+            .group_by(NotificationOutboxModel.status)
+        ):
+            counts[status.value] = count
+        return counts
@@ -0,0 +1,126 @@
+from datetime import datetime, timezone
+from typing import List
+from sqlalchemy import Float, case, cast, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from domain.constants import MIN_RATING, MAX_RATING
+from domain.models.feedback import FeedbackType, RatingSummary
+from domain.models.irating_aggregator import IRatingAggregator
+from infrastructure.models.feedback_model import FeedbackModel
+from infrastructure.models.mentor_model import MentorModel
+from infrastructure.models.rating_aggregate_model import RatingAggregateModel
+from infrastructure.databases.mssql import session
+from infrastructure.databases.routing import read_only
+
+STAR_COLUMNS = {stars: getattr(RatingAggregateModel, f'stars_{stars}') for stars in range(MIN_RATING, MAX_RATING + 1)}
+# Feedback of this type is what a mentor's public rating is made of
+MENTOR_FEEDBACK_TYPE = FeedbackType.STUDENT_TO_MENTOR
+
+def _mentor_average():
+    """Correlated subquery: the average rating of the mentor row being updated"""
+    return select(
+        cast(RatingAggregateModel.rating_sum, Float) / RatingAggregateModel.rating_count
+    ).where(
+        RatingAggregateModel.reviewed_id == MentorModel.user_id,
+        RatingAggregateModel.feedback_type == MENTOR_FEEDBACK_TYPE,
+        RatingAggregateModel.rating_count > 0
+    ).scalar_subquery()
+
+class RatingAggregator(IRatingAggregator):
+    """Keeps count, sum and a star histogram per reviewed user with in-place increments,
+    and copies the mentor average into mentors.rating, so no read ever scans feedbacks"""
+    def __init__(self):
+        self.db: Session = session
+    
+    def add_rating(self, reviewed_id: int, feedback_type: FeedbackType, rating: int) -> None:
+        self._apply(reviewed_id, feedback_type, rating, 1)
+    
+    def remove_rating(self, reviewed_id: int, feedback_type: FeedbackType, rating: int) -> None:
+        self._apply(reviewed_id, feedback_type, rating, -1)
+    
+    def _apply(self, reviewed_id: int, feedback_type: FeedbackType, rating: int, sign: int) -> None:
+        if rating not in STAR_COLUMNS:
+            raise ValueError(f"Rating must be between {MIN_RATING} and {MAX_RATING}")
+        star = STAR_COLUMNS[rating]
+        now = datetime.now(timezone.utc)
+        increment = (
+            update(RatingAggregateModel)
+            .where(RatingAggregateModel.reviewed_id == reviewed_id,
+                   RatingAggregateModel.feedback_type == feedback_type)
+            .values({
+                RatingAggregateModel.rating_count: RatingAggregateModel.rating_count + sign,
+                RatingAggregateModel.rating_sum: RatingAggregateModel.rating_sum + sign * rating,
+                star: star + sign,
+                RatingAggregateModel.updated_at: now
+            })
+            .execution_options(synchronize_session=False)
+        )
+        if self.db.execute(increment).rowcount == 0 and sign > 0:
+            # First rating for this user: create the row, unless a concurrent
+            # transaction just did, in which case increment theirs
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(insert(RatingAggregateModel).values({
+                        RatingAggregateModel.reviewed_id: reviewed_id,
+                        RatingAggregateModel.feedback_type: feedback_type,
+                        RatingAggregateModel.rating_count: 1,
+                        RatingAggregateModel.rating_sum: rating,
+                        **{column: int(stars == rating) for stars, column in STAR_COLUMNS.items()},
+                        RatingAggregateModel.updated_at: now
+                    }))
+            except IntegrityError:
+                self.db.execute(increment)
+        
+        if feedback_type == MENTOR_FEEDBACK_TYPE:
+            self.db.execute(
+                update(MentorModel).where(MentorModel.user_id == reviewed_id)
+                .values(rating=func.coalesce(_mentor_average(), 0.0), updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+    
+    def get_summary(self, reviewed_id: int, feedback_type: FeedbackType) -> RatingSummary:
+        summaries = [s for s in self.get_summaries(reviewed_id) if s.feedback_type == feedback_type]
+        return summaries[0] if summaries else RatingSummary(reviewed_id, feedback_type)
+    
+    @read_only
+    def get_summaries(self, reviewed_id: int) -> List[RatingSummary]:
+        rows = self.db.execute(
+            select(RatingAggregateModel.feedback_type, RatingAggregateModel.rating_count,
+                   RatingAggregateModel.rating_sum, *STAR_COLUMNS.values())
+            .where(RatingAggregateModel.reviewed_id == reviewed_id)
+        ).all()
+        return [
+            RatingSummary(reviewed_id, row[0], row[1], row[2], list(row[3:]))
+            for row in rows
+        ]
+    
+    def recompute_all(self) -> int:
+        """Rebuild every aggregate with one grouped pass over feedbacks, then every mentor rating"""
+        rows = self.db.execute(
+            select(
+                FeedbackModel.reviewed_id,
+                FeedbackModel.feedback_type,
+                func.count(FeedbackModel.id),
+                func.sum(FeedbackModel.rating),
+                *(func.sum(case((FeedbackModel.rating == stars, 1), else_=0)) for stars in STAR_COLUMNS)
+            ).group_by(FeedbackModel.reviewed_id, FeedbackModel.feedback_type)
+        ).all()
+        now = datetime.now(timezone.utc)
+        
+        self.db.execute(delete(RatingAggregateModel))
+        if rows:
+            self.db.execute(insert(RatingAggregateModel), [
+                {
+                    'reviewed_id': row[0],
+                    'feedback_type': row[1],
+                    'rating_count': row[2],
+                    'rating_sum': row[3] or 0,
+                    **{f'stars_{stars}': row[3 + i] or 0 for i, stars in enumerate(STAR_COLUMNS, 1)},
+                    'updated_at': now
+                } for row in rows
+            ])
+        self.db.execute(
+            update(MentorModel).values(rating=func.coalesce(_mentor_average(), 0.0), updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        return len(rows)
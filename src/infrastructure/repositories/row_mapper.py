@@ -0,0 +1,84 @@
+import inspect
+from operator import attrgetter
+from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+from sqlalchemy import insert, inspect as inspect_model, select, update
+from sqlalchemy.orm import Session
+
+T = TypeVar('T')
+
+class RowMapper(Generic[T]):
+    """Precompiled mapping from a table's columns to a domain class.
+
+    Columns are selected in the order of the domain constructor's parameters,
+    so each result row is passed positionally: no ORM instance, identity-map
+    entry or per-row keyword dict is created for read-only lists.
+    """
+    def __init__(self, model, domain_class: Type[T]):
+        fields = [name for name in inspect.signature(domain_class.__init__).parameters if name != 'self']
+        self.model = model
+        self.domain_class = domain_class
+        self.fields = tuple(fields)
+        self.columns = tuple(getattr(model, name) for name in fields)
+        self.primary_key = inspect_model(model).primary_key[0]
+        self._get_fields = attrgetter(*fields)
+
+    def select(self):
+        """SELECT of just the mapped columns"""
+        return select(*self.columns)
+
+    def from_row(self, row) -> T:
+        return self.domain_class(*row)
+
+    def from_model(self, model) -> T:
+        """Build a domain object from an ORM instance (write paths)"""
+        return self.domain_class(*self._get_fields(model))
+
+    def all(self, db: Session, statement) -> List[T]:
+        domain_class = self.domain_class
+        return [domain_class(*row) for row in db.execute(statement)]
+
+    def first(self, db: Session, statement) -> Optional[T]:
+        row = db.execute(statement.limit(1)).first()
+        return self.domain_class(*row) if row is not None else None
+
+    def values(self, obj: T) -> Dict[str, Any]:
+        """Column values of a domain object, without the primary key"""
+        return {
+            name: value for name, value in zip(self.fields, self._get_fields(obj))
+            if name != self.primary_key.key
+        }
+
+    def insert(self, db: Session, values: Dict[str, Any]) -> T:
+        """INSERT one row and map it back, via RETURNING/OUTPUT where the dialect has it"""
+        statement = insert(self.model).values(**values)
+        if db.get_bind(clause=statement).dialect.insert_returning:
+            return self.from_row(db.execute(statement.returning(*self.columns)).one())
+        primary_key = db.execute(statement).inserted_primary_key[0]
+        return self.first(db, self.select().where(self.primary_key == primary_key))
+
+    def insert_many(self, db: Session, rows: List[Dict[str, Any]]) -> List[T]:
+        """INSERT many rows in batched multi-VALUES statements and map them back.
+
+        The rows come back in no guaranteed order: asking for parameter order
+        makes some dialects (SQLite among them) fall back to one INSERT per row.
+        """
+        if not rows:
+            return []
+        statement = insert(self.model)
+        if db.get_bind(clause=statement).dialect.insert_executemany_returning:
+            result = db.execute(statement.returning(*self.columns), rows)
+            return [self.domain_class(*row) for row in result]
+        return [self.insert(db, values) for values in rows]
+
+    def update(self, db: Session, criterion, values: Dict[str, Any]) -> Optional[T]:
+        """UPDATE the row matching criterion and map it back; None if no row matched"""
+        statement = (
+            update(self.model).where(criterion).values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if db.get_bind(clause=statement).dialect.update_returning:
+            row = db.execute(statement.returning(*self.columns)).first()
+            return self.from_row(row) if row is not None else None
+        if db.execute(statement).rowcount == 0:
+            return None
+        return self.first(db, self.select().where(criterion))
@@ -1,5 +1,8 @@
+from typing import List
+from domain.models.user import UserRole
 from infrastructure.models.user_model import UserModel
+from infrastructure.databases.mssql import session
 
 class UserRepository:
-    def get_users_by_role(self, role):
-        return [user.to_dict() for user in UserModel.query.filter_by(role=role).all()]
\ No newline at end of file
+    def get_users_by_role(self, role: UserRole) -> List[UserModel]:
+        return session.query(UserModel).filter_by(role=role).order_by(UserModel.id).all()
@@ -1,96 +1,146 @@
-from typing import List, Optional
+from collections import Counter
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import and_, bindparam, func, insert, literal, or_, select, update
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import datetime, timezone
 from domain.models.wallet import Wallet, WalletTransaction, TransactionType
 from domain.models.iwallet_repository import IWalletRepository
 from infrastructure.models.wallet_model import WalletModel, WalletTransactionModel
 from infrastructure.databases.mssql import session
+from infrastructure.databases.routing import read_only
+from infrastructure.repositories.row_mapper import RowMapper
+
+# Transaction types counted in total_spent; all others count in total_earned
+SPENDING_TYPES = (TransactionType.SPENT, TransactionType.REFUNDED)
+# Rows fetched per round trip when streaming a ledger export
+EXPORT_BATCH_SIZE = 500
+# Rows per multi-row INSERT; six parameters a row stays under SQL Server's 2100 limit
+MULTI_ROW_INSERT_SIZE = 300
+# Keep IN lists well below SQL Server's 2100 parameter limit
+IN_CLAUSE_CHUNK_SIZE = 1000
+
+wallet_mapper = RowMapper(WalletModel, Wallet)
+transaction_mapper = RowMapper(WalletTransactionModel, WalletTransaction)
 
 class WalletRepository(IWalletRepository):
     def __init__(self):
         self.db: Session = session
     
     def create_wallet(self, wallet: Wallet) -> Wallet:
-        wallet_model = WalletModel(
-            user_id=wallet.user_id,
-            balance=wallet.balance,
-            created_at=wallet.created_at,
-            updated_at=wallet.updated_at
-        )
-        self.db.add(wallet_model)
-        self.db.commit()
-        self.db.refresh(wallet_model)
-        
-        return Wallet(
-            id=wallet_model.id,
-            user_id=wallet_model.user_id,
-            balance=wallet_model.balance,
-            created_at=wallet_model.created_at,
-            updated_at=wallet_model.updated_at
-        )
+        return wallet_mapper.insert(self.db, wallet_mapper.values(wallet))
     
     def get_wallet_by_user_id(self, user_id: int) -> Optional[Wallet]:
-        wallet_model = self.db.query(WalletModel).filter(WalletModel.user_id == user_id).first()
-        if not wallet_model:
-            return None
-        
-        return Wallet(
-            id=wallet_model.id,
-            user_id=wallet_model.user_id,
-            balance=wallet_model.balance,
-            created_at=wallet_model.created_at,
-            updated_at=wallet_model.updated_at
+        return wallet_mapper.first(
+            self.db, wallet_mapper.select().where(WalletModel.user_id == user_id).order_by(WalletModel.id)
         )
     
     def update_wallet_balance(self, wallet_id: int, new_balance: int) -> bool:
-        wallet_model = self.db.query(WalletModel).filter(WalletModel.id == wallet_id).first()
-        if not wallet_model:
+        result = self.db.execute(
+            update(WalletModel).where(WalletModel.id == wallet_id)
+            .values(balance=new_balance, updated_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+    
+    def apply_delta(self, user_id: int, amount: int, transaction_type: TransactionType,
+                    appointment_id: Optional[int] = None, description: str = "") -> bool:
+        """Add amount (negative to debit) to the user's balance and record the transaction.
+
+        The balance check happens inside the UPDATE itself, so concurrent debits can
+        never overdraw the wallet. Returns False if there is no wallet or not enough points.
+        """
+        wallet_id = (
+            select(func.min(WalletModel.id))
+            .where(WalletModel.user_id == user_id)
+            .scalar_subquery()
+        )
+        now = datetime.now(timezone.utc)
+        result = self.db.execute(
+            update(WalletModel)
+            .where(WalletModel.id == wallet_id, WalletModel.balance + amount >= 0)
+            .values(balance=WalletModel.balance + amount, updated_at=now,
+                    **self._total_increments(transaction_type, amount))
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
             return False
         
-        wallet_model.balance = new_balance
-        wallet_model.updated_at = datetime.now()
-        self.db.commit()
+        self.db.execute(
+            insert(WalletTransactionModel).from_select(
+                ['wallet_id', 'amount', 'transaction_type', 'description', 'appointment_id', 'created_at'],
+                select(
+                    WalletModel.id,
+                    literal(amount),
+                    literal(transaction_type, WalletTransactionModel.transaction_type.type),
+                    literal(description, WalletTransactionModel.description.type),
+                    literal(appointment_id, WalletTransactionModel.appointment_id.type),
+                    literal(now, WalletTransactionModel.created_at.type)
+                ).where(WalletModel.id == wallet_id)
+            )
+        )
         return True
     
-    def create_transaction(self, transaction: WalletTransaction) -> WalletTransaction:
-        transaction_model = WalletTransactionModel(
-            wallet_id=transaction.wallet_id,
-            amount=transaction.amount,
-            transaction_type=transaction.transaction_type,
-            description=transaction.description,
-            appointment_id=transaction.appointment_id,
-            created_at=transaction.created_at
-        )
-        self.db.add(transaction_model)
-        self.db.commit()
-        self.db.refresh(transaction_model)
+    def credit_many(self, credits: List[Tuple[int, int, Optional[int], str]],
+                    transaction_type: TransactionType) -> int:
+        """Add many (user_id, amount, appointment_id, description) credits at once.
+
+        Balances move with one executemany UPDATE over the users' wallets and the
+        ledger rows go in as multi-row INSERTs. Credits of users without a wallet
+        are skipped; returns the number of transactions recorded.
+        """
+        totals = Counter()
+        for user_id, amount, _, _ in credits:
+            totals[user_id] += amount
+        wallet_ids = {}
+        user_ids = list(totals)
+        for i in range(0, len(user_ids), IN_CLAUSE_CHUNK_SIZE):
+            wallet_ids.update(self.db.execute(
+                select(WalletModel.user_id, func.min(WalletModel.id))
+                .where(WalletModel.user_id.in_(user_ids[i:i + IN_CLAUSE_CHUNK_SIZE]))
+                .group_by(WalletModel.user_id)
+            ).all())
+        if not wallet_ids:
+            return 0
         
-        return WalletTransaction(
-            id=transaction_model.id,
-            wallet_id=transaction_model.wallet_id,
-            amount=transaction_model.amount,
-            transaction_type=transaction_model.transaction_type,
-            description=transaction_model.description,
-            appointment_id=transaction_model.appointment_id,
-            created_at=transaction_model.created_at
+        now = datetime.now(timezone.utc)
+        wallets = WalletModel.__table__
+        amount = bindparam('amount', type_=wallets.c.balance.type)
+        self.db.execute(
+            update(wallets).where(wallets.c.id == bindparam('wallet_id'))
+            .values(balance=wallets.c.balance + amount, updated_at=now,
+                    **self._total_increments(transaction_type, amount)),
+            [{'wallet_id': wallet_id, 'amount': totals[user_id]} for user_id, wallet_id in wallet_ids.items()]
         )
-    
-    def get_transactions_by_wallet_id(self, wallet_id: int) -> List[WalletTransaction]:
-        transaction_models = self.db.query(WalletTransactionModel).filter(
-            WalletTransactionModel.wallet_id == wallet_id
-        ).all()
         
-        return [
-            WalletTransaction(
-                id=model.id,
-                wallet_id=model.wallet_id,
-                amount=model.amount,
-                transaction_type=model.transaction_type,
-                description=model.description,
-                appointment_id=model.appointment_id,
-                created_at=model.created_at
-            ) for model in transaction_models
+        rows = [
+            {
+                'wallet_id': wallet_ids[user_id],
+                'amount': amount,
+                'transaction_type': transaction_type,
+                'description': description,
+                'appointment_id': appointment_id,
+                'created_at': now
+            } for user_id, amount, appointment_id, description in credits if user_id in wallet_ids
         ]
+        for i in range(0, len(rows), MULTI_ROW_INSERT_SIZE):
+            self.db.execute(insert(WalletTransactionModel).values(rows[i:i + MULTI_ROW_INSERT_SIZE]))
+        return len(rows)
+    
+    @staticmethod
+    def _total_increments(transaction_type: TransactionType, amount: int) -> dict:
+        """Running-total column updates for a balance change of this type"""
+        if transaction_type in SPENDING_TYPES:
+            # Spending is negative and refunds positive: both move total_spent by -amount
+            return {'total_spent': WalletModel.total_spent - amount}
+        return {'total_earned': WalletModel.total_earned + amount}
+    
+    def create_transaction(self, transaction: WalletTransaction) -> WalletTransaction:
+        return transaction_mapper.insert(self.db, transaction_mapper.values(transaction))
+    
+    @read_only
+    def get_transactions_by_wallet_id(self, wallet_id: int) -> List[WalletTransaction]:
+        query = transaction_mapper.select().where(WalletTransactionModel.wallet_id == wallet_id)
+        return transaction_mapper.all(self.db, query)
     
     def get_transactions_by_user_id(self, user_id: int) -> List[WalletTransaction]:
         # First get the wallet for the user
@@ -100,20 +150,72 @@ class WalletRepository(IWalletRepository):
         
         return self.get_transactions_by_wallet_id(wallet.id)
     
+    @read_only
     def get_transactions_by_type(self, wallet_id: int, transaction_type: TransactionType) -> List[WalletTransaction]:
-        transaction_models = self.db.query(WalletTransactionModel).filter(
+        query = transaction_mapper.select().where(
             WalletTransactionModel.wallet_id == wallet_id,
             WalletTransactionModel.transaction_type == transaction_type
-        ).all()
+        )
+        return transaction_mapper.all(self.db, query)
+    
+    @read_only
+    def get_transactions_page(self, user_id: int, limit: int,
+                              cursor: Optional[Tuple[datetime, int]] = None,
+                              transaction_type: Optional[TransactionType] = None,
+                              date_from: Optional[datetime] = None,
+                              date_to: Optional[datetime] = None) -> Tuple[List[WalletTransaction], Optional[Tuple[datetime, int]]]:
+        """One page of a user's ledger, newest first, keyset-paginated on (created_at, id)"""
+        query = self._transactions_query(user_id, transaction_type, date_from, date_to)
+        if cursor is not None:
+            cursor_created, cursor_id = cursor
+            query = query.where(or_(
+                WalletTransactionModel.created_at < cursor_created,
+                and_(WalletTransactionModel.created_at == cursor_created, WalletTransactionModel.id < cursor_id)
+            ))
+        transactions = transaction_mapper.all(self.db, query.limit(limit + 1))
         
-        return [
-            WalletTransaction(
-                id=model.id,
-                wallet_id=model.wallet_id,
-                amount=model.amount,
-                transaction_type=model.transaction_type,
-                description=model.description,
-                appointment_id=model.appointment_id,
-                created_at=model.created_at
-            ) for model in transaction_models
-        ]
+        next_cursor = None
+        if len(transactions) > limit:
+            transactions = transactions[:limit]
+            next_cursor = (transactions[-1].created_at, transactions[-1].id)
+        
+        return transactions, next_cursor
+    
+    @read_only
+    def iter_transactions(self, user_id: int,
+                          transaction_type: Optional[TransactionType] = None,
+                          date_from: Optional[datetime] = None,
+                          date_to: Optional[datetime] = None) -> Iterator[WalletTransaction]:
+        """Stream a user's whole ledger from a server-side cursor, newest first.
+
+        Uses its own connection so the export can outlive the request's session,
+        and holds at most one batch of rows in memory.
+        """
+        query = self._transactions_query(user_id, transaction_type, date_from, date_to)
+        # Pick the engine now: the generator body runs after the request's routing context is gone
+        return self._stream_transactions(self.db.get_bind(clause=query), query)
+    
+    @staticmethod
+    def _stream_transactions(bind, query) -> Iterator[WalletTransaction]:
+        with bind.connect() as connection:
+            result = connection.execution_options(
+                stream_results=True, yield_per=EXPORT_BATCH_SIZE
+            ).execute(query)
+            for row in result:
+                yield transaction_mapper.from_row(row)
+    
+    @staticmethod
+    def _transactions_query(user_id: int, transaction_type: Optional[TransactionType],
+                            date_from: Optional[datetime], date_to: Optional[datetime]):
+        query = (
+            transaction_mapper.select()
+            .join(WalletModel, WalletModel.id == WalletTransactionModel.wallet_id)
+            .where(WalletModel.user_id == user_id)
+        )
+        if transaction_type is not None:
+            query = query.where(WalletTransactionModel.transaction_type == transaction_type)
+        if date_from is not None:
+            query = query.where(WalletTransactionModel.created_at >= date_from)
+        if date_to is not None:
+            query = query.where(WalletTransactionModel.created_at < date_to)
+        return query.order_by(WalletTransactionModel.created_at.desc(), WalletTransactionModel.id.desc())
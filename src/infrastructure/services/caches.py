@@ -0,0 +1,27 @@
+import threading
+from typing import Any, Dict
+from config import Config
+from domain.models.icache import ICache
+from infrastructure.services.memory_cache import MemoryCache
+
+_caches: Dict[str, ICache] = {}
+_lock = threading.Lock()
+
+def get_cache(name: str, default_ttl: float = None, max_entries: int = None) -> ICache:
+    """The process-wide cache called name: shared through CACHE_URL when set, in memory otherwise"""
+    with _lock:
+        cache = _caches.get(name)
+        if cache is None:
+            ttl = Config.CACHE_DEFAULT_TTL if default_ttl is None else default_ttl
+            if Config.CACHE_URL:
+                from infrastructure.services.redis_cache import RedisCache
+                cache = RedisCache(Config.CACHE_URL, name, ttl)
+            else:
+                cache = MemoryCache(Config.CACHE_MAX_ENTRIES if max_entries is None else max_entries, ttl)
+            _caches[name] = cache
+        return cache
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    with _lock:
+        caches = dict(_caches)
+    return {name: cache.stats() for name, cache in caches.items()}
@@ -0,0 +1,113 @@
+import itertools
+import json
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from domain.models.ievent_bus import IEventBus, ISubscription
+from config import Config
+from domain.constants import SSE_QUEUE_SIZE
+
+# Sent in place of events a slow subscriber missed: the client should refetch
+RESYNC_FRAME = 'event: resync\ndata: {}\n\n'
+
+class Subscription(ISubscription):
+    """A subscriber's bounded queue of pending SSE frames"""
+    __slots__ = ('topics', '_frames', '_ready', '_lock', '_overflowed')
+
+    def __init__(self, topics: Tuple[str, ...], max_queue: int):
+        self.topics = topics
+        self._frames: deque = deque(maxlen=max_queue)
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._overflowed = False
+
+    def push(self, frame: str) -> None:
+        with self._lock:
+            if len(self._frames) == self._frames.maxlen:
+                self._overflowed = True
+            self._frames.append(frame)
+        self._ready.set()
+
+    def wait(self, timeout: float) -> List[str]:
+        self._ready.wait(timeout)
+        with self._lock:
+            self._ready.clear()
+            frames = list(self._frames)
+            self._frames.clear()
+            if self._overflowed:
+                self._overflowed = False
+                frames.insert(0, RESYNC_FRAME)
+        return frames
+
+class EventBus(IEventBus):
+    """In-process publish/subscribe of server-sent events by topic.
+
+    Each event is serialized once, then appended to the queue of every
+    subscriber of its topics. Subscribers only see events published in this
+    process. Under a threaded WSGI server every open stream also holds a worker
+    thread, which is why max_subscriptions has to stay below the thread count;
+    under serve_gevent.py a stream holds a greenlet instead.
+    """
+    def __init__(self, max_queue: int = SSE_QUEUE_SIZE, max_subscriptions: int = 8):
+        self.max_queue = max_queue
+        self.max_subscriptions = max_subscriptions
+        self._lock = threading.Lock()
+        self._by_topic: Dict[str, Set[Subscription]] = {}
+        self._count = 0
+        self._event_ids = itertools.count(1)
+        self._published = 0
+
+    def publish(self, topics: Iterable[str], event_type: str, data: Dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = set()
+            for topic in topics:
+                subscribers.update(self._by_topic.get(topic, ()))
+            if not subscribers:
+                return
+            event_id = next(self._event_ids)
+            self._published += 1
+        frame = f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+        for subscription in subscribers:
+            subscription.push(frame)
+
+    def has_subscribers(self, topic: str) -> bool:
+        return topic in self._by_topic
+
+    def subscribe(self, topics: Iterable[str]) -> Optional[Subscription]:
+        """Subscribe to topics; None when the bus already holds max_subscriptions"""
+        subscription = Subscription(tuple(dict.fromkeys(topics)), self.max_queue)
+        with self._lock:
+            if self._count >= self.max_subscriptions:
+                return None
+            self._count += 1
+            for topic in subscription.topics:
+                self._by_topic.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            removed = False
+            for topic in subscription.topics:
+                subscribers = self._by_topic.get(topic)
+                if subscribers and subscription in subscribers:
+                    subscribers.discard(subscription)
+                    removed = True
+                    if not subscribers:
+                        del self._by_topic[topic]
+            if removed:
+                self._count -= 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'subscriptions': self._count, 'topics': len(self._by_topic), 'published': self._published}
+
+_event_bus: Optional[EventBus] = None
+_lock = threading.Lock()
+
+def get_event_bus() -> EventBus:
+    """The process-wide event bus"""
+    global _event_bus
+    with _lock:
+        if _event_bus is None:
+            _event_bus = EventBus(max_subscriptions=Config.SSE_MAX_STREAMS)
+        return _event_bus
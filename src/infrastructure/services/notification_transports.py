@@ -0,0 +1,46 @@
+import json
+import sys
+import threading
+from typing import Dict, List, Optional, TextIO
+from config import Config
+from domain.models.inotification_transport import INotificationTransport
+from domain.models.notification import Notification
+
+class LogTransport(INotificationTransport):
+    """Writes each notification as one JSON line to a file, or to stdout when no path is given.
+
+    Meant for development and tests; a real channel (email, push) implements the same interface.
+    """
+    def __init__(self, path: Optional[str] = None, stream: Optional[TextIO] = None):
+        self.path = path
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def send_batch(self, notifications: List[Notification]) -> Dict[int, str]:
+        lines = ''.join(
+            json.dumps({
+                'id': notification.id,
+                'event_type': notification.event_type,
+                'dedupe_key': notification.dedupe_key,
+                'attempt': notification.attempts,
+                'payload': notification.payload
+            }, default=str) + '\n'
+            for notification in notifications
+        )
+        with self._lock:
+            if self.path:
+                with open(self.path, 'a', encoding='utf-8') as file:
+                    file.write(lines)
+            else:
+                stream = self.stream or sys.stdout
+                stream.write(lines)
+                stream.flush()
+        return {}
+
+def get_transport() -> INotificationTransport:
+    """The transport configured by NOTIFICATION_TRANSPORT: 'stdout', or 'file' writing to NOTIFICATION_FILE"""
+    if Config.NOTIFICATION_TRANSPORT == 'file':
+        return LogTransport(Config.NOTIFICATION_FILE)
+    if Config.NOTIFICATION_TRANSPORT == 'stdout':
+        return LogTransport()
+    raise ValueError(f"Unknown NOTIFICATION_TRANSPORT: {Config.NOTIFICATION_TRANSPORT}")
@@ -0,0 +1,81 @@
+import pickle
+import threading
+from typing import Any, Callable, Dict, Optional, TypeVar
+from domain.models.icache import ICache
+
+try:
+    import redis
+except ImportError:  # optional dependency, only needed for a shared cache
+    redis = None
+
+T = TypeVar('T')
+
+class RedisCache(ICache):
+    """Cache shared by all workers, stored in Redis under one namespace.
+
+    clear() bumps a generation counter that is part of every key, so a whole
+    namespace is invalidated with one INCR and old entries simply expire.
+    """
+    def __init__(self, url: str, namespace: str, default_ttl: float = 60):
+        if redis is None:
+            raise RuntimeError("CACHE_URL is set but the 'redis' package is not installed")
+        self.client = redis.Redis.from_url(url)
+        self.namespace = namespace
+        self.default_ttl = default_ttl
+        self._generation_key = f'{namespace}:generation'
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key: str, generation: int) -> str:
+        return f'{self.namespace}:{generation}:{key}'
+
+    def _generation(self) -> int:
+        return int(self.client.get(self._generation_key) or 0)
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        payload = self.client.get(self._key(key, self._generation()))
+        self._count(payload is not None)
+        return pickle.loads(payload) if payload is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._store(key, value, ttl, self._generation())
+
+    def _store(self, key: str, value: Any, ttl: Optional[float], generation: int) -> None:
+        seconds = max(1, int(self.default_ttl if ttl is None else ttl))
+        self.client.set(self._key(key, generation), pickle.dumps(value), ex=seconds)
+
+    def get_or_set(self, key: str, loader: Callable[[], T], ttl: Optional[float] = None) -> T:
+        generation = self._generation()
+        payload = self.client.get(self._key(key, generation))
+        self._count(payload is not None)
+        if payload is not None:
+            return pickle.loads(payload)
+        value = loader()
+        # Stored under the generation read before loading: after a clear() nobody reads it
+        self._store(key, value, ttl, generation)
+        return value
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self._key(key, self._generation()))
+
+    def clear(self) -> None:
+        self.client.incr(self._generation_key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': 'redis',
+                'generation': self._generation(),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
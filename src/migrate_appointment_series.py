@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Migration script to add recurring appointment series: the appointment_series
+table and the appointments.series_id column with its index
+"""
+
+from sqlalchemy import create_engine, inspect, text
+from config import Config
+import infrastructure.databases  # noqa: F401  (registers all models)
+from infrastructure.models.appointment_model import AppointmentModel
+from infrastructure.models.appointment_series_model import AppointmentSeriesModel
+
+SERIES_INDEX = 'ix_appointments_series_id'
+
+def migrate_appointment_series():
+    """Create the series table, then add and index appointments.series_id if missing"""
+
+    try:
+        engine = create_engine(Config.DATABASE_URI)
+        print(f"Connecting to: {Config.DATABASE_URI}")
+
+        AppointmentSeriesModel.__table__.create(engine, checkfirst=True)
+
+        with engine.begin() as connection:
+            inspector = inspect(connection)
+            columns = {column['name'] for column in inspector.get_columns('appointments')}
+            if 'series_id' not in columns:
+                print("Adding appointments.series_id...")
+                # Nullable, so existing rows need no backfill
+                connection.execute(text(
+                    "ALTER TABLE appointments ADD series_id INTEGER NULL REFERENCES appointment_series (id)"
+                ))
+
+            indexes = {index['name'] for index in inspector.get_indexes('appointments')}
+            if SERIES_INDEX not in indexes:
+                print(f"Creating {SERIES_INDEX}...")
+                next(index for index in AppointmentModel.__table__.indexes if index.name == SERIES_INDEX).create(connection)
+
+        print("Migration completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    migrate_appointment_series()
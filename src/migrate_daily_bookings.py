@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Migration script to create mentor_daily_bookings and backfill it from the
+active appointments with one grouped aggregate query
+"""
+
+from sqlalchemy import create_engine
+from config import Config
+import infrastructure.databases  # noqa: F401  (registers all models)
+from infrastructure.databases.mssql import session
+from infrastructure.databases.unit_of_work import UnitOfWork
+from infrastructure.models.mentor_daily_booking_model import MentorDailyBookingModel
+from infrastructure.repositories.booking_counter import BookingCounter
+
+def migrate_daily_bookings():
+    """Create the counter table if missing, then recompute every mentor's per-day count"""
+
+    try:
+        engine = create_engine(Config.DATABASE_URI)
+        print(f"Connecting to: {Config.DATABASE_URI}")
+
+        MentorDailyBookingModel.__table__.create(engine, checkfirst=True)
+        counters = UnitOfWork().run(BookingCounter().recompute_all)
+
+        print(f"Backfilled {counters} mentor-day counters")
+        print("Migration completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        return False
+    finally:
+        session.remove()
+
+if __name__ == "__main__":
+    migrate_daily_bookings()
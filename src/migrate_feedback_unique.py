@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Migration script to allow one feedback per reviewer per appointment: removes the
+duplicates an unlocked check let through (keeping each reviewer's first), adds the
+unique (appointment_id, reviewer_id) index and rebuilds the rating aggregates
+"""
+
+from sqlalchemy import create_engine, delete, func, inspect, select, text
+from config import Config
+import infrastructure.databases  # noqa: F401  (registers all models)
+from infrastructure.databases.mssql import session
+from infrastructure.databases.unit_of_work import UnitOfWork
+from infrastructure.models.feedback_model import FeedbackModel
+from infrastructure.repositories.rating_aggregator import RatingAggregator
+
+CONSTRAINT_NAME = 'uq_feedbacks_appointment_reviewer'
+# Covered by the leading column of the unique index
+REPLACED_INDEX = 'ix_feedbacks_appointment_id'
+
+def migrate_feedback_unique():
+    """Deduplicate feedbacks, then add the unique index if missing"""
+
+    try:
+        engine = create_engine(Config.DATABASE_URI)
+        print(f"Connecting to: {Config.DATABASE_URI}")
+
+        with engine.begin() as connection:
+            inspector = inspect(connection)
+            existing = {index['name'] for index in inspector.get_indexes('feedbacks')}
+            existing |= {constraint['name'] for constraint in inspector.get_unique_constraints('feedbacks')}
+            if CONSTRAINT_NAME in existing:
+                print(f"{CONSTRAINT_NAME} already exists. No migration needed.")
+                return True
+
+            first_ids = (
+                select(func.min(FeedbackModel.id))
+                .group_by(FeedbackModel.appointment_id, FeedbackModel.reviewer_id)
+            )
+            removed = connection.execute(
+                delete(FeedbackModel.__table__).where(FeedbackModel.id.not_in(first_ids))
+            ).rowcount
+            print(f"Removed {removed} duplicate feedbacks")
+
+            print(f"Adding {CONSTRAINT_NAME}...")
+            connection.execute(text(
+                f"CREATE UNIQUE INDEX {CONSTRAINT_NAME} ON feedbacks (appointment_id, reviewer_id)"
+            ))
+            if REPLACED_INDEX in existing:
+                print(f"Dropping {REPLACED_INDEX}...")
+                connection.execute(text(f"DROP INDEX {REPLACED_INDEX} ON feedbacks"
+                                        if connection.dialect.name == 'mssql' else f"DROP INDEX {REPLACED_INDEX}"))
+
+        if removed:
+            aggregates = UnitOfWork().run(RatingAggregator().recompute_all)
+            print(f"Rebuilt {aggregates} rating aggregates")
+        print("Migration completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        return False
+    finally:
+        session.remove()
+
+if __name__ == "__main__":
+    migrate_feedback_unique()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Migration script to create the indexes declared on the models that an existing
+database is missing, building them online where the dialect allows, and to
+print the query plans of the hot query paths before and after
+"""
+
+import argparse
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateIndex
+from config import Config
+import infrastructure.databases  # noqa: F401  (registers all models)
+from infrastructure.databases.base import Base
+from infrastructure.models.appointment_model import AppointmentModel
+from infrastructure.models.feedback_model import FeedbackModel
+from infrastructure.models.mentor_expertise_model import MentorExpertiseModel
+from infrastructure.models.mentor_model import MentorModel
+from infrastructure.models.wallet_model import WalletModel, WalletTransactionModel
+from infrastructure.repositories.appointment_repository import INACTIVE_STATUSES
+
+def hot_queries():
+    """The lookups the indexes are meant for, with representative parameters"""
+    start = datetime(2026, 1, 1, 9)
+    end = start + timedelta(hours=1)
+    return {
+        'appointment conflict check': select(AppointmentModel.start_time, AppointmentModel.end_time).where(
+            AppointmentModel.mentor_id == 1,
+            AppointmentModel.start_time < end,
+            AppointmentModel.end_time > start,
+            AppointmentModel.status.notin_(INACTIVE_STATUSES)
+        ),
+        'mentor appointment page': select(AppointmentModel.id).where(AppointmentModel.mentor_id == 1)
+            .order_by(AppointmentModel.start_time.desc(), AppointmentModel.id.desc()).limit(21),
+        'student appointment page': select(AppointmentModel.id).where(AppointmentModel.student_id == 1)
+            .order_by(AppointmentModel.start_time.desc(), AppointmentModel.id.desc()).limit(21),
+        'wallet by user': select(WalletModel.id).where(WalletModel.user_id == 1).order_by(WalletModel.id).limit(1),
+        'ledger page': select(WalletTransactionModel.id)
+            .join(WalletModel, WalletModel.id == WalletTransactionModel.wallet_id)
+            .where(WalletModel.user_id == 1)
+            .order_by(WalletTransactionModel.created_at.desc(), WalletTransactionModel.id.desc()).limit(21),
+        'scheduler sync': select(AppointmentModel.id).where(
+            AppointmentModel.updated_at > start, AppointmentModel.start_time < end
+        ),
+        'mentor by user': select(MentorModel.id).where(MentorModel.user_id == 1),
+        'mentors by expertise': select(MentorModel.id)
+            .join(MentorExpertiseModel, MentorExpertiseModel.mentor_id == MentorModel.id)
+            .where(MentorExpertiseModel.expertise == 'Python'),
+        'feedback for user': select(FeedbackModel.rating).where(FeedbackModel.reviewed_id == 1),
+    }
+
+def explain(connection, statement):
+    """Query plan lines for a statement on the connection's dialect"""
+    dialect = connection.dialect.name
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={'literal_binds': True}))
+    if dialect == 'sqlite':
+        return [row[-1] for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + sql)]
+    if dialect == 'mssql':
+        connection.exec_driver_sql('SET SHOWPLAN_TEXT ON')
+        try:
+            result = connection.exec_driver_sql(sql)
+            lines = []
+            while True:
+                lines.extend(row[0].strip() for row in result.fetchall())
+                if not result.cursor.nextset():
+                    break
+            return lines
+        finally:
+            connection.exec_driver_sql('SET SHOWPLAN_TEXT OFF')
+    return [' | '.join(str(value) for value in row) for row in connection.exec_driver_sql('EXPLAIN ' + sql)]
+
+def print_plans(engine, label):
+    print(f"\n=== Query plans {label} ===")
+    with engine.connect() as connection:
+        for name, statement in hot_queries().items():
+            print(f"-- {name}")
+            for line in explain(connection, statement):
+                print(f"   {line}")
+
+def missing_indexes(engine):
+    """Indexes declared on the models whose name does not exist in the database yet"""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        missing.extend(index for index in sorted(table.indexes, key=lambda i: i.name) if index.name not in existing)
+    return missing
+
+def create_index_online(engine, index):
+    """CREATE INDEX without blocking writers where the dialect supports it"""
+    sql = str(CreateIndex(index).compile(dialect=engine.dialect))
+    dialect = engine.dialect.name
+    if dialect == 'postgresql':
+        # CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            connection.exec_driver_sql(sql.replace('CREATE INDEX', 'CREATE INDEX CONCURRENTLY', 1))
+        return 'online'
+    if dialect == 'mssql':
+        try:
+            with engine.begin() as connection:
+                connection.exec_driver_sql(sql + ' WITH (ONLINE = ON)')
+            return 'online'
+        except DBAPIError:
+            # Online index operations need Enterprise/Developer edition or Azure SQL
+            pass
+    elif dialect == 'mysql':
+        with engine.begin() as connection:
+            connection.exec_driver_sql(sql + ' ALGORITHM=INPLACE LOCK=NONE')
+        return 'online'
+    with engine.begin() as connection:
+        connection.exec_driver_sql(sql)
+    return 'offline'
+
+def migrate_indexes(dry_run=False, show_plans=True):
+    """Create the missing model indexes and report query plans before and after"""
+
+    try:
+        engine = create_engine(Config.DATABASE_URI)
+        print(f"Connecting to: {Config.DATABASE_URI}")
+
+        missing = missing_indexes(engine)
+        if not missing:
+            print("All model indexes already exist")
+            return True
+
+        if show_plans:
+            print_plans(engine, 'before')
+
+        print()
+        for index in missing:
+            columns = ', '.join(column.name for column in index.columns)
+            if dry_run:
+                print(f"Would create {index.name} ON {index.table.name} ({columns})")
+                continue
+            mode = create_index_online(engine, index)
+            print(f"Created {index.name} ON {index.table.name} ({columns}) [{mode}]")
+
+        if dry_run:
+            return True
+
+        # Refresh optimizer statistics so the new indexes are considered
+        if engine.dialect.name in ('sqlite', 'postgresql'):
+            with engine.begin() as connection:
+                connection.execute(text('ANALYZE'))
+
+        if show_plans:
+            print_plans(engine, 'after')
+
+        print("\nMigration completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--dry-run', action='store_true', help='only list the indexes that would be created')
+    parser.add_argument('--no-plans', action='store_true', help='skip the before/after query plans')
+    args = parser.parse_args()
+    migrate_indexes(dry_run=args.dry_run, show_plans=not args.no_plans)
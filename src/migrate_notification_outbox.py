@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the notification_outbox table that bookings write
+notification intents to and the dispatcher drains
+"""
+
+from sqlalchemy import create_engine
+from config import Config
+import infrastructure.databases  # noqa: F401  (registers all models)
+from infrastructure.models.notification_outbox_model import NotificationOutboxModel
+
+def migrate_notification_outbox():
+    """Create the outbox table with its claim index if missing"""
+
+    try:
+        engine = create_engine(Config.DATABASE_URI)
+        print(f"Connecting to: {Config.DATABASE_URI}")
+
+        NotificationOutboxModel.__table__.create(engine, checkfirst=True)
+
+        print("Migration completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    migrate_notification_outbox()
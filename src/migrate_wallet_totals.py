@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Migration script to add wallets.total_spent / wallets.total_earned and backfill
+them from wallet_transactions with one grouped aggregate query. Safe to run while
+the API is writing: wallet updates wait for the backfill to commit
+"""
+
+from sqlalchemy import case, create_engine, func, inspect, select, text, update, bindparam
+from config import Config
+import infrastructure.databases  # noqa: F401  (registers all models)
+from infrastructure.models.wallet_model import WalletModel, WalletTransactionModel
+from infrastructure.repositories.wallet_repository import SPENDING_TYPES
+
+BATCH_SIZE = 1000
+
+def migrate_wallet_totals():
+    """Add the running-total columns if missing, then recompute them for every wallet"""
+
+    try:
+        engine = create_engine(Config.DATABASE_URI)
+        print(f"Connecting to: {Config.DATABASE_URI}")
+
+        with engine.begin() as connection:
+            columns = {column['name'] for column in inspect(connection).get_columns('wallets')}
+            for column in ('total_spent', 'total_earned'):
+                if column not in columns:
+                    print(f"Adding wallets.{column}...")
+                    connection.execute(text(f"ALTER TABLE wallets ADD {column} INTEGER NOT NULL DEFAULT 0"))
+
+            # Zero every wallet before reading the ledger. This takes the write lock on every
+            # wallet row (the database write lock on SQLite) for the rest of the transaction.
+            # apply_delta updates the wallet row before inserting its ledger row, so a delta in
+            # flight commits before the read below and later ones wait for the backfill to commit
+            connection.execute(update(WalletModel.__table__).values(total_spent=0, total_earned=0))
+
+            # One pass over the ledger, grouped per wallet
+            spent = func.sum(case(
+                (WalletTransactionModel.transaction_type.in_(SPENDING_TYPES), -WalletTransactionModel.amount),
+                else_=0
+            ))
+            earned = func.sum(case(
+                (WalletTransactionModel.transaction_type.in_(SPENDING_TYPES), 0),
+                else_=WalletTransactionModel.amount
+            ))
+            totals = connection.execute(
+                select(WalletTransactionModel.wallet_id, spent.label('spent'), earned.label('earned'))
+                .group_by(WalletTransactionModel.wallet_id)
+            ).all()
+
+            statement = (
+                update(WalletModel.__table__)
+                .where(WalletModel.id == bindparam('wallet_id'))
+                .values(total_spent=bindparam('spent'), total_earned=bindparam('earned'))
+            )
+            rows = [
+                {'wallet_id': row.wallet_id, 'spent': row.spent or 0, 'earned': row.earned or 0}
+                for row in totals
+            ]
+            for i in range(0, len(rows), BATCH_SIZE):
+                connection.execute(statement, rows[i:i + BATCH_SIZE])
+
+        print(f"Backfilled totals for {len(rows)} wallets with transactions")
+        print("Migration completed successfully!")
+        return True
+
+    except Exception as e:
+        print(f"Migration failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    migrate_wallet_totals()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Maintenance script to rebuild rating_aggregates and mentors.rating from the
+feedbacks table, reporting mentors whose stored rating had drifted
+"""
+
+from sqlalchemy import select
+import infrastructure.databases  # noqa: F401  (registers all models)
+from infrastructure.databases.mssql import session
+from infrastructure.databases.unit_of_work import UnitOfWork
+from infrastructure.models.mentor_model import MentorModel
+from infrastructure.repositories.rating_aggregator import RatingAggregator
+
+# Ratings closer than this are considered equal
+TOLERANCE = 1e-6
+
+def recompute_ratings():
+    """Recompute every aggregate in one transaction and print the mentors that changed"""
+
+    try:
+        mentor_ratings = select(MentorModel.id, MentorModel.rating)
+        before = dict(session.execute(mentor_ratings).all())
+
+        groups = UnitOfWork().run(RatingAggregator().recompute_all)
+
+        after = dict(session.execute(mentor_ratings).all())
+        drifted = [
+            (mentor_id, before.get(mentor_id), rating) for mentor_id, rating in after.items()
+            if abs((before.get(mentor_id) or 0.0) - (rating or 0.0)) > TOLERANCE
+        ]
+        for mentor_id, old, new in drifted:
+            print(f"  mentor {mentor_id}: {old} -> {new}")
+
+        print(f"Rebuilt {groups} rating aggregates; {len(drifted)} mentor ratings corrected")
+        return True
+
+    except Exception as e:
+        print(f"Recompute failed: {e}")
+        return False
+    finally:
+        session.remove()
+
+if __name__ == "__main__":
+    recompute_ratings()
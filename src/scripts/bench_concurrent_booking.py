@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark: fire N parallel bookings at the same mentor slot and
+check that exactly one of them succeeds, then N parallel bookings of distinct
+slots on one day and check that exactly max_sessions_per_day of them succeed.
+
+Runs against a throwaway SQLite file unless DATABASE_URI is set:
+    python scripts/bench_concurrent_booking.py [--bookings 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if 'DATABASE_URI' not in os.environ:
+    os.environ['DATABASE_URI'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench_booking.db')
+
+from infrastructure.databases import init_db  # noqa: E402
+from infrastructure.databases.mssql import session  # noqa: E402
+from infrastructure.databases.unit_of_work import UnitOfWork  # noqa: E402
+from infrastructure.models.appointment_model import AppointmentModel  # noqa: E402
+from infrastructure.models.mentor_model import MentorModel  # noqa: E402
+from infrastructure.models.user_model import UserModel  # noqa: E402
+from infrastructure.models.wallet_model import WalletModel  # noqa: E402
+from infrastructure.repositories.appointment_repository import AppointmentRepository  # noqa: E402
+from infrastructure.repositories.mentor_repository import MentorRepository  # noqa: E402
+from infrastructure.repositories.wallet_repository import WalletRepository  # noqa: E402
+from infrastructure.repositories.booking_counter import BookingCounter  # noqa: E402
+from services.appointment_service import AppointmentService, booking_day  # noqa: E402
+from domain.models.appointment import AppointmentStatus  # noqa: E402
+from domain.models.mentor import MentorStatus  # noqa: E402
+from domain.models.user import UserRole  # noqa: E402
+
+def seed(bookings: int) -> int:
+    """Create one mentor and one funded student per booking; return the mentor id"""
+    now = datetime.now(timezone.utc)
+    mentor_user = UserModel(username=f'bench_mentor_{now.timestamp()}', email=f'mentor_{now.timestamp()}@bench',
+                            password='x', full_name='Bench Mentor', role=UserRole.MENTOR,
+                            created_at=now, updated_at=now)
+    session.add(mentor_user)
+    session.flush()
+    mentor = MentorModel(user_id=mentor_user.id, bio='bench', expertise_areas=[], hourly_rate=10,
+                         status=MentorStatus.ACTIVE, created_at=now, updated_at=now)
+    session.add(mentor)
+    for i in range(bookings):
+        student = UserModel(username=f'bench_student_{i}_{now.timestamp()}', email=f's{i}_{now.timestamp()}@bench',
+                            password='x', full_name=f'Bench Student {i}', role=UserRole.STUDENT,
+                            created_at=now, updated_at=now)
+        session.add(student)
+        session.flush()
+        session.add(WalletModel(user_id=student.id, balance=1000, created_at=now, updated_at=now))
+    session.commit()
+    mentor_id = mentor.id
+    session.remove()
+    return mentor_id
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--bookings', type=int, default=20)
+    args = parser.parse_args()
+
+    init_db(None)
+    mentor_id = seed(args.bookings)
+    student_ids = [
+        row.user_id for row in session.query(WalletModel.user_id).order_by(WalletModel.id.desc()).limit(args.bookings)
+    ]
+    session.remove()
+
+    service = AppointmentService(AppointmentRepository(), MentorRepository(), WalletRepository(), UnitOfWork(),
+                                 BookingCounter())
+    start_time = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+    # Everyone wants the same slot
+    successes, elapsed = run_bookings(service, mentor_id, student_ids, lambda i: start_time)
+    booked = session.query(AppointmentModel).filter(
+        AppointmentModel.mentor_id == mentor_id,
+        AppointmentModel.status != AppointmentStatus.CANCELLED
+    ).count()
+    session.remove()
+    assert len(successes) == 1, f"expected exactly one booking to succeed, got {len(successes)}"
+    assert booked == 1, f"expected exactly one appointment row, found {booked}"
+    print("OK: exactly one booking won the slot")
+
+    # Everyone wants a different slot of the same day; only the daily quota may win
+    day_start = start_time.replace(hour=0) + timedelta(days=1)
+    successes, elapsed = run_bookings(service, mentor_id, student_ids, lambda i: day_start + timedelta(minutes=i * 70))
+    quota = session.query(MentorModel.max_sessions_per_day).filter(MentorModel.id == mentor_id).scalar()
+    counted = BookingCounter().get_count(mentor_id, booking_day(day_start))
+    session.remove()
+    expected = min(quota, len(student_ids))
+    assert len(successes) == expected, f"expected {expected} bookings within the daily quota, got {len(successes)}"
+    assert counted == expected, f"expected the day's counter at {expected}, found {counted}"
+    print(f"OK: exactly {expected} bookings fit the daily quota of {quota}")
+
+def run_bookings(service: AppointmentService, mentor_id: int, student_ids, slot_start):
+    """Book in parallel, student i asking for slot_start(i); returns the successful ids and wall time"""
+    barrier = threading.Barrier(len(student_ids))
+    successes, rejections, errors = [], [], []
+    lock = threading.Lock()
+
+    def book(i: int, student_id: int):
+        start_time = slot_start(i)
+        barrier.wait()
+        try:
+            appointment = service.create_appointment(
+                mentor_id, student_id, 'Bench booking', '', start_time, start_time + timedelta(hours=1)
+            )
+            with lock:
+                successes.append(appointment.id)
+        except ValueError as e:
+            with lock:
+                rejections.append(str(e))
+        except Exception as e:
+            with lock:
+                errors.append(repr(e))
+        finally:
+            session.remove()
+
+    threads = [threading.Thread(target=book, args=(i, student_id)) for i, student_id in enumerate(student_ids)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    print(f"{len(student_ids)} parallel bookings in {elapsed * 1000:.1f} ms")
+    print(f"  succeeded: {len(successes)}  rejected: {len(rejections)}  errors: {len(errors)}")
+    for error in errors:
+        print(f"  error: {error}")
+    return successes, elapsed
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: memory footprint and construction time of the slotted domain
+models against an equivalent class that keeps a per-instance __dict__.
+
+Pure Python, no database needed:
+    python scripts/bench_domain_models.py [--objects 100000] [--repeat 5]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domain.models.appointment import Appointment, AppointmentStatus  # noqa: E402
+from domain.models.mentor import Mentor, MentorStatus  # noqa: E402
+from domain.models.user import User, UserRole  # noqa: E402
+from domain.models.wallet import Wallet  # noqa: E402
+
+def dict_based(slotted_class):
+    """Same constructor, but instances get a __dict__ like the pre-slots models"""
+    return type(f'Dict{slotted_class.__name__}', (), {'__init__': slotted_class.__init__})
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+CASES = [
+    (Appointment, lambda cls, i: cls(i, 1, 2, None, 'Session', 'Benchmark row', NOW, NOW,
+                                     AppointmentStatus.CONFIRMED, 10, 10, None, None, NOW, NOW)),
+    (Mentor, lambda cls, i: cls(i, i, 'Bio', ['Python'], 10, 5, MentorStatus.ACTIVE, 4.5, 12, NOW, NOW)),
+    (Wallet, lambda cls, i: cls(i, i, 1000, 0, 0, NOW, NOW)),
+    (User, lambda cls, i: cls(i, f'user{i}', f'user{i}@example.com', 'hash', 'User', UserRole.STUDENT,
+                              None, None, True, NOW, NOW)),
+]
+
+def measure_memory(cls, build, count: int) -> float:
+    """Bytes allocated per live instance"""
+    gc.collect()
+    tracemalloc.start()
+    objects = [build(cls, i) for i in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+def measure_time(cls, build, count: int, repeat: int) -> float:
+    """Best-of-N seconds to construct `count` instances"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        objects = [build(cls, i) for i in range(count)]
+        timings.append(time.perf_counter() - started)
+        del objects
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--objects', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.objects} objects per class, best of {args.repeat}")
+    for slotted_class, build in CASES:
+        assert not hasattr(build(slotted_class, 0), '__dict__')
+        plain_class = dict_based(slotted_class)
+        plain_bytes = measure_memory(plain_class, build, args.objects)
+        slotted_bytes = measure_memory(slotted_class, build, args.objects)
+        plain_time = measure_time(plain_class, build, args.objects, args.repeat)
+        slotted_time = measure_time(slotted_class, build, args.objects, args.repeat)
+
+        print(f"  {slotted_class.__name__}")
+        print(f"    __dict__: {plain_bytes:7.1f} B/object  {plain_time * 1000:8.1f} ms")
+        print(f"    __slots__:{slotted_bytes:7.1f} B/object  {slotted_time * 1000:8.1f} ms")
+        print(f"    memory saved: {1 - slotted_bytes / plain_bytes:.0%}  speedup: {plain_time / slotted_time:.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: top-K mentor matching over 10k mentors with expertise tags and a
+day of appointments, scored in one SELECT by MentorRepository.find_matches.
+
+Runs against a throwaway SQLite file unless DATABASE_URI is set:
+    python scripts/bench_mentor_matching.py [--mentors 10000] [--repeat 20] [--top 10]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if 'DATABASE_URI' not in os.environ:
+    os.environ['DATABASE_URI'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench_matching.db')
+
+from sqlalchemy import func, insert, select  # noqa: E402
+from infrastructure.databases import init_db  # noqa: E402
+from infrastructure.databases.mssql import session  # noqa: E402
+from infrastructure.models.mentor_model import MentorModel  # noqa: E402
+from infrastructure.models.mentor_expertise_model import MentorExpertiseModel  # noqa: E402
+from infrastructure.models.appointment_model import AppointmentModel  # noqa: E402
+from infrastructure.repositories.mentor_repository import MentorRepository  # noqa: E402
+from infrastructure.repositories.appointment_repository import AppointmentRepository  # noqa: E402
+from infrastructure.repositories.booking_counter import BookingCounter  # noqa: E402
+from infrastructure.databases.unit_of_work import UnitOfWork  # noqa: E402
+from services.mentor_service import MentorService  # noqa: E402
+from domain.models.mentor import MentorStatus  # noqa: E402
+from domain.models.appointment import AppointmentStatus  # noqa: E402
+
+TAGS = ['Python', 'Java', 'Go', 'Rust', 'SQL', 'React', 'DevOps', 'ML', 'Security', 'Cloud',
+        'Flask', 'Spring', 'Kubernetes', 'Data', 'Testing', 'Mobile', 'UX', 'C++', 'Linux', 'Networking']
+DAY = datetime(2026, 3, 2)
+
+def seed(mentors: int):
+    rng = random.Random(42)
+    first_id = (session.execute(select(func.max(MentorModel.id))).scalar() or 0) + 1
+    mentor_rows, expertise_rows, appointment_rows = [], [], []
+    for mentor_id in range(first_id, first_id + mentors):
+        areas = rng.sample(TAGS, rng.randint(1, 4))
+        mentor_rows.append({
+            'id': mentor_id,
+            'user_id': 1_000_000 + mentor_id,
+            'bio': 'Benchmark mentor',
+            'expertise_areas': areas,
+            'hourly_rate': rng.randint(5, 100),
+            'max_sessions_per_day': rng.randint(2, 8),
+            'status': MentorStatus.ACTIVE if rng.random() < 0.9 else MentorStatus.INACTIVE,
+            'rating': round(rng.uniform(1, 5), 2),
+            'total_sessions': 0,
+            'created_at': DAY,
+            'updated_at': DAY,
+        })
+        expertise_rows.extend({'mentor_id': mentor_id, 'expertise': area} for area in areas)
+        # About three bookings a day: three weeks of history and one week ahead
+        for slot in rng.sample(range(28 * 12), rng.randint(40, 120)):
+            start = DAY + timedelta(days=slot // 12 - 21, hours=8 + slot % 12)
+            appointment_rows.append({
+                'mentor_id': mentor_id,
+                'student_id': 1,
+                'title': 'Benchmark session',
+                'start_time': start,
+                'end_time': start + timedelta(minutes=50),
+                'status': AppointmentStatus.CONFIRMED,
+                'points_required': 10,
+                'points_used': 10,
+                'created_at': DAY,
+                'updated_at': DAY,
+            })
+    session.execute(insert(MentorModel), mentor_rows)
+    session.execute(insert(MentorExpertiseModel), expertise_rows)
+    session.execute(insert(AppointmentModel), appointment_rows)
+    BookingCounter().recompute_all()
+    session.commit()
+    session.remove()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--mentors', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    init_db(None)
+    seed(args.mentors)
+    service = MentorService(MentorRepository(), AppointmentRepository(), UnitOfWork())
+    start_time = DAY + timedelta(hours=14)
+    end_time = start_time + timedelta(hours=1)
+
+    for label, expertise, max_rate in (
+        ('2 tags', ['Python', 'Flask'], None),
+        ('2 tags + budget', ['Python', 'Flask'], 40),
+        ('no tags', [], None),
+    ):
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            matches = service.match_mentors(expertise, start_time, end_time, max_rate=max_rate, limit=args.top)
+            timings.append(time.perf_counter() - started)
+            session.remove()
+        timings.sort()
+        print(f"{label:16} top {len(matches)}: median {timings[len(timings) // 2] * 1000:6.1f} ms, "
+              f"best {timings[0] * 1000:6.1f} ms; best score {matches[0].score:.3f}" if matches else f"{label}: no matches")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: read 10k appointments through full ORM entities with keyword
+constructors (the old repository path) versus the shared RowMapper.
+
+Runs against a throwaway SQLite file unless DATABASE_URI is set:
+    python scripts/bench_row_mapping.py [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if 'DATABASE_URI' not in os.environ:
+    os.environ['DATABASE_URI'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench_mapping.db')
+
+from sqlalchemy import insert  # noqa: E402
+from infrastructure.databases import init_db  # noqa: E402
+from infrastructure.databases.mssql import session  # noqa: E402
+from infrastructure.models.appointment_model import AppointmentModel  # noqa: E402
+from infrastructure.repositories.appointment_repository import AppointmentRepository  # noqa: E402
+from domain.models.appointment import Appointment, AppointmentStatus  # noqa: E402
+
+BENCH_MENTOR_ID = 999999
+
+def seed(rows: int):
+    now = datetime(2026, 1, 1)
+    session.execute(insert(AppointmentModel), [
+        {
+            'mentor_id': BENCH_MENTOR_ID,
+            'student_id': 1,
+            'title': f'Session {i}',
+            'description': 'Benchmark row',
+            'start_time': now + timedelta(hours=i),
+            'end_time': now + timedelta(hours=i, minutes=50),
+            'status': AppointmentStatus.CONFIRMED,
+            'points_required': 10,
+            'points_used': 10,
+            'created_at': now,
+            'updated_at': now,
+        } for i in range(rows)
+    ])
+    session.commit()
+    session.remove()
+
+def read_with_orm_entities():
+    """The pre-mapper repository path: tracked ORM entities plus a keyword constructor per row"""
+    models = session.query(AppointmentModel).filter(AppointmentModel.mentor_id == BENCH_MENTOR_ID).all()
+    return [
+        Appointment(
+            id=model.id,
+            mentor_id=model.mentor_id,
+            student_id=model.student_id,
+            project_group_id=model.project_group_id,
+            title=model.title,
+            description=model.description,
+            start_time=model.start_time,
+            end_time=model.end_time,
+            status=model.status,
+            points_required=model.points_required,
+            points_used=model.points_used,
+            meeting_url=model.meeting_url,
+            notes=model.notes,
+            created_at=model.created_at,
+            updated_at=model.updated_at
+        ) for model in models
+    ]
+
+def read_with_row_mapper():
+    return AppointmentRepository().get_by_mentor_id(BENCH_MENTOR_ID)
+
+def best_of(fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+        # Each request gets a fresh session in the app
+        session.remove()
+    return min(timings), len(result)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    init_db(None)
+    session.query(AppointmentModel).filter(AppointmentModel.mentor_id == BENCH_MENTOR_ID).delete()
+    session.commit()
+    seed(args.rows)
+
+    orm_time, orm_rows = best_of(read_with_orm_entities, args.repeat)
+    mapper_time, mapper_rows = best_of(read_with_row_mapper, args.repeat)
+    assert orm_rows == mapper_rows == args.rows
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    print(f"  ORM entities + kwargs constructor: {orm_time * 1000:8.1f} ms")
+    print(f"  RowMapper (Core select):           {mapper_time * 1000:8.1f} ms")
+    print(f"  speedup: {orm_time / mapper_time:.2f}x")
+
+    session.query(AppointmentModel).filter(AppointmentModel.mentor_id == BENCH_MENTOR_ID).delete()
+    session.commit()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: turn a page of 1k appointments into a JSON response body the old
+way (a hand-built dict per item with isoformat()/.value, encoded by Flask's
+default provider) versus the precompiled Serializer with FastJSONProvider.
+
+Needs no database:
+    python scripts/bench_serialization.py [--items 1000] [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+from api.json_provider import FastJSONProvider  # noqa: E402
+from api.serializers import appointment_serializer  # noqa: E402
+from domain.models.appointment import Appointment, AppointmentStatus  # noqa: E402
+
+def make_appointments(items: int):
+    now = datetime(2026, 1, 1, 9, 0, 0, 123456)
+    return [
+        Appointment(
+            id=i, mentor_id=1 + i % 20, student_id=100 + i % 300, title=f'Session {i}',
+            description='Benchmark row with a little text in it', start_time=now + timedelta(hours=i),
+            end_time=now + timedelta(hours=i, minutes=50), status=AppointmentStatus.CONFIRMED,
+            points_required=10, points_used=10, meeting_url=f'https://meet.example.com/{i}',
+            created_at=now, updated_at=now
+        ) for i in range(items)
+    ]
+
+def hand_built(appointment):
+    """What each controller did before: one dict literal per endpoint"""
+    return {
+        'id': appointment.id,
+        'mentor_id': appointment.mentor_id,
+        'student_id': appointment.student_id,
+        'project_group_id': appointment.project_group_id,
+        'series_id': appointment.series_id,
+        'title': appointment.title,
+        'description': appointment.description,
+        'start_time': appointment.start_time.isoformat(),
+        'end_time': appointment.end_time.isoformat(),
+        'status': appointment.status.value,
+        'points_required': appointment.points_required,
+        'points_used': appointment.points_used,
+        'meeting_url': appointment.meeting_url,
+        'notes': appointment.notes,
+        'created_at': appointment.created_at.isoformat(),
+        'updated_at': appointment.updated_at.isoformat()
+    }
+
+def best_of(fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), body
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    appointments = make_appointments(args.items)
+    app = Flask(__name__)
+    default_provider = DefaultJSONProvider(app)
+    provider = FastJSONProvider(app)
+
+    with app.app_context():
+        def respond(provider, data):
+            return provider.response({'success': True, 'data': data, 'message': 'ok'}).get_data()
+
+        baseline, expected = best_of(
+            lambda: respond(default_provider, [hand_built(appointment) for appointment in appointments]),
+            args.repeat
+        )
+        elapsed, body = best_of(
+            lambda: respond(provider, appointment_serializer.dump_many(appointments)), args.repeat
+        )
+        assert app.json.loads(body) == app.json.loads(expected)
+
+    print(f"{args.items} appointments, best of {args.repeat}")
+    print(f"  hand-built dicts + Flask default provider: {baseline * 1000:8.2f} ms")
+    print(f"  Serializer + FastJSONProvider (orjson):   {elapsed * 1000:8.2f} ms  ({baseline / elapsed:.2f}x)")
+
+if __name__ == '__main__':
+    main()
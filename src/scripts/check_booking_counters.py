@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Local check that the per-day booking counters stay in step with the appointments
+when a booking or series is made with a UTC offset that puts it on another UTC day: the
+day reserved on booking must be the day released on cancel, and recompute_all
+must agree with the live counters.
+
+Runs against a throwaway SQLite file:
+    python scripts/check_booking_counters.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['DATABASE_URI'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'check_counters.db')
+
+def main():
+    from infrastructure.databases import init_db
+    from infrastructure.databases.mssql import session
+    from infrastructure.databases.unit_of_work import UnitOfWork
+    from infrastructure.models.mentor_model import MentorModel
+    from infrastructure.models.wallet_model import WalletModel
+    from infrastructure.repositories.appointment_repository import AppointmentRepository
+    from infrastructure.repositories.booking_counter import BookingCounter
+    from infrastructure.repositories.mentor_repository import MentorRepository
+    from infrastructure.repositories.wallet_repository import WalletRepository
+    from domain.models.mentor import MentorStatus
+    from domain.models.recurrence import RecurrenceFrequency, RecurrenceRule
+    from services.appointment_service import AppointmentService
+
+    init_db(None)
+    now = datetime(2026, 1, 1)
+    session.add(MentorModel(id=1, user_id=2, bio='Counter check', expertise_areas=['Python'], hourly_rate=10,
+                            max_sessions_per_day=5, status=MentorStatus.ACTIVE, created_at=now, updated_at=now))
+    session.add(WalletModel(user_id=1, balance=1000, created_at=now, updated_at=now))
+    session.commit()
+    session.remove()
+
+    counter = BookingCounter()
+    service = AppointmentService(AppointmentRepository(), MentorRepository(), WalletRepository(), UnitOfWork(),
+                                 counter)
+    # 01:00 at +07:00 is 18:00 UTC the day before
+    start = datetime(2026, 11, 10, 1, 0, tzinfo=timezone(timedelta(hours=7)))
+    appointment = service.create_appointment(1, 1, 'Offset booking', '', start, start + timedelta(hours=1))
+    session.remove()
+    assert appointment.start_time == datetime(2026, 11, 9, 18, 0), appointment.start_time
+    assert counter.get_count(1, date(2026, 11, 9)) == 1
+    assert counter.get_count(1, date(2026, 11, 10)) == 0
+    session.remove()
+    print("offset booking   -> stored and counted on its UTC day")
+
+    assert service.cancel_appointment(appointment.id, 1)
+    session.remove()
+    assert counter.get_count(1, date(2026, 11, 9)) == 0
+    assert counter.get_count(1, date(2026, 11, 10)) == 0
+    session.remove()
+    print("cancel           -> released the day it reserved")
+
+    service.create_appointment(1, 1, 'Kept booking', '', start, start + timedelta(hours=1))
+    session.remove()
+    live = counter.get_counts([1], date(2026, 11, 1), date(2026, 11, 30))
+    UnitOfWork().run(counter.recompute_all)
+    session.remove()
+    assert counter.get_counts([1], date(2026, 11, 1), date(2026, 11, 30)) == live, live
+    session.remove()
+    print("recompute_all    -> matches the live counters")
+
+    # A weekly series at the same offset: every session lands on the UTC day before its local date
+    series, sessions = service.create_series(1, 1, 'Offset series', '', start + timedelta(days=7),
+                                             start + timedelta(days=7, hours=1), RecurrenceRule(
+                                                 RecurrenceFrequency.WEEKLY, count=3))
+    session.remove()
+    days = [date(2026, 11, 16), date(2026, 11, 23), date(2026, 11, 30)]
+    assert [appointment.start_time.date() for appointment in sessions] == days
+    assert [counter.get_count(1, day) for day in days] == [1, 1, 1]
+    session.remove()
+    service.cancel_series(series.id, 1)
+    session.remove()
+    assert [counter.get_count(1, day) for day in days] == [0, 0, 0]
+    session.remove()
+    print("offset series    -> reserved and released on the same UTC days")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Local check of read-replica routing with two SQLite files standing in for the
+primary and the replica. The "replica" is never replicated to, so a read that
+sees a row only the primary has must have been routed to the primary.
+
+    python scripts/check_replica_routing.py [--window 0.5]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+directory = tempfile.mkdtemp()
+os.environ['DATABASE_URI'] = 'sqlite:///' + os.path.join(directory, 'primary.db')
+os.environ['DATABASE_REPLICA_URI'] = 'sqlite:///' + os.path.join(directory, 'replica.db')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--window', type=float, default=0.5)
+    args = parser.parse_args()
+    os.environ['READ_YOUR_WRITES_SECONDS'] = str(args.window)
+
+    from infrastructure.databases.base import Base
+    from infrastructure.databases import init_db
+    from infrastructure.databases.mssql import get_pool_status, replica_engine, session
+    from infrastructure.databases.routing import set_consistency_key, reset_consistency_key
+    from infrastructure.databases.unit_of_work import UnitOfWork
+    from infrastructure.repositories.appointment_repository import AppointmentRepository
+    from domain.models.appointment import Appointment
+
+    init_db(None)
+    Base.metadata.create_all(bind=replica_engine)
+    repository = AppointmentRepository()
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    token = set_consistency_key('user:1')
+
+    # Plain reads go to the (empty) replica
+    assert repository.get_by_mentor_id(1) == []
+    session.remove()
+    print("listing before any write      -> replica")
+
+    # A write commits on the primary and opens this client's read-your-writes window
+    created = UnitOfWork().run(lambda: repository.create(Appointment(
+        mentor_id=1, student_id=1, title='Routed', start_time=start, end_time=start + timedelta(hours=1)
+    )))
+    session.remove()
+    assert [a.id for a in repository.get_by_mentor_id(1)] == [created.id]
+    session.remove()
+    print("same client inside the window -> primary")
+
+    # Another client is not pinned
+    other = set_consistency_key('user:2')
+    assert repository.get_by_mentor_id(1) == []
+    session.remove()
+    reset_consistency_key(other)
+    print("other client                  -> replica")
+
+    # Single-row lookups used before writes always read the primary
+    assert repository.get_by_id(created.id) is not None
+    session.remove()
+    print("get_by_id                     -> primary")
+
+    time.sleep(args.window)
+    assert repository.get_by_mentor_id(1) == []
+    session.remove()
+    print("same client after the window  -> replica")
+
+    reset_consistency_key(token)
+    status = get_pool_status()
+    print(f"checkouts: primary={status['checkouts']} replica={status['replica']['checkouts']}")
+    print("OK: reads routed to the replica except within the read-your-writes window")
+
+if __name__ == '__main__':
+    main()
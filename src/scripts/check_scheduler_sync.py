@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Local check that the appointment scheduler closes appointments another process
+booked or changed after its window was loaded. Every write below goes through
+a second engine and session, so none of it reaches the scheduler's listeners,
+just as when another worker serves the request.
+
+Runs against a throwaway SQLite file:
+    python scripts/check_scheduler_sync.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['DATABASE_URI'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'check_scheduler.db')
+
+def main():
+    from sqlalchemy import create_engine, update
+    from sqlalchemy.orm import Session
+    from infrastructure.databases import init_db
+    from infrastructure.databases.mssql import session
+    from infrastructure.databases.unit_of_work import UnitOfWork
+    from infrastructure.models.appointment_model import AppointmentModel
+    from infrastructure.models.mentor_model import MentorModel
+    from infrastructure.repositories.appointment_repository import AppointmentRepository
+    from infrastructure.repositories.booking_counter import BookingCounter
+    from infrastructure.repositories.mentor_repository import MentorRepository
+    from infrastructure.repositories.notification_outbox_repository import NotificationOutboxRepository
+    from infrastructure.repositories.wallet_repository import WalletRepository
+    from domain.models.appointment import AppointmentStatus
+    from domain.models.mentor import MentorStatus
+    from services.appointment_service import AppointmentService
+    from services.notification_service import NotificationService
+    from services.schedule_service import ScheduleService
+
+    init_db(None)
+    other_process = Session(create_engine(os.environ['DATABASE_URI']))
+    other_process.add(MentorModel(id=1, user_id=2, bio='Scheduler check', expertise_areas=['Python'],
+                                  hourly_rate=10, status=MentorStatus.ACTIVE,
+                                  created_at=datetime(2026, 1, 1), updated_at=datetime(2026, 1, 1)))
+    other_process.commit()
+
+    repository = AppointmentRepository()
+    notifications = NotificationService(NotificationOutboxRepository(), UnitOfWork())
+    appointments = AppointmentService(repository, MentorRepository(), WalletRepository(), UnitOfWork(),
+                                      BookingCounter(), notifications)
+    scheduler = ScheduleService(repository, appointments, notifications)
+
+    now = datetime.now(timezone.utc)
+    start = (now + timedelta(hours=1)).replace(tzinfo=None, microsecond=0)
+
+    def book(title, status):
+        stamp = datetime.now(timezone.utc).replace(tzinfo=None)
+        appointment = AppointmentModel(mentor_id=1, student_id=1, title=title, start_time=start,
+                                       end_time=start + timedelta(hours=1), status=status,
+                                       created_at=stamp, updated_at=stamp)
+        other_process.add(appointment)
+        other_process.commit()
+        return appointment.id
+
+    def confirm(appointment_id):
+        other_process.execute(update(AppointmentModel).where(AppointmentModel.id == appointment_id).values(
+            status=AppointmentStatus.CONFIRMED, updated_at=datetime.now(timezone.utc).replace(tzinfo=None)
+        ))
+        other_process.commit()
+
+    def status(appointment_id):
+        found = repository.get_by_id(appointment_id)
+        session.remove()
+        return found.status
+
+    # Loaded as PENDING, then confirmed elsewhere: the close uses the row's current status
+    loaded_pending = book('Loaded pending', AppointmentStatus.PENDING)
+    scheduler.load(now)
+    session.remove()
+    confirm(loaded_pending)
+
+    # Booked and confirmed elsewhere after the load: only sync() can find it
+    booked_after_load = book('Booked after load', AppointmentStatus.PENDING)
+    confirm(booked_after_load)
+    scheduler.sync()
+    session.remove()
+    assert scheduler.stats()['pending_jobs'] == 4, scheduler.stats()
+    print("sync             -> picked up a booking made by another process")
+
+    after_end = now + timedelta(hours=3)
+    fired = scheduler.run_due(after_end)
+    session.remove()
+    assert fired['auto_close'] == 2, fired
+    assert status(loaded_pending) == AppointmentStatus.COMPLETED
+    assert status(booked_after_load) == AppointmentStatus.COMPLETED
+    print("run_due          -> closed both as COMPLETED, not from a stale PENDING snapshot")
+
+if __name__ == '__main__':
+    main()
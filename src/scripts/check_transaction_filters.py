@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Local check that the wallet ledger's `from`/`to` filters accept timestamps with
+a UTC offset or a Z suffix and compare them with the naive UTC created_at the
+database stores, both for a page and for a streamed export.
+
+Runs against a throwaway SQLite file:
+    python scripts/check_transaction_filters.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['DATABASE_URI'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'check_filters.db')
+
+def main():
+    from flask import Flask
+    from infrastructure.databases import init_db
+    from infrastructure.databases.mssql import session
+    from api.controllers.wallet_controller import bp
+    from api.json_provider import FastJSONProvider
+    from infrastructure.models.wallet_model import WalletModel, WalletTransactionModel
+    from domain.models.wallet import TransactionType
+
+    init_db(None)
+    now = datetime(2026, 1, 1)
+    session.add(WalletModel(id=1, user_id=1, balance=1000, created_at=now, updated_at=now))
+    for hour in (17, 18):
+        session.add(WalletTransactionModel(wallet_id=1, amount=10, transaction_type=TransactionType.EARNED,
+                                           description=f'{hour}:30 UTC', created_at=datetime(2026, 3, 1, hour, 30)))
+    session.commit()
+    session.remove()
+
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    app.register_blueprint(bp)
+    client = app.test_client()
+
+    def descriptions(**filters):
+        response = client.get('/api/wallet/transactions', query_string={'user_id': 1, **filters})
+        assert response.status_code == 200, response.json
+        return [transaction['description'] for transaction in response.json['data']]
+
+    # 01:00 at +07:00 on March 2nd is 18:00 UTC on March 1st
+    assert descriptions(**{'from': '2026-03-02T01:00:00+07:00'}) == ['18:30 UTC']
+    assert descriptions(**{'to': '2026-03-02T01:00:00+07:00'}) == ['17:30 UTC']
+    print("offset           -> converted to UTC before filtering")
+
+    assert descriptions(**{'from': '2026-03-01T18:00:00Z'}) == ['18:30 UTC']
+    assert descriptions(**{'from': '2026-03-01T18:00:00'}) == ['18:30 UTC']
+    print("Z and naive      -> both read as UTC")
+
+    export = client.get('/api/wallet/transactions', query_string={
+        'user_id': 1, 'format': 'csv', 'to': '2026-03-01T12:00:00-06:00'
+    }).get_data(as_text=True)
+    assert '17:30 UTC' in export and '18:30 UTC' not in export, export
+    print("csv export       -> same filter as the page")
+
+if __name__ == '__main__':
+    main()
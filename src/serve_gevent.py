@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Serve the API from gevent greenlets instead of WSGI worker threads, for
+deployments that hold many /api/events/stream connections open:
+    python serve_gevent.py
+
+Once the standard library is patched, the event bus's Event and locks are
+greenlet primitives, so an idle stream costs a greenlet and its socket rather
+than a blocked thread, and SSE_MAX_STREAMS can be raised to match.
+"""
+
+from gevent import monkey
+
+# Before anything imports threading, socket or ssl
+monkey.patch_all()
+
+import os
+
+# Idle streams are cheap here; an explicit SSE_MAX_STREAMS still wins
+os.environ.setdefault('SSE_MAX_STREAMS', '1000')
+
+from gevent.pywsgi import WSGIServer
+from gevent.socket import wait_read
+
+try:
+    import pymssql
+except ImportError:
+    pymssql = None
+
+from app import create_app
+from config import Config
+
+def serve():
+    """Serve until interrupted, one greenlet per connection up to SERVER_MAX_CONNECTIONS"""
+    if pymssql is not None:
+        # pymssql talks to FreeTDS in C: without this every query blocks the whole process
+        pymssql.set_wait_callback(wait_read)
+
+    app = create_app()
+    port = int(os.environ.get('PORT', '6868'))
+    server = WSGIServer(('0.0.0.0', port), app, spawn=Config.SERVER_MAX_CONNECTIONS)
+    print(f"Serving on port {port} with gevent (up to {Config.SERVER_MAX_CONNECTIONS} connections, "
+          f"{Config.SSE_MAX_STREAMS} event streams)")
+    server.serve_forever()
+
+if __name__ == '__main__':
+    serve()
@@ -1,68 +1,225 @@
-from typing import List, Optional
-from datetime import datetime, timedelta, timezone
-from domain.models.appointment import Appointment, AppointmentStatus
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import date, datetime, time, timedelta, timezone
+from domain.models.appointment import (
+    Appointment, AppointmentStatus, ALLOWED_TRANSITIONS, CANCELLABLE_STATUSES, INACTIVE_STATUSES,
+    transition_sources
+)
+from domain.models.recurrence import AppointmentSeries, RecurrenceRule
 from domain.models.iappointment_repository import IAppointmentRepository
 from domain.models.imentor_repository import IMentorRepository
 from domain.models.iwallet_repository import IWalletRepository
+from domain.models.iunit_of_work import IUnitOfWork
+from domain.models.ibooking_counter import IBookingCounter
 from domain.models.wallet import TransactionType
-from domain.models.mentor import MentorStatus
+from domain.models.mentor import Mentor, MentorStatus
+from domain.models.availability import AvailabilityIndex, as_utc, to_naive_utc
+from domain.models.ievent_bus import IEventBus, mentor_topic, user_topic
+from services.notification_service import NotificationService, appointment_payload
+from services.wallet_service import wallet_event
+from domain.constants import (
+    DEFAULT_SLOT_STEP_MINUTES, MAX_BATCH_TRANSITION_SIZE, WORKING_HOURS_START, WORKING_HOURS_END
+)
+
+def booking_day(start_time: datetime) -> date:
+    """The UTC day whose session quota an appointment counts against"""
+    return as_utc(start_time).date()
 
 class AppointmentService:
     def __init__(self, appointment_repository: IAppointmentRepository, 
                  mentor_repository: IMentorRepository,
-                 wallet_repository: IWalletRepository):
+                 wallet_repository: IWalletRepository,
+                 unit_of_work: IUnitOfWork,
+                 booking_counter: IBookingCounter,
+                 notification_service: Optional[NotificationService] = None,
+                 event_bus: Optional[IEventBus] = None):
         self.appointment_repository = appointment_repository
         self.mentor_repository = mentor_repository
         self.wallet_repository = wallet_repository
+        self.unit_of_work = unit_of_work
+        self.booking_counter = booking_counter
+        self.notification_service = notification_service
+        self.event_bus = event_bus
+        self._listeners: List[Callable[[List[Appointment]], None]] = []
+    
+    def add_listener(self, listener: Callable[[List[Appointment]], None]):
+        """Call listener with the changed appointments after every committed create or status change"""
+        self._listeners.append(listener)
+    
+    def _changed(self, appointments: List[Appointment]):
+        if appointments:
+            for listener in self._listeners:
+                listener(appointments)
+            if self.event_bus:
+                self._publish(appointments)
+    
+    def _publish(self, appointments: List[Appointment]):
+        """Push committed changes to the student's and mentor's open event streams"""
+        wallet_user_ids = set()
+        for appointment in appointments:
+            self.event_bus.publish(
+                (user_topic(appointment.student_id), mentor_topic(appointment.mentor_id)),
+                'appointment', appointment_payload(appointment)
+            )
+            # Pending appointments were just paid for and cancelled ones refunded
+            if appointment.points_used and appointment.status in (AppointmentStatus.PENDING,
+                                                                  AppointmentStatus.CANCELLED):
+                wallet_user_ids.add(appointment.student_id)
+        for user_id in wallet_user_ids:
+            # Only read the new balance when someone is listening for it
+            if self.event_bus.has_subscribers(user_topic(user_id)):
+                wallet = self.wallet_repository.get_wallet_by_user_id(user_id)
+                if wallet:
+                    self.event_bus.publish([user_topic(user_id)], 'wallet', wallet_event(wallet))
     
     def create_appointment(self, mentor_id: int, student_id: int, 
                           title: str, description: str, start_time: datetime,
                           end_time: datetime, project_group_id: Optional[int] = None) -> Optional[Appointment]:
         """Create a new appointment booking"""
-        # Check if mentor is available
-        if not self._is_mentor_available(mentor_id, start_time, end_time):
-            raise ValueError("Mentor is not available for this time slot")
+        # Store, check and count the booking on the same UTC timeline as every other row
+        start_time, end_time = to_naive_utc(start_time), to_naive_utc(end_time)
+        if end_time <= start_time:
+            raise ValueError("End time must be after start time")
         
-        # Get mentor to calculate points required
-        mentor = self.mentor_repository.get_by_id(mentor_id)
-        if not mentor:
-            raise ValueError("Mentor not found")
-        
-        # Calculate duration in hours and points required
-        duration_hours = (end_time - start_time).total_seconds() / 3600
-        points_required = int(duration_hours * mentor.hourly_rate)
-        
-        # Check if student has enough points
-        wallet = self.wallet_repository.get_wallet_by_user_id(student_id)
-        if not wallet or wallet.balance < points_required:
-            raise ValueError("Insufficient points in wallet")
+        def book() -> Appointment:
+            # Lock the mentor row so concurrent bookings of this mentor run one at a time
+            mentor = self.mentor_repository.get_for_update(mentor_id)
+            if not mentor:
+                raise ValueError("Mentor not found")
+            if mentor.status != MentorStatus.ACTIVE or self.appointment_repository.get_busy_intervals(
+                    mentor_id, start_time, end_time):
+                raise ValueError("Mentor is not available for this time slot")
+            self._reserve_session(mentor_id, start_time, mentor.max_sessions_per_day)
+            
+            # Calculate duration in hours and points required
+            duration_hours = (end_time - start_time).total_seconds() / 3600
+            points_required = int(duration_hours * mentor.hourly_rate)
+            
+            appointment = Appointment(
+                mentor_id=mentor_id,
+                student_id=student_id,
+                project_group_id=project_group_id,
+                title=title,
+                description=description,
+                start_time=start_time,
+                end_time=end_time,
+                status=AppointmentStatus.PENDING,
+                points_required=points_required,
+                points_used=points_required,
+                created_at=datetime.now(timezone.utc),
+                updated_at=datetime.now(timezone.utc)
+            )
+            created_appointment = self.appointment_repository.create(appointment)
+            
+            # Deduct points from the student's wallet (by user_id); a short balance
+            # raises and rolls the whole booking back
+            self._deduct_points_from_wallet(student_id, points_required, created_appointment.id)
+            if self.notification_service:
+                self.notification_service.appointments_booked([created_appointment])
+            return created_appointment
         
-        # Create appointment
-        appointment = Appointment(
-            mentor_id=mentor_id,
-            student_id=student_id,
-            project_group_id=project_group_id,
-            title=title,
-            description=description,
-            start_time=start_time,
-            end_time=end_time,
-            status=AppointmentStatus.PENDING,
-            points_required=points_required,
-            points_used=0,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc)
-        )
+        # Slot check, insert and wallet debit commit together or not at all
+        appointment = self.unit_of_work.run(book)
+        self._changed([appointment])
+        return appointment
+    
+    def create_series(self, mentor_id: int, student_id: int, title: str, description: str,
+                      start_time: datetime, end_time: datetime, recurrence: RecurrenceRule,
+                      project_group_id: Optional[int] = None) -> Tuple[AppointmentSeries, List[Appointment]]:
+        """Book a recurring series with one conflict query, one wallet debit and one batched insert"""
+        # Every occurrence is stored, checked and counted on the same UTC timeline as the other rows
+        start_time, end_time = to_naive_utc(start_time), to_naive_utc(end_time)
+        if end_time <= start_time:
+            raise ValueError("End time must be after start time")
+        occurrences = recurrence.occurrences(start_time, end_time)
         
-        created_appointment = self.appointment_repository.create(appointment)
+        def book() -> Tuple[AppointmentSeries, List[Appointment]]:
+            mentor = self.mentor_repository.get_for_update(mentor_id)
+            if not mentor:
+                raise ValueError("Mentor not found")
+            if mentor.status != MentorStatus.ACTIVE:
+                raise ValueError("Mentor is not available for this time slot")
+            
+            # One range query covers every occurrence
+            index = AvailabilityIndex(self.appointment_repository.get_busy_intervals(
+                mentor_id, occurrences[0][0], occurrences[-1][1]
+            ))
+            conflicts = [start for start, end in occurrences if not index.is_free(start, end)]
+            if conflicts:
+                raise ValueError("Mentor is not available on: " + ", ".join(start.isoformat() for start in conflicts))
+            full_days = self.booking_counter.try_reserve_days(
+                mentor_id, [booking_day(start) for start, _ in occurrences], mentor.max_sessions_per_day
+            )
+            if full_days:
+                raise ValueError("Mentor has no sessions left on: " + ", ".join(day.isoformat() for day in full_days))
+            
+            duration_hours = (end_time - start_time).total_seconds() / 3600
+            points_required = int(duration_hours * mentor.hourly_rate)
+            series = self.appointment_repository.create_series(AppointmentSeries(
+                mentor_id=mentor_id,
+                student_id=student_id,
+                rule=recurrence.to_rrule()
+            ))
+            now = datetime.now(timezone.utc)
+            appointments = self.appointment_repository.create_many([
+                Appointment(
+                    mentor_id=mentor_id,
+                    student_id=student_id,
+                    project_group_id=project_group_id,
+                    title=title,
+                    description=description,
+                    start_time=occurrence_start,
+                    end_time=occurrence_end,
+                    status=AppointmentStatus.PENDING,
+                    points_required=points_required,
+                    points_used=points_required,
+                    created_at=now,
+                    updated_at=now,
+                    series_id=series.id
+                ) for occurrence_start, occurrence_end in occurrences
+            ])
+            
+            # The whole series is paid for with a single debit
+            total_points = points_required * len(appointments)
+            if total_points and not self.wallet_repository.apply_delta(
+                    student_id, -total_points, TransactionType.SPENT, None,
+                    f"Appointment series #{series.id} booking ({len(appointments)} sessions)"):
+                raise ValueError("Insufficient points in wallet")
+            if self.notification_service:
+                self.notification_service.series_booked(series, appointments)
+            return series, appointments
         
-        # Deduct points from wallet
-        if created_appointment:
-            # Deduct points from the student's wallet (by user_id)
-            self._deduct_points_from_wallet(student_id, points_required, created_appointment.id)
-            created_appointment.points_used = points_required
-            self.appointment_repository.update(created_appointment)
+        series, appointments = self.unit_of_work.run(book)
+        self._changed(appointments)
+        return series, appointments
+    
+    def get_series(self, series_id: int) -> Optional[Tuple[AppointmentSeries, List[Appointment]]]:
+        """Get a series and its appointments in start order"""
+        series = self.appointment_repository.get_series_by_id(series_id)
+        if not series:
+            return None
+        return series, self.appointment_repository.get_by_series_id(series_id)
+    
+    def cancel_series(self, series_id: int, cancelled_by_user_id: int,
+                      from_time: Optional[datetime] = None) -> Optional[List[Appointment]]:
+        """Cancel every still-cancellable session of a series (or those from from_time on) and refund them at once"""
+        def cancel() -> Optional[List[Appointment]]:
+            series = self.appointment_repository.get_series_by_id(series_id)
+            if not series or cancelled_by_user_id not in [series.student_id, series.mentor_id]:
+                return None
+            
+            candidates = [
+                appointment.id for appointment in self.appointment_repository.get_by_series_id(series_id)
+                if from_time is None or as_utc(appointment.start_time) >= as_utc(from_time)
+            ]
+            cancelled = self.appointment_repository.update_status_many(
+                candidates, AppointmentStatus.CANCELLED, CANCELLABLE_STATUSES
+            )
+            self._after_transitions(cancelled, AppointmentStatus.CANCELLED)
+            return cancelled
         
-        return created_appointment
+        cancelled = self.unit_of_work.run(cancel)
+        self._changed(cancelled or [])
+        return cancelled
     
     def get_appointment_by_id(self, appointment_id: int) -> Optional[Appointment]:
         """Get appointment by ID"""
@@ -76,147 +233,241 @@ class AppointmentService:
         """Get all appointments for a mentor"""
         return self.appointment_repository.get_by_mentor_id(mentor_id)
     
+    def get_appointments_page_by_student(self, student_id: int, limit: int,
+                                         cursor: Optional[Tuple[datetime, int]] = None,
+                                         offset: int = 0) -> Tuple[List[Appointment], Optional[Tuple[datetime, int]]]:
+        """Get one page of a student's appointments and the cursor of the next page"""
+        return self.appointment_repository.get_page_by_student_id(student_id, limit, cursor, offset)
+    
+    def get_appointments_page_by_mentor(self, mentor_id: int, limit: int,
+                                        cursor: Optional[Tuple[datetime, int]] = None,
+                                        offset: int = 0) -> Tuple[List[Appointment], Optional[Tuple[datetime, int]]]:
+        """Get one page of a mentor's appointments and the cursor of the next page"""
+        return self.appointment_repository.get_page_by_mentor_id(mentor_id, limit, cursor, offset)
+    
+    def count_appointments_by_student(self, student_id: int) -> int:
+        """Count all appointments of a student"""
+        return self.appointment_repository.count_by_student_id(student_id)
+    
+    def count_appointments_by_mentor(self, mentor_id: int) -> int:
+        """Count all appointments of a mentor"""
+        return self.appointment_repository.count_by_mentor_id(mentor_id)
+    
     def get_appointments_by_project_group(self, group_id: int) -> List[Appointment]:
         """Get all appointments for a project group"""
         return self.appointment_repository.get_by_project_group_id(group_id)
     
     def confirm_appointment(self, appointment_id: int) -> bool:
         """Confirm an appointment"""
-        appointment = self.appointment_repository.get_by_id(appointment_id)
-        if not appointment:
-            return False
-        
-        appointment.status = AppointmentStatus.CONFIRMED
-        appointment.updated_at = datetime.now(timezone.utc)
-        self.appointment_repository.update(appointment)
-        return True
+        return self._change_status(appointment_id, AppointmentStatus.CONFIRMED)
     
     def cancel_appointment(self, appointment_id: int, cancelled_by_user_id: int) -> bool:
         """Cancel an appointment and refund points"""
-        appointment = self.appointment_repository.get_by_id(appointment_id)
-        if not appointment:
-            return False
-        
-        # Only student or mentor can cancel
-        if cancelled_by_user_id not in [appointment.student_id, appointment.mentor_id]:
-            return False
-        
-        appointment.status = AppointmentStatus.CANCELLED
-        appointment.updated_at = datetime.now(timezone.utc)
-        self.appointment_repository.update(appointment)
-        
-        # Refund points to student
-        if appointment.points_used > 0:
-            wallet = self.wallet_repository.get_wallet_by_user_id(appointment.student_id)
-            if wallet:
-                # Refund points to the student's wallet (by user_id)
-                self._refund_points_to_wallet(appointment.student_id, appointment.points_used, appointment_id)
+        def cancel() -> Optional[Appointment]:
+            appointment = self.appointment_repository.get_by_id(appointment_id)
+            if not appointment:
+                return None
+            
+            # Only student or mentor can cancel
+            if cancelled_by_user_id not in [appointment.student_id, appointment.mentor_id]:
+                return None
+            if appointment.status not in CANCELLABLE_STATUSES:
+                raise ValueError(f"Appointment is already {appointment.status.value}")
+            
+            return self._set_status(appointment_id, AppointmentStatus.CANCELLED)
         
-        return True
+        appointment = self.unit_of_work.run(cancel)
+        if appointment:
+            self._changed([appointment])
+        return appointment is not None
     
     def complete_appointment(self, appointment_id: int) -> bool:
         """Mark appointment as completed"""
-        appointment = self.appointment_repository.get_by_id(appointment_id)
-        if not appointment:
-            return False
-        
-        appointment.status = AppointmentStatus.COMPLETED
-        appointment.updated_at = datetime.now(timezone.utc)
-        self.appointment_repository.update(appointment)
-        return True
+        return self._change_status(appointment_id, AppointmentStatus.COMPLETED)
     
-    def get_available_slots(self, mentor_id: int, date: datetime, duration_hours: float = 1.0) -> List[dict]:
-        """Get available time slots for a mentor on a specific date"""
-        mentor = self.mentor_repository.get_by_id(mentor_id)
-        if not mentor or mentor.status != MentorStatus.ACTIVE:
-            return []
+    def mark_no_show(self, appointment_id: int) -> bool:
+        """Mark appointment as missed, freeing its slot of the mentor's daily quota"""
+        return self._change_status(appointment_id, AppointmentStatus.NO_SHOW)
+    
+    def transition_appointments(self, appointment_ids: List[int], status: AppointmentStatus,
+                                from_status: Optional[AppointmentStatus] = None) -> Tuple[List[Appointment], List[int]]:
+        """Move many appointments (only those in from_status, if given) to a status with one guarded UPDATE;
+        returns those moved and the ids skipped"""
+        ids = list(dict.fromkeys(appointment_ids))
+        if len(ids) > MAX_BATCH_TRANSITION_SIZE:
+            raise ValueError(f"At most {MAX_BATCH_TRANSITION_SIZE} appointments can be changed at once")
+        sources = self._transition_sources(status)
+        if from_status is not None:
+            if from_status not in sources:
+                raise ValueError(f"Cannot move a {from_status.value} appointment to {status.value}")
+            sources = (from_status,)
         
-        # Get mentor's existing appointments for the date
-        existing_appointments = self.appointment_repository.get_by_mentor_id(mentor_id)
-        day_appointments = [
-            apt for apt in existing_appointments 
-            if apt.start_time.date() == date.date() and apt.status not in [AppointmentStatus.CANCELLED, AppointmentStatus.NO_SHOW]
-        ]
+        def transition() -> List[Appointment]:
+            moved = self.appointment_repository.update_status_many(ids, status, sources)
+            self._after_transitions(moved, status)
+            return moved
         
-        # Define working hours (9 AM to 6 PM)
-        start_hour = 9
-        end_hour = 18
+        moved = self.unit_of_work.run(transition)
+        self._changed(moved)
+        moved_ids = {appointment.id for appointment in moved}
+        return moved, [appointment_id for appointment_id in ids if appointment_id not in moved_ids]
+    
+    def transition_ended_appointments(self, from_status: AppointmentStatus, status: AppointmentStatus,
+                                      ended_before: datetime) -> List[Appointment]:
+        """Move every from_status appointment that ended by ended_before to a status (end-of-day processing)"""
+        if status not in ALLOWED_TRANSITIONS[from_status]:
+            raise ValueError(f"Cannot move a {from_status.value} appointment to {status.value}")
         
-        # Generate time slots
-        slots = []
-        current_time = datetime.combine(date.date(), datetime.min.time().replace(hour=start_hour)).replace(tzinfo=timezone.utc)
-        end_time = datetime.combine(date.date(), datetime.min.time().replace(hour=end_hour)).replace(tzinfo=timezone.utc)
+        def transition() -> List[Appointment]:
+            moved = self.appointment_repository.update_status_ended_before(
+                as_utc(ended_before).replace(tzinfo=None), status, (from_status,)
+            )
+            self._after_transitions(moved, status)
+            return moved
         
-        while current_time + timedelta(hours=duration_hours) <= end_time:
-            slot_end = current_time + timedelta(hours=duration_hours)
-            
-            # Check if slot conflicts with existing appointments
-            is_available = True
-            for apt in day_appointments:
-                if (current_time < apt.end_time and slot_end > apt.start_time):
-                    is_available = False
-                    break
-            
-            if is_available:
-                slots.append({
-                    'start_time': current_time,
-                    'end_time': slot_end,
-                    'points_required': int(duration_hours * mentor.hourly_rate)
-                })
-            
-            current_time += timedelta(hours=1)  # 1-hour intervals
+        moved = self.unit_of_work.run(transition)
+        self._changed(moved)
+        return moved
+    
+    def _change_status(self, appointment_id: int, status: AppointmentStatus) -> bool:
+        appointment = self.unit_of_work.run(lambda: self._set_status(appointment_id, status))
+        if appointment:
+            self._changed([appointment])
+        return appointment is not None
+    
+    def _set_status(self, appointment_id: int, status: AppointmentStatus) -> Optional[Appointment]:
+        """Move one appointment along the state machine; None if it does not exist"""
+        moved = self.appointment_repository.update_status_many(
+            [appointment_id], status, self._transition_sources(status)
+        )
+        if moved:
+            self._after_transitions(moved, status)
+            return moved[0]
         
-        return slots
+        appointment = self.appointment_repository.get_by_id(appointment_id)
+        if not appointment or appointment.status == status:
+            return appointment
+        raise ValueError(f"Cannot move a {appointment.status.value} appointment to {status.value}")
+    
+    @staticmethod
+    def _transition_sources(status: AppointmentStatus) -> Tuple[AppointmentStatus, ...]:
+        """Statuses that may move to status, refusing a status nothing moves to"""
+        sources = transition_sources(status)
+        if not sources:
+            raise ValueError(f"Appointments cannot be moved to {status.value}")
+        return sources
     
-    def _is_mentor_available(self, mentor_id: int, start_time: datetime, end_time: datetime) -> bool:
-        """Check if mentor is available for a specific time slot"""
+    def _after_transitions(self, moved: List[Appointment], status: AppointmentStatus):
+        """Free the daily sessions of appointments that stopped being active, refund cancellations
+        and queue the status change notifications"""
+        if status in INACTIVE_STATUSES:
+            # Every transition source is active, so each moved appointment held a session
+            days_by_mentor: Dict[int, List[date]] = {}
+            for appointment in moved:
+                days_by_mentor.setdefault(appointment.mentor_id, []).append(booking_day(appointment.start_time))
+            for mentor_id, days in days_by_mentor.items():
+                self.booking_counter.release_days(mentor_id, days)
+        if status == AppointmentStatus.CANCELLED:
+            self.wallet_repository.credit_many([
+                (appointment.student_id, appointment.points_used, appointment.id,
+                 f"Appointment cancellation refund #{appointment.id}")
+                for appointment in moved if appointment.points_used > 0
+            ], TransactionType.REFUNDED)
+        if self.notification_service:
+            self.notification_service.status_changed(moved)
+    
+    def get_available_slots(self, mentor_id: int, date: datetime, duration_hours: float = 1.0,
+                            step_minutes: int = DEFAULT_SLOT_STEP_MINUTES) -> List[dict]:
+        """Get available time slots for a mentor on a specific date"""
         mentor = self.mentor_repository.get_by_id(mentor_id)
         if not mentor or mentor.status != MentorStatus.ACTIVE:
-            return False
+            return []
+        if self.booking_counter.get_count(mentor_id, date.date()) >= mentor.max_sessions_per_day:
+            return []
+        
+        # Working hours (9 AM to 6 PM UTC)
+        day_start = datetime.combine(date.date(), time(hour=WORKING_HOURS_START), tzinfo=timezone.utc)
+        day_end = datetime.combine(date.date(), time(hour=WORKING_HOURS_END), tzinfo=timezone.utc)
         
-        conflicting_appointments = self.appointment_repository.get_conflicting_appointments(
-            mentor_id, start_time, end_time
+        # Only the mentor's active appointments overlapping working hours
+        busy = self.appointment_repository.get_busy_intervals(
+            mentor_id, day_start.replace(tzinfo=None), day_end.replace(tzinfo=None)
         )
+        index = AvailabilityIndex(busy)
         
-        active_conflicts = [
-            apt for apt in conflicting_appointments 
-            if apt.status not in [AppointmentStatus.CANCELLED, AppointmentStatus.NO_SHOW]
+        points_required = int(duration_hours * mentor.hourly_rate)
+        return [
+            {
+                'start_time': slot_start,
+                'end_time': slot_end,
+                'points_required': points_required
+            } for slot_start, slot_end in index.slots(
+                day_start, day_end, timedelta(hours=duration_hours), timedelta(minutes=step_minutes)
+            )
         ]
+    
+    def search_available_mentors(self, window_start: datetime, window_end: datetime,
+                                 expertise: Optional[str] = None, duration_hours: float = 1.0) -> List[dict]:
+        """Find active mentors with free time in a window, using one appointment query for all of them"""
+        if expertise:
+            mentors = [
+                mentor for mentor in self.mentor_repository.get_by_expertise(expertise)
+                if mentor.status == MentorStatus.ACTIVE
+            ]
+        else:
+            mentors = self.mentor_repository.get_available_mentors()
+        if not mentors:
+            return []
         
-        return len(active_conflicts) == 0
+        window_start, window_end = as_utc(window_start), as_utc(window_end)
+        mentor_ids = [mentor.id for mentor in mentors]
+        busy_by_mentor = self.appointment_repository.get_busy_intervals_by_mentor_ids(
+            mentor_ids, window_start.replace(tzinfo=None), window_end.replace(tzinfo=None)
+        )
+        full_days = self._full_days(mentors, window_start.date(), window_end.date())
+        
+        duration = timedelta(hours=duration_hours)
+        results = []
+        for mentor in mentors:
+            # A day that has used up its quota is busy from midnight to midnight
+            busy = busy_by_mentor.get(mentor.id, []) + [
+                (datetime.combine(day, time.min), datetime.combine(day + timedelta(days=1), time.min))
+                for day in full_days.get(mentor.id, ())
+            ]
+            index = AvailabilityIndex(busy)
+            free_windows = [
+                {'start_time': gap_start, 'end_time': gap_end}
+                for gap_start, gap_end in index.free_gaps(window_start, window_end)
+                if gap_end - gap_start >= duration
+            ]
+            if free_windows:
+                results.append({
+                    'mentor_id': mentor.id,
+                    'user_id': mentor.user_id,
+                    'hourly_rate': mentor.hourly_rate,
+                    'rating': mentor.rating,
+                    'points_required': int(duration_hours * mentor.hourly_rate),
+                    'free_windows': free_windows
+                })
+        return results
+    
+    def _full_days(self, mentors: List[Mentor], first_day: date, last_day: date) -> Dict[int, List[date]]:
+        """Days in the range on which each mentor has no sessions left, from one counter query"""
+        limits = {mentor.id: mentor.max_sessions_per_day for mentor in mentors}
+        full_days: Dict[int, List[date]] = {}
+        for (mentor_id, day), count in self.booking_counter.get_counts(list(limits), first_day, last_day).items():
+            if count >= limits[mentor_id]:
+                full_days.setdefault(mentor_id, []).append(day)
+        return full_days
+    
+    def _reserve_session(self, mentor_id: int, start_time: datetime, max_sessions_per_day: int):
+        """Take one of the mentor's sessions for the appointment's day, or refuse the booking"""
+        if not self.booking_counter.try_reserve(mentor_id, booking_day(start_time), max_sessions_per_day):
+            raise ValueError("Mentor has no sessions left on this day")
     
     def _deduct_points_from_wallet(self, user_id: int, points: int, appointment_id: int):
         """Deduct points from wallet by user_id"""
-        wallet = self.wallet_repository.get_wallet_by_user_id(user_id)
-        if wallet:
-            new_balance = wallet.balance - points
-            self.wallet_repository.update_wallet_balance(wallet.id, new_balance)
-
-            # Create transaction record
-            from domain.models.wallet import WalletTransaction
-            transaction = WalletTransaction(
-                wallet_id=wallet.id,
-                amount=-points,
-                transaction_type=TransactionType.SPENT,
-                description=f"Appointment booking #{appointment_id}",
-                appointment_id=appointment_id
-            )
-            self.wallet_repository.create_transaction(transaction)
-    
-    def _refund_points_to_wallet(self, user_id: int, points: int, appointment_id: int):
-        """Refund points to wallet by user_id"""
-        wallet = self.wallet_repository.get_wallet_by_user_id(user_id)
-        if wallet:
-            new_balance = wallet.balance + points
-            self.wallet_repository.update_wallet_balance(wallet.id, new_balance)
-
-            # Create transaction record
-            from domain.models.wallet import WalletTransaction
-            transaction = WalletTransaction(
-                wallet_id=wallet.id,
-                amount=points,
-                transaction_type=TransactionType.REFUNDED,
-                description=f"Appointment cancellation refund #{appointment_id}",
-                appointment_id=appointment_id
-            )
-            self.wallet_repository.create_transaction(transaction)
+        if not self.wallet_repository.apply_delta(
+                user_id, -points, TransactionType.SPENT, appointment_id,
+                f"Appointment booking #{appointment_id}"):
+            raise ValueError("Insufficient points in wallet")
@@ -0,0 +1,136 @@
+from typing import List, Optional
+from domain.constants import MIN_RATING, MAX_RATING
+from domain.models.appointment import AppointmentStatus
+from domain.models.feedback import Feedback, FeedbackType, RatingSummary
+from domain.models.ifeedback_repository import IFeedbackRepository
+from domain.models.irating_aggregator import IRatingAggregator
+from domain.models.iappointment_repository import IAppointmentRepository
+from domain.models.imentor_repository import IMentorRepository
+from domain.models.iunit_of_work import IUnitOfWork
+from domain.models.icache import ICache
+from services.mentor_service import MentorService
+
+class FeedbackService:
+    def __init__(self, feedback_repository: IFeedbackRepository, rating_aggregator: IRatingAggregator,
+                 appointment_repository: IAppointmentRepository, mentor_repository: IMentorRepository,
+                 unit_of_work: IUnitOfWork, directory_cache: Optional[ICache] = None,
+                 mentor_service: Optional[MentorService] = None):
+        self.feedback_repository = feedback_repository
+        self.rating_aggregator = rating_aggregator
+        self.appointment_repository = appointment_repository
+        self.mentor_repository = mentor_repository
+        self.unit_of_work = unit_of_work
+        self.directory_cache = directory_cache
+        self.mentor_service = mentor_service
+    
+    def submit_feedback(self, appointment_id: int, reviewer_id: int, rating: int, comment: str = "") -> Feedback:
+        """Record feedback on a completed appointment and update the reviewed user's rating"""
+        self._validate_rating(rating)
+        
+        def submit() -> Feedback:
+            appointment = self.appointment_repository.get_by_id(appointment_id)
+            if not appointment:
+                raise ValueError("Appointment not found")
+            if appointment.status != AppointmentStatus.COMPLETED:
+                raise ValueError("Feedback can only be given for completed appointments")
+            
+            # Appointments store the mentor id; feedback refers to users on both sides
+            mentor = self.mentor_repository.get_by_id(appointment.mentor_id)
+            if reviewer_id == appointment.student_id and mentor:
+                feedback_type, reviewed_id = FeedbackType.STUDENT_TO_MENTOR, mentor.user_id
+            elif mentor and reviewer_id == mentor.user_id:
+                feedback_type, reviewed_id = FeedbackType.MENTOR_TO_STUDENT, appointment.student_id
+            else:
+                raise ValueError("Only the student or mentor of the appointment can leave feedback")
+            
+            created = self.feedback_repository.create(Feedback(
+                appointment_id=appointment_id,
+                reviewer_id=reviewer_id,
+                reviewed_id=reviewed_id,
+                rating=rating,
+                comment=comment,
+                feedback_type=feedback_type
+            ))
+            if created is None:
+                raise ValueError("Feedback already submitted for this appointment")
+            self.rating_aggregator.add_rating(reviewed_id, feedback_type, rating)
+            return created
+        
+        created = self.unit_of_work.run(submit)
+        self._rating_changed(created.feedback_type, created.reviewed_id)
+        return created
+    
+    def update_feedback(self, feedback_id: int, reviewer_id: int, rating: Optional[int] = None,
+                        comment: Optional[str] = None) -> Optional[Feedback]:
+        """Change a feedback's rating or comment, moving the rating between aggregates"""
+        if rating is not None:
+            self._validate_rating(rating)
+        
+        def update() -> Optional[Feedback]:
+            feedback = self._get_own_feedback(feedback_id, reviewer_id)
+            if not feedback:
+                return None
+            
+            if rating is not None and rating != feedback.rating:
+                self.rating_aggregator.remove_rating(feedback.reviewed_id, feedback.feedback_type, feedback.rating)
+                self.rating_aggregator.add_rating(feedback.reviewed_id, feedback.feedback_type, rating)
+                feedback.rating = rating
+            if comment is not None:
+                feedback.comment = comment
+            return self.feedback_repository.update(feedback)
+        
+        updated = self.unit_of_work.run(update)
+        if updated:
+            self._rating_changed(updated.feedback_type, updated.reviewed_id)
+        return updated
+    
+    def delete_feedback(self, feedback_id: int, reviewer_id: int) -> bool:
+        """Delete a feedback and take its rating out of the aggregates"""
+        def remove() -> Optional[Feedback]:
+            feedback = self._get_own_feedback(feedback_id, reviewer_id)
+            if not feedback:
+                return None
+            
+            self.feedback_repository.delete(feedback_id)
+            self.rating_aggregator.remove_rating(feedback.reviewed_id, feedback.feedback_type, feedback.rating)
+            return feedback
+        
+        deleted = self.unit_of_work.run(remove)
+        if deleted:
+            self._rating_changed(deleted.feedback_type, deleted.reviewed_id)
+        return deleted is not None
+    
+    def get_feedback_for_user(self, user_id: int) -> List[Feedback]:
+        """Get all feedback a user has received, newest first"""
+        return self.feedback_repository.get_by_reviewed_id(user_id)
+    
+    def get_rating_summaries(self, user_id: int) -> List[RatingSummary]:
+        """Get a user's rating count, average and histogram per feedback type"""
+        return self.rating_aggregator.get_summaries(user_id)
+    
+    def recompute_ratings(self) -> int:
+        """Rebuild all rating aggregates and mentor ratings from the feedback table"""
+        count = self.unit_of_work.run(self.rating_aggregator.recompute_all)
+        self._rating_changed(FeedbackType.STUDENT_TO_MENTOR)
+        return count
+    
+    def _get_own_feedback(self, feedback_id: int, reviewer_id: int) -> Optional[Feedback]:
+        feedback = self.feedback_repository.get_by_id(feedback_id)
+        if feedback and feedback.reviewer_id != reviewer_id:
+            raise ValueError("Only the reviewer can change this feedback")
+        return feedback
+    
+    def _rating_changed(self, feedback_type: FeedbackType, reviewed_id: Optional[int] = None):
+        """Mentor listings and search include the rating; refresh them once it has changed
+        (every mentor when reviewed_id is None)"""
+        if feedback_type != FeedbackType.STUDENT_TO_MENTOR:
+            return
+        if self.directory_cache is not None:
+            self.directory_cache.clear()
+        if self.mentor_service is not None:
+            self.mentor_service.mentor_rating_changed(reviewed_id)
+    
+    @staticmethod
+    def _validate_rating(rating: int):
+        if not isinstance(rating, int) or not MIN_RATING <= rating <= MAX_RATING:
+            raise ValueError(f"Rating must be an integer between {MIN_RATING} and {MAX_RATING}")
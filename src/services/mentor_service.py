@@ -1,14 +1,27 @@
-from typing import List, Optional
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime, timezone
 from domain.models.mentor import Mentor, MentorStatus
 from domain.models.imentor_repository import IMentorRepository
 from domain.models.iappointment_repository import IAppointmentRepository
 from domain.models.appointment import AppointmentStatus
+from domain.models.iunit_of_work import IUnitOfWork
+from domain.models.icache import ICache
+from domain.models.mentor_search import MentorSearchIndex, MentorSearchResult
+from domain.models.mentor_match import MentorMatch
+from domain.constants import MENTOR_SEARCH_INDEX_MAX_AGE_SECONDS, MAX_MATCH_RESULTS
 
 class MentorService:
-    def __init__(self, mentor_repository: IMentorRepository, appointment_repository: IAppointmentRepository):
+    def __init__(self, mentor_repository: IMentorRepository, appointment_repository: IAppointmentRepository,
+                 unit_of_work: IUnitOfWork, directory_cache: Optional[ICache] = None):
         self.mentor_repository = mentor_repository
         self.appointment_repository = appointment_repository
+        self.unit_of_work = unit_of_work
+        self.directory_cache = directory_cache
+        self._search_index: Optional[MentorSearchIndex] = None
+        self._search_index_built_at = 0.0
+        self._search_index_lock = threading.Lock()
     
     def create_mentor(self, user_id: int, bio: str, expertise_areas: List[str], 
                      hourly_rate: int, max_sessions_per_day: int = 5) -> Mentor:
@@ -23,7 +36,9 @@ class MentorService:
             created_at=datetime.now(timezone.utc),
             updated_at=datetime.now(timezone.utc)
         )
-        return self.mentor_repository.create(mentor)
+        created = self.unit_of_work.run(lambda: self.mentor_repository.create(mentor))
+        self._mentor_changed(created.id, created)
+        return created
     
     def get_mentor_by_id(self, mentor_id: int) -> Optional[Mentor]:
         """Get mentor by ID"""
@@ -35,44 +50,113 @@ class MentorService:
     
     def get_all_mentors(self) -> List[Mentor]:
         """Get all mentors"""
-        return self.mentor_repository.get_all()
+        return self._cached_directory('all', self.mentor_repository.get_all)
     
     def get_mentors_by_expertise(self, expertise: str) -> List[Mentor]:
         """Get mentors by expertise area"""
-        return self.mentor_repository.get_by_expertise(expertise)
+        return self._cached_directory(
+            f'expertise:{expertise}', lambda: self.mentor_repository.get_by_expertise(expertise)
+        )
     
     def get_available_mentors(self) -> List[Mentor]:
         """Get all available mentors"""
-        return self.mentor_repository.get_available_mentors()
+        return self._cached_directory('available', self.mentor_repository.get_available_mentors)
+    
+    def _cached_directory(self, key: str, loader: Callable[[], List[Mentor]]) -> List[Mentor]:
+        """Serve a mentor listing from the directory cache, loading it on a miss"""
+        if self.directory_cache is None:
+            return loader()
+        # Callers get their own list; the cached one is shared between requests
+        return list(self.directory_cache.get_or_set(key, loader))
+    
+    def search_mentors(self, query: str = '', expertise: Optional[str] = None, available_only: bool = False,
+                       min_rating: Optional[float] = None, max_rate: Optional[int] = None,
+                       sort: str = 'relevance') -> Tuple[List[MentorSearchResult], Dict[str, int]]:
+        """Full-text search over bios and expertise, with expertise facet counts"""
+        return self._get_search_index().search(query, expertise, available_only, min_rating, max_rate, sort)
+    
+    def match_mentors(self, expertise: List[str], start_time: datetime, end_time: datetime,
+                      max_rate: Optional[int] = None, limit: int = 10) -> List[MentorMatch]:
+        """Recommend the best mentors free in a time window, scored in one batched query"""
+        if end_time <= start_time:
+            raise ValueError("End time must be after start time")
+        if not 1 <= limit <= MAX_MATCH_RESULTS:
+            raise ValueError(f"limit must be between 1 and {MAX_MATCH_RESULTS}")
+        # Repeated tags would inflate the coverage denominator
+        tags = list(dict.fromkeys(tag.strip() for tag in expertise if tag and tag.strip()))
+        return self.mentor_repository.find_matches(tags, start_time, end_time, max_rate, limit)
+    
+    def _get_search_index(self) -> MentorSearchIndex:
+        """The search index, rebuilt from the repository when missing or too old"""
+        with self._search_index_lock:
+            if (self._search_index is None
+                    or time.monotonic() - self._search_index_built_at > MENTOR_SEARCH_INDEX_MAX_AGE_SECONDS):
+                self._search_index = MentorSearchIndex(self.mentor_repository.get_all())
+                self._search_index_built_at = time.monotonic()
+            return self._search_index
+    
+    def _mentor_changed(self, mentor_id: int, mentor: Optional[Mentor] = None):
+        """Bring caches and the search index up to date after a mentor write has committed"""
+        if self.directory_cache is not None:
+            self.directory_cache.clear()
+        index = self._search_index
+        if index is None:
+            return
+        if mentor is None:
+            mentor = self.mentor_repository.get_by_id(mentor_id)
+        if mentor is None:
+            index.remove(mentor_id)
+        else:
+            index.upsert(mentor)
+    
+    def mentor_rating_changed(self, user_id: Optional[int] = None):
+        """Refresh the mentor (by user id) whose rating changed, or every mentor when user_id is None"""
+        if user_id is not None:
+            mentor = self.mentor_repository.get_by_user_id(user_id)
+            if mentor:
+                self._mentor_changed(mentor.id, mentor)
+            return
+        if self.directory_cache is not None:
+            self.directory_cache.clear()
+        with self._search_index_lock:
+            self._search_index = None
     
     def update_mentor_profile(self, mentor_id: int, bio: str = None, 
                             expertise_areas: List[str] = None, hourly_rate: int = None,
                             max_sessions_per_day: int = None) -> Optional[Mentor]:
         """Update mentor profile"""
-        mentor = self.mentor_repository.get_by_id(mentor_id)
-        if not mentor:
-            return None
-        
-        if bio is not None:
-            mentor.bio = bio
-        if expertise_areas is not None:
-            mentor.expertise_areas = expertise_areas
-        if hourly_rate is not None:
-            mentor.hourly_rate = hourly_rate
-        if max_sessions_per_day is not None:
-            mentor.max_sessions_per_day = max_sessions_per_day
+        def update() -> Optional[Mentor]:
+            mentor = self.mentor_repository.get_by_id(mentor_id)
+            if not mentor:
+                return None
+            
+            if bio is not None:
+                mentor.bio = bio
+            if expertise_areas is not None:
+                mentor.expertise_areas = expertise_areas
+            if hourly_rate is not None:
+                mentor.hourly_rate = hourly_rate
+            if max_sessions_per_day is not None:
+                mentor.max_sessions_per_day = max_sessions_per_day
+            
+            mentor.updated_at = datetime.now(timezone.utc)
+            return self.mentor_repository.update(mentor)
         
-        mentor.updated_at = datetime.now(timezone.utc)
-        return self.mentor_repository.update(mentor)
+        updated = self.unit_of_work.run(update)
+        if updated:
+            self._mentor_changed(mentor_id, updated)
+        return updated
     
     def update_mentor_status(self, mentor_id: int, status: MentorStatus) -> bool:
         """Update mentor status"""
-        return self.mentor_repository.update_status(mentor_id, status)
+        updated = self.unit_of_work.run(lambda: self.mentor_repository.update_status(mentor_id, status))
+        if updated:
+            self._mentor_changed(mentor_id)
+        return updated
     
     def calculate_mentor_rating(self, mentor_id: int) -> float:
         """Calculate mentor rating based on feedback"""
-        # This would typically involve getting feedback and calculating average
-        # For now, return the current rating
+        # mentors.rating is kept up to date by the rating aggregator on every feedback write
         mentor = self.mentor_repository.get_by_id(mentor_id)
         return mentor.rating if mentor else 0.0
     
@@ -118,4 +202,7 @@ class MentorService:
     
     def delete_mentor(self, mentor_id: int) -> bool:
         """Delete mentor profile"""
-        return self.mentor_repository.delete(mentor_id)
+        deleted = self.unit_of_work.run(lambda: self.mentor_repository.delete(mentor_id))
+        if deleted:
+            self._mentor_changed(mentor_id)
+        return deleted
@@ -0,0 +1,140 @@
+import logging
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+from domain.models.inotification_outbox import INotificationOutbox
+from domain.models.inotification_transport import INotificationTransport
+from domain.models.iunit_of_work import IUnitOfWork
+from domain.constants import (
+    NOTIFICATION_BATCH_SIZE, NOTIFICATION_LEASE_SECONDS, NOTIFICATION_MAX_ATTEMPTS,
+    NOTIFICATION_POLL_SECONDS, NOTIFICATION_RETRY_BASE_SECONDS, NOTIFICATION_RETRY_MAX_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+class NotificationDispatcher:
+    """Drains the notification outbox in batches with a pool of worker threads.
+
+    Each worker claims a batch (which leases the rows to it), delivers it through
+    the transport outside any transaction, then records the outcome. Failures are
+    retried with jittered exponential backoff until max_attempts.
+    """
+    def __init__(self, outbox: INotificationOutbox, transport: INotificationTransport,
+                 unit_of_work: IUnitOfWork, workers: int = 2,
+                 batch_size: int = NOTIFICATION_BATCH_SIZE,
+                 max_attempts: int = NOTIFICATION_MAX_ATTEMPTS,
+                 end_of_run: Optional[Callable[[], None]] = None):
+        self.outbox = outbox
+        self.transport = transport
+        self.unit_of_work = unit_of_work
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        # Called after each batch on a worker thread, e.g. to release its database session
+        self.end_of_run = end_of_run
+        self._wakeup = threading.Condition()
+        self._pending_wakeups = 0
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._delivered = 0
+        self._failed = 0
+
+    def start(self):
+        with self._lock:
+            if any(thread.is_alive() for thread in self._threads):
+                return
+            self._stopping.clear()
+            self._threads = [
+                threading.Thread(target=self._run, name=f'notification-dispatcher-{i}', daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+    def wake(self, *_):
+        """Tell an idle worker that new notifications were committed (cheap; safe to call from a request)"""
+        with self._wakeup:
+            self._pending_wakeups += 1
+            self._wakeup.notify()
+
+    def dispatch_batch(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Claim, deliver and settle one batch; returns how many were sent and failed"""
+        now = now or datetime.now(timezone.utc)
+        lease_until = now + timedelta(seconds=NOTIFICATION_LEASE_SECONDS)
+        batch = self.unit_of_work.run(lambda: self.outbox.claim_batch(self.batch_size, now, lease_until))
+        if not batch:
+            return {'sent': 0, 'failed': 0}
+
+        try:
+            errors = self.transport.send_batch(batch)
+        except Exception as e:
+            logger.exception("Notification transport failed")
+            errors = {notification.id: str(e) for notification in batch}
+
+        finished_at = datetime.now(timezone.utc)
+        sent_ids = [notification.id for notification in batch if notification.id not in errors]
+
+        def settle():
+            self.outbox.mark_sent(sent_ids, finished_at)
+            for notification in batch:
+                if notification.id in errors:
+                    self.outbox.mark_failed(notification.id, errors[notification.id][:1000],
+                                            self._retry_at(notification.attempts, finished_at))
+
+        self.unit_of_work.run(settle)
+        with self._lock:
+            self._delivered += len(sent_ids)
+            self._failed += len(errors)
+        return {'sent': len(sent_ids), 'failed': len(errors)}
+
+    def drain(self) -> Dict[str, int]:
+        """Dispatch batches until nothing is due; returns the totals"""
+        totals = {'sent': 0, 'failed': 0}
+        while True:
+            result = self.dispatch_batch()
+            for key, count in result.items():
+                totals[key] += count
+            if result['sent'] + result['failed'] < self.batch_size:
+                return totals
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'workers': sum(thread.is_alive() for thread in self._threads),
+                'delivered': self._delivered,
+                'failed_attempts': self._failed
+            }
+
+    def _retry_at(self, attempts: int, now: datetime) -> Optional[datetime]:
+        """When to try again after this many attempts, or None to give up"""
+        if attempts >= self.max_attempts:
+            return None
+        delay = min(NOTIFICATION_RETRY_MAX_SECONDS, NOTIFICATION_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+        return now + timedelta(seconds=delay * random.uniform(0.5, 1.5))
+
+    def _run(self):
+        while not self._stopping.is_set():
+            full_batch = False
+            try:
+                result = self.dispatch_batch()
+                full_batch = result['sent'] + result['failed'] >= self.batch_size
+            except Exception:
+                logger.exception("Notification dispatch failed")
+            finally:
+                if self.end_of_run:
+                    self.end_of_run()
+            if full_batch:
+                continue
+            with self._wakeup:
+                if not self._pending_wakeups and not self._stopping.is_set():
+                    self._wakeup.wait(NOTIFICATION_POLL_SECONDS)
+                self._pending_wakeups = 0
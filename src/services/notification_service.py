@@ -0,0 +1,73 @@
+from typing import List
+from domain.models.appointment import Appointment
+from domain.models.inotification_outbox import INotificationOutbox
+from domain.models.iunit_of_work import IUnitOfWork
+from domain.models.notification import Notification
+from domain.models.recurrence import AppointmentSeries
+
+def appointment_payload(appointment: Appointment) -> dict:
+    return {
+        'appointment_id': appointment.id,
+        'mentor_id': appointment.mentor_id,
+        'student_id': appointment.student_id,
+        'title': appointment.title,
+        'start_time': appointment.start_time.isoformat(),
+        'end_time': appointment.end_time.isoformat(),
+        'status': appointment.status.value
+    }
+
+class NotificationService:
+    """Records notification intents in the outbox; NotificationDispatcher delivers them.
+
+    Called inside a unit of work, the intents commit or roll back with the change
+    they announce, and the request never waits on delivery.
+    """
+    def __init__(self, outbox: INotificationOutbox, unit_of_work: IUnitOfWork):
+        self.outbox = outbox
+        self.unit_of_work = unit_of_work
+    
+    def appointments_booked(self, appointments: List[Appointment]) -> int:
+        """Announce new bookings"""
+        return self._enqueue([
+            Notification(dedupe_key=f"appointment.booked:{appointment.id}", event_type='appointment.booked',
+                         payload=appointment_payload(appointment))
+            for appointment in appointments
+        ])
+    
+    def series_booked(self, series: AppointmentSeries, appointments: List[Appointment]) -> int:
+        """Announce a recurring series once rather than every session of it"""
+        return self._enqueue([Notification(
+            dedupe_key=f"appointment_series.booked:{series.id}",
+            event_type='appointment_series.booked',
+            payload={
+                'series_id': series.id,
+                'mentor_id': series.mentor_id,
+                'student_id': series.student_id,
+                'rule': series.rule,
+                'appointments': [appointment_payload(appointment) for appointment in appointments]
+            }
+        )])
+    
+    def status_changed(self, appointments: List[Appointment]) -> int:
+        """Announce appointments that moved to a new status"""
+        # Each status is entered at most once, so the status makes the key unique
+        return self._enqueue([
+            Notification(dedupe_key=f"appointment.{appointment.status.value}:{appointment.id}",
+                         event_type=f"appointment.{appointment.status.value}",
+                         payload=appointment_payload(appointment))
+            for appointment in appointments
+        ])
+    
+    def send_appointment_reminders(self, appointments: List[Appointment]) -> int:
+        """Remind the student and mentor of each appointment that it starts soon"""
+        return self._enqueue([
+            Notification(dedupe_key=f"appointment.reminder:{appointment.id}:{appointment.start_time.isoformat()}",
+                         event_type='appointment.reminder', payload=appointment_payload(appointment))
+            for appointment in appointments
+        ])
+    
+    def _enqueue(self, notifications: List[Notification]) -> int:
+        if not notifications:
+            return 0
+        # Joins the caller's transaction when there is one
+        return self.unit_of_work.run(lambda: self.outbox.enqueue_many(notifications))
@@ -0,0 +1,257 @@
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Tuple
+from domain.models.appointment import Appointment, AppointmentStatus
+from domain.models.availability import as_utc, to_naive_utc
+from domain.models.iappointment_repository import IAppointmentRepository
+from domain.models.job_heap import JobHeap
+from domain.constants import (
+    AUTO_CLOSE_GRACE_MINUTES, MAX_BATCH_TRANSITION_SIZE, REMINDER_LEAD_MINUTES, SCHEDULER_SYNC_OVERLAP_SECONDS,
+    SCHEDULER_SYNC_SECONDS, SCHEDULER_WINDOW_HOURS
+)
+from services.appointment_service import AppointmentService
+from services.notification_service import NotificationService
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before retrying after the scheduler failed to load its window
+RETRY_SECONDS = 60
+
+class JobKind(Enum):
+    REMINDER = "reminder"
+    AUTO_CLOSE = "auto_close"
+
+# What an appointment still open after its end (plus grace) is closed as. A session
+# the mentor never confirmed is cancelled, which refunds the student and frees the day
+AUTO_CLOSE_STATUSES = {
+    AppointmentStatus.CONFIRMED: AppointmentStatus.COMPLETED,
+    AppointmentStatus.PENDING: AppointmentStatus.CANCELLED,
+}
+OPEN_STATUSES = tuple(AUTO_CLOSE_STATUSES)
+
+class ScheduleService:
+    """Fires appointment reminders and auto-close jobs from an in-process timing heap.
+
+    Open appointments starting within the look-ahead window are loaded once; the
+    window then slides forward with range queries on (status, start_time), so the
+    appointments table is never rescanned. Changes made in this process arrive
+    through AppointmentService's listeners; changes made by other processes are
+    picked up by sync(), a range query on updated_at. Due jobs re-read their rows
+    before firing and go through the guarded batch transition, so a job made
+    stale by a concurrent change does nothing.
+    """
+    def __init__(self, appointment_repository: IAppointmentRepository,
+                 appointment_service: AppointmentService,
+                 notification_service: NotificationService,
+                 window: timedelta = timedelta(hours=SCHEDULER_WINDOW_HOURS),
+                 reminder_lead: timedelta = timedelta(minutes=REMINDER_LEAD_MINUTES),
+                 close_grace: timedelta = timedelta(minutes=AUTO_CLOSE_GRACE_MINUTES),
+                 end_of_run: Optional[Callable[[], None]] = None):
+        self.appointment_repository = appointment_repository
+        self.appointment_service = appointment_service
+        self.notification_service = notification_service
+        self.window = window
+        self.reminder_lead = reminder_lead
+        self.close_grace = close_grace
+        # Called after each background run, e.g. to release the thread's database session
+        self.end_of_run = end_of_run
+        self._jobs = JobHeap()
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loaded_until: Optional[datetime] = None
+        self._synced_at: Optional[datetime] = None
+        self._fired = {kind.value: 0 for kind in JobKind}
+        appointment_service.add_listener(self.track)
+
+    def start(self):
+        """Load the window and run due jobs on a background thread until stop()"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name='appointment-scheduler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join()
+
+    def load(self, now: Optional[datetime] = None):
+        """Close the backlog of finished appointments, then load the open ones starting within the window"""
+        now = now or datetime.now(timezone.utc)
+        # Everything changed from here on is re-read by the next sync
+        synced_at = datetime.now(timezone.utc)
+        ended_before = now - self.close_grace
+        for from_status, status in AUTO_CLOSE_STATUSES.items():
+            self.appointment_service.transition_ended_appointments(from_status, status, ended_before)
+        with self._lock:
+            self._loaded_until = None
+            self._synced_at = synced_at
+            self._jobs = JobHeap()
+        self.slide_window(now)
+
+    def slide_window(self, now: Optional[datetime] = None):
+        """Load the open appointments that entered the window since the last load"""
+        now = now or datetime.now(timezone.utc)
+        window_end = now + self.window
+        with self._lock:
+            loaded_until = self._loaded_until
+            if loaded_until is not None and window_end <= loaded_until:
+                return
+            appointments = self.appointment_repository.get_starting_between(
+                OPEN_STATUSES,
+                loaded_until.replace(tzinfo=None) if loaded_until else None,
+                window_end.replace(tzinfo=None)
+            )
+            self._loaded_until = window_end
+            self.track(appointments)
+
+    def sync(self):
+        """Reschedule the appointments in the loaded window that any process changed since the last sync"""
+        with self._lock:
+            loaded_until, synced_at = self._loaded_until, self._synced_at
+        if loaded_until is None or synced_at is None:
+            return
+        started = datetime.now(timezone.utc)
+        # Re-reading a little before the last sync catches transactions that committed late
+        changed = self.appointment_repository.get_updated_since(
+            to_naive_utc(synced_at - timedelta(seconds=SCHEDULER_SYNC_OVERLAP_SECONDS)), to_naive_utc(loaded_until)
+        )
+        with self._lock:
+            self._synced_at = max(self._synced_at or started, started)
+        self.track(changed)
+    
+    def run_once(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Load or slide the window and sync it, then fire the jobs due by now"""
+        now = now or datetime.now(timezone.utc)
+        if self._loaded_until is None:
+            self.load(now)
+        else:
+            self.slide_window(now)
+            self.sync()
+        return self.run_due(now)
+
+    def track(self, appointments: List[Appointment]):
+        """Reschedule the jobs of appointments that were created or changed"""
+        with self._lock:
+            earliest = self._jobs.next_due()
+            for appointment in appointments:
+                self._jobs.remove((appointment.id, JobKind.REMINDER))
+                self._jobs.remove((appointment.id, JobKind.AUTO_CLOSE))
+                start_time = as_utc(appointment.start_time)
+                # Later appointments are picked up when the window reaches them
+                if (appointment.status not in AUTO_CLOSE_STATUSES or self._loaded_until is None
+                        or start_time >= self._loaded_until):
+                    continue
+                if appointment.status == AppointmentStatus.CONFIRMED:
+                    self._jobs.push((appointment.id, JobKind.REMINDER), start_time - self.reminder_lead, appointment)
+                self._jobs.push((appointment.id, JobKind.AUTO_CLOSE),
+                                as_utc(appointment.end_time) + self.close_grace, appointment)
+            next_due = self._jobs.next_due()
+        if next_due is not None and (earliest is None or next_due < earliest):
+            self._wakeup.set()
+
+    def run_due(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Fire every job due by now; returns how many jobs of each kind fired"""
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            due = self._jobs.pop_due(now)
+        # The heap holds snapshots: act on each row as it is now, whoever changed it
+        current = {
+            appointment.id: appointment
+            for appointment in self.appointment_repository.get_by_ids(sorted({key[0] for key, _ in due}))
+        } if due else {}
+
+        reminders: List[Appointment] = []
+        closes: Dict[Tuple[AppointmentStatus, AppointmentStatus], List[int]] = defaultdict(list)
+        rescheduled: List[Appointment] = []
+        for (appointment_id, kind), _ in due:
+            appointment = current.get(appointment_id)
+            if appointment is None or appointment.status not in AUTO_CLOSE_STATUSES:
+                continue
+            if kind == JobKind.REMINDER:
+                if appointment.status != AppointmentStatus.CONFIRMED:
+                    continue
+                if now < as_utc(appointment.start_time) - self.reminder_lead:
+                    rescheduled.append(appointment)
+                # A reminder that comes due after the start is no longer useful
+                elif now < as_utc(appointment.start_time):
+                    reminders.append(appointment)
+            elif now < as_utc(appointment.end_time) + self.close_grace:
+                rescheduled.append(appointment)
+            else:
+                closes[appointment.status, AUTO_CLOSE_STATUSES[appointment.status]].append(appointment_id)
+        # Rescheduled since the job was queued: queue it again at its new time
+        self.track(rescheduled)
+
+        fired = {kind.value: 0 for kind in JobKind}
+        if reminders:
+            self.notification_service.send_appointment_reminders(reminders)
+            fired[JobKind.REMINDER.value] = len(reminders)
+        for (from_status, status), appointment_ids in closes.items():
+            for i in range(0, len(appointment_ids), MAX_BATCH_TRANSITION_SIZE):
+                moved, _ = self.appointment_service.transition_appointments(
+                    appointment_ids[i:i + MAX_BATCH_TRANSITION_SIZE], status, from_status
+                )
+                fired[JobKind.AUTO_CLOSE.value] += len(moved)
+        with self._lock:
+            for kind, count in fired.items():
+                self._fired[kind] += count
+        return fired
+
+    def stats(self, upcoming: int = 10) -> dict:
+        with self._lock:
+            return {
+                'running': bool(self._thread and self._thread.is_alive()),
+                'pending_jobs': len(self._jobs),
+                'loaded_until': self._loaded_until.isoformat() if self._loaded_until else None,
+                'fired': dict(self._fired),
+                'upcoming': [
+                    {'due_at': due_at.isoformat(), 'appointment_id': appointment_id, 'kind': kind.value}
+                    for due_at, (appointment_id, kind) in self._jobs.peek(upcoming)
+                ]
+            }
+
+    def _run(self):
+        # Slide the window often enough that nothing starts before it has been loaded
+        refresh = self.window / 4
+        sync_interval = timedelta(seconds=SCHEDULER_SYNC_SECONDS)
+        next_refresh = next_sync = None
+        while not self._stopping.is_set():
+            try:
+                now = datetime.now(timezone.utc)
+                if next_refresh is None:
+                    self.load(now)
+                    next_refresh, next_sync = now + refresh, now + sync_interval
+                else:
+                    if now >= next_refresh:
+                        self.slide_window(now)
+                        next_refresh = now + refresh
+                    if now >= next_sync:
+                        self.sync()
+                        next_sync = now + sync_interval
+                self.run_due(now)
+            except Exception:
+                logger.exception("Appointment scheduler run failed")
+            finally:
+                if self.end_of_run:
+                    self.end_of_run()
+
+            if next_refresh is None:
+                timeout = RETRY_SECONDS
+            else:
+                with self._lock:
+                    next_due = self._jobs.next_due()
+                wake_at = min(next_refresh, next_sync)
+                if next_due:
+                    wake_at = min(next_due, wake_at)
+                timeout = max(0.0, (wake_at - datetime.now(timezone.utc)).total_seconds())
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
@@ -0,0 +1,87 @@
+from typing import Iterator, List, Optional, Tuple
+from datetime import datetime, timezone
+from domain.models.wallet import Wallet, WalletTransaction, TransactionType
+from domain.models.iwallet_repository import IWalletRepository
+from domain.models.iunit_of_work import IUnitOfWork
+from domain.models.ievent_bus import IEventBus, user_topic
+
+def wallet_event(wallet: Wallet) -> dict:
+    return {
+        'user_id': wallet.user_id,
+        'balance': wallet.balance,
+        'total_spent': wallet.total_spent,
+        'total_earned': wallet.total_earned
+    }
+
+class WalletService:
+    def __init__(self, wallet_repository: IWalletRepository, unit_of_work: IUnitOfWork,
+                 event_bus: Optional[IEventBus] = None):
+        self.wallet_repository = wallet_repository
+        self.unit_of_work = unit_of_work
+        self.event_bus = event_bus
+    
+    def get_wallet_by_user_id(self, user_id: int) -> Optional[Wallet]:
+        """Get a user's wallet, including its running totals"""
+        return self.wallet_repository.get_wallet_by_user_id(user_id)
+    
+    def create_wallet(self, user_id: int) -> Wallet:
+        """Create an empty wallet for a user"""
+        wallet = Wallet(
+            user_id=user_id,
+            balance=0,
+            created_at=datetime.now(timezone.utc),
+            updated_at=datetime.now(timezone.utc)
+        )
+        return self.unit_of_work.run(lambda: self.wallet_repository.create_wallet(wallet))
+    
+    def get_transactions_by_user_id(self, user_id: int) -> List[WalletTransaction]:
+        """Get all transactions of a user's wallet"""
+        return self.wallet_repository.get_transactions_by_user_id(user_id)
+    
+    def get_transactions_page(self, user_id: int, limit: int,
+                              cursor: Optional[Tuple[datetime, int]] = None,
+                              transaction_type: Optional[TransactionType] = None,
+                              date_from: Optional[datetime] = None,
+                              date_to: Optional[datetime] = None) -> Tuple[List[WalletTransaction], Optional[Tuple[datetime, int]]]:
+        """Get one page of a user's transactions and the cursor of the next page"""
+        return self.wallet_repository.get_transactions_page(
+            user_id, limit, cursor, transaction_type, date_from, date_to
+        )
+    
+    def export_transactions(self, user_id: int,
+                            transaction_type: Optional[TransactionType] = None,
+                            date_from: Optional[datetime] = None,
+                            date_to: Optional[datetime] = None) -> Iterator[WalletTransaction]:
+        """Stream all of a user's matching transactions"""
+        return self.wallet_repository.iter_transactions(user_id, transaction_type, date_from, date_to)
+    
+    def add_points(self, user_id: int, amount: int, description: str = "") -> Wallet:
+        """Add points to a user's wallet, creating the wallet if needed"""
+        if amount <= 0:
+            raise ValueError("Amount must be positive")
+        
+        def add() -> Wallet:
+            if not self.wallet_repository.get_wallet_by_user_id(user_id):
+                self.create_wallet(user_id)
+            self.wallet_repository.apply_delta(user_id, amount, TransactionType.EARNED, description=description)
+            return self.wallet_repository.get_wallet_by_user_id(user_id)
+        
+        return self._publish(self.unit_of_work.run(add))
+    
+    def spend_points(self, user_id: int, amount: int, description: str = "") -> Optional[Wallet]:
+        """Spend points from a user's wallet; returns None if the balance is insufficient"""
+        if amount <= 0:
+            raise ValueError("Amount must be positive")
+        
+        def spend() -> Optional[Wallet]:
+            if not self.wallet_repository.apply_delta(user_id, -amount, TransactionType.SPENT, description=description):
+                return None
+            return self.wallet_repository.get_wallet_by_user_id(user_id)
+        
+        return self._publish(self.unit_of_work.run(spend))
+    
+    def _publish(self, wallet: Optional[Wallet]) -> Optional[Wallet]:
+        """Push a committed balance change to the owner's open event streams"""
+        if wallet and self.event_bus:
+            self.event_bus.publish([user_topic(wallet.user_id)], 'wallet', wallet_event(wallet))
+        return wallet